@@ -0,0 +1,201 @@
+# data_pipeline.py
+import hashlib
+import json
+import os
+import time
+
+import numpy as np
+import tensorflow as tf
+
+IMAGE_SIZE = 224
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp", ".gif", ".jfif")
+AUTOTUNE = tf.data.AUTOTUNE
+
+
+# --- Listing ---
+def list_images(data_dir, validation_split=0.2, seed=123):
+    """
+    Lists data_dir/<class>/<image> like flow_from_directory (classes sorted by name).
+    Returns (class_names, {"training": (paths, labels), "validation": (paths, labels)}).
+    The split is a fixed shuffle per class, so it is the same on every run.
+    """
+    class_names = sorted(d for d in os.listdir(data_dir) if os.path.isdir(os.path.join(data_dir, d)))
+    rng = np.random.RandomState(seed)
+    splits = {"training": ([], []), "validation": ([], [])}
+    for label, name in enumerate(class_names):
+        folder = os.path.join(data_dir, name)
+        files = sorted(f for f in os.listdir(folder) if f.lower().endswith(IMAGE_EXTENSIONS))
+        files = [os.path.join(folder, f) for f in files]
+        rng.shuffle(files)
+        n_val = int(len(files) * validation_split)
+        for subset, subset_files in (("validation", files[:n_val]), ("training", files[n_val:])):
+            splits[subset][0].extend(subset_files)
+            splits[subset][1].extend([label] * len(subset_files))
+    return class_names, splits
+
+
+def _fingerprint(paths, image_size):
+    """Changes whenever a file is added, removed or modified, or the image size changes."""
+    digest = hashlib.sha1(str(image_size).encode())
+    for path in paths:
+        stat = os.stat(path)
+        digest.update(f"{path}|{stat.st_size}|{stat.st_mtime_ns}".encode())
+    return digest.hexdigest()
+
+
+# --- Decoding ---
+def decode_and_resize(path, image_size=IMAGE_SIZE):
+    """Reads one image file into a uint8 (image_size, image_size, 3) tensor."""
+    data = tf.io.read_file(path)
+    image = tf.io.decode_image(data, channels=3, expand_animations=False)
+    image = tf.image.resize(image, (image_size, image_size), antialias=True)
+    return tf.cast(tf.clip_by_value(tf.round(image), 0, 255), tf.uint8)
+
+
+def decoded_dataset(paths, image_size=IMAGE_SIZE, batch_size=64):
+    """Batches of decoded uint8 images, decoded on all cores in TensorFlow (not in Python)."""
+    return (tf.data.Dataset.from_tensor_slices(list(paths))
+            .map(lambda p: decode_and_resize(p, image_size), num_parallel_calls=AUTOTUNE, deterministic=True)
+            .batch(batch_size)
+            .prefetch(AUTOTUNE))
+
+
+# --- On-disk Cache ---
+class ImageCache:
+    """
+    Decoded-and-resized images of one split, stored as a memory-mapped uint8 .npy
+    (N, size, size, 3) next to its labels and a manifest. Built once; later runs
+    (and every epoch) read pixels straight from the page cache instead of decoding
+    JPEGs again. Rebuilt automatically when the source files change.
+    """
+
+    def __init__(self, cache_dir, subset):
+        self.cache_dir = cache_dir
+        self.subset = subset
+        self.images_path = os.path.join(cache_dir, f"{subset}_images.npy")
+        self.labels_path = os.path.join(cache_dir, f"{subset}_labels.npy")
+        self.manifest_path = os.path.join(cache_dir, f"{subset}_manifest.json")
+        self.images = None
+        self.labels = None
+        self.manifest = None
+
+    def is_valid(self, fingerprint):
+        if not (os.path.isfile(self.manifest_path) and os.path.isfile(self.images_path)):
+            return False
+        with open(self.manifest_path) as f:
+            manifest = json.load(f)
+        return manifest.get("fingerprint") == fingerprint and manifest.get("complete", False)
+
+    def build(self, paths, labels, class_names, image_size=IMAGE_SIZE, batch_size=64):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        fingerprint = _fingerprint(paths, image_size)
+        if self.is_valid(fingerprint):
+            return self.open()
+
+        print(f"[CACHE] Decoding {len(paths)} {self.subset} images into {self.images_path}")
+        start = time.time()
+        # A run interrupted from here on must not leave the old manifest vouching for half-written arrays
+        if os.path.exists(self.manifest_path):
+            os.remove(self.manifest_path)
+        images = np.lib.format.open_memmap(self.images_path, mode="w+", dtype=np.uint8,
+                                           shape=(len(paths), image_size, image_size, 3))
+        offset = 0
+        for batch in decoded_dataset(paths, image_size, batch_size):
+            images[offset:offset + len(batch)] = batch.numpy()
+            offset += len(batch)
+        images.flush()
+        del images
+        np.save(self.labels_path, np.asarray(labels, np.int32))
+
+        manifest = {"fingerprint": fingerprint, "complete": True, "count": len(paths), "image_size": image_size,
+                    "class_names": list(class_names)}
+        # Written aside and renamed, so the manifest is either absent or complete
+        temp_path = self.manifest_path + ".tmp"
+        with open(temp_path, "w") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(temp_path, self.manifest_path)
+        elapsed = time.time() - start
+        print(f"[CACHE] {len(paths)} images in {elapsed:.1f}s ({len(paths) / max(elapsed, 1e-9):.0f} img/s)")
+        return self.open()
+
+    def open(self):
+        with open(self.manifest_path) as f:
+            self.manifest = json.load(f)
+        self.images = np.load(self.images_path, mmap_mode="r")
+        self.labels = np.load(self.labels_path)
+        return self
+
+    def __len__(self):
+        return len(self.labels)
+
+    def dataset(self, batch_size=32, shuffle=False, seed=None):
+        """
+        Yields (uint8 images, labels) batches. Batches are gathered from the memory map
+        by index in one slice per batch, so no per-image Python work is done.
+        """
+        images, labels = self.images, self.labels
+        size = images.shape[1]
+
+        def gather(indices):
+            indices = np.sort(indices)  # sequential reads from the memory map
+            return images[indices], labels[indices]
+
+        def load(indices):
+            batch_images, batch_labels = tf.numpy_function(gather, [indices], (tf.uint8, tf.int32))
+            batch_images.set_shape((None, size, size, 3))
+            batch_labels.set_shape((None,))
+            return batch_images, batch_labels
+
+        ds = tf.data.Dataset.range(len(labels))
+        if shuffle:
+            ds = ds.shuffle(len(labels), seed=seed, reshuffle_each_iteration=True)
+        return ds.batch(batch_size).map(load, num_parallel_calls=AUTOTUNE)
+
+
+# --- Augmentation ---
+def build_augmenter(rotation_range=40, shift_range=0.2, zoom_range=0.2, seed=None):
+    """
+    The ImageDataGenerator augmentation of the notebook as Keras preprocessing layers.
+    They transform a whole batch with one vectorized op each (on the CPU), instead of
+    one image at a time in Python. Shear has no layer equivalent and is left out.
+    """
+    return tf.keras.Sequential([
+        tf.keras.layers.RandomFlip("horizontal", seed=seed),
+        tf.keras.layers.RandomRotation(rotation_range / 360.0, fill_mode="nearest", seed=seed),
+        tf.keras.layers.RandomTranslation(shift_range, shift_range, fill_mode="nearest", seed=seed),
+        tf.keras.layers.RandomZoom(zoom_range, fill_mode="nearest", seed=seed),
+    ], name="augmentation")
+
+
+def make_datasets(data_dir, cache_dir, batch_size=32, image_size=IMAGE_SIZE, validation_split=0.2,
+                  augmenter=None, seed=123):
+    """
+    Builds (or reuses) the caches and returns (train_ds, val_ds, class_names).
+    Images come out as float32 in [0, 1], matching the notebook's rescale=1./255.
+    """
+    class_names, splits = list_images(data_dir, validation_split, seed)
+    train_cache = ImageCache(cache_dir, "training").build(*splits["training"], class_names, image_size)
+    val_cache = ImageCache(cache_dir, "validation").build(*splits["validation"], class_names, image_size)
+
+    def rescale(images, labels):
+        return tf.cast(images, tf.float32) / 255.0, labels
+
+    def augment(images, labels):
+        return augmenter(images, training=True), labels
+
+    train_ds = train_cache.dataset(batch_size, shuffle=True, seed=seed).map(rescale, num_parallel_calls=AUTOTUNE)
+    if augmenter is not None:
+        train_ds = train_ds.map(augment, num_parallel_calls=AUTOTUNE)
+    val_ds = val_cache.dataset(batch_size).map(rescale, num_parallel_calls=AUTOTUNE)
+    return train_ds.prefetch(AUTOTUNE), val_ds.prefetch(AUTOTUNE), class_names
+
+
+def benchmark(dataset, max_batches=None):
+    """Iterates a dataset without a model and returns images per second."""
+    start = time.time()
+    count = 0
+    for i, (images, _) in enumerate(dataset):
+        count += int(images.shape[0])
+        if max_batches and i + 1 >= max_batches:
+            break
+    return count / max(time.time() - start, 1e-9)
@@ -0,0 +1,222 @@
+# export_model.py
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+import tensorflow as tf
+
+from data_pipeline import ImageCache, list_images
+from predict import load_labels, save_labels
+
+
+# --- Converters ---
+def export_tflite(model, path, quantization="dynamic", representative_images=None):
+    """
+    quantization: "none" (float32), "dynamic" (int8 weights, float activations) or
+    "int8" (full integer, calibrated on representative_images in [0, 1]).
+    """
+    converter = tf.lite.TFLiteConverter.from_keras_model(model)
+    if quantization in ("dynamic", "int8"):
+        converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    if quantization == "int8":
+        def representative_dataset():
+            for image in representative_images:
+                yield [image[np.newaxis].astype(np.float32)]
+
+        converter.representative_dataset = representative_dataset
+        converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+        # Calibrated on [0, 1] inputs, the uint8 input scale comes out as 1/255: raw pixels go straight in
+        converter.inference_input_type = tf.uint8
+        converter.inference_output_type = tf.uint8
+    with open(path, "wb") as f:
+        f.write(converter.convert())
+    return path
+
+
+def export_onnx(model, path, opset=13):
+    """
+    Needs tf2onnx; returns None when it is not installed.
+    tf2onnx's from_keras() cannot read Keras 3 models (what the notebook saves), so the
+    model is traced into a plain tf.function with an explicit input signature and that
+    graph is converted instead; this works for Keras 2 and 3 alike.
+    """
+    try:
+        import tf2onnx
+    except ImportError:
+        print("[WARN] tf2onnx not installed, skipping ONNX export (pip install tf2onnx onnxruntime)")
+        return None
+    signature = (tf.TensorSpec((None,) + tuple(model.input_shape[1:]), tf.float32, name="input"),)
+
+    @tf.function(input_signature=signature)
+    def serve(images):
+        return model(images, training=False)
+
+    tf2onnx.convert.from_function(serve, input_signature=signature, opset=opset, output_path=path)
+    return path
+
+
+# --- Runners: uint8 (N, H, W, 3) -> probabilities (N, classes) ---
+class KerasRunner:
+    def __init__(self, model, rescale):
+        self.model = model
+        self.rescale = rescale
+
+    def __call__(self, batch):
+        return np.asarray(self.model(batch.astype(np.float32) * self.rescale, training=False))
+
+
+class TFLiteRunner:
+    def __init__(self, path, rescale, threads=None):
+        self.interpreter = tf.lite.Interpreter(model_path=path, num_threads=threads or os.cpu_count())
+        self.interpreter.allocate_tensors()
+        self.input = self.interpreter.get_input_details()[0]
+        self.output = self.interpreter.get_output_details()[0]
+        self.rescale = rescale
+
+    def __call__(self, batch):
+        outputs = []
+        for image in batch:
+            x = image[np.newaxis].astype(np.float32) * self.rescale
+            if self.input["dtype"] != np.float32:
+                scale, zero_point = self.input["quantization"]
+                x = np.clip(np.round(x / scale + zero_point), 0, 255).astype(self.input["dtype"])
+            self.interpreter.set_tensor(self.input["index"], x)
+            self.interpreter.invoke()
+            y = self.interpreter.get_tensor(self.output["index"])
+            if self.output["dtype"] != np.float32:
+                scale, zero_point = self.output["quantization"]
+                y = (y.astype(np.float32) - zero_point) * scale
+            outputs.append(y[0])
+        return np.stack(outputs)
+
+
+class OnnxRunner:
+    def __init__(self, path, rescale, threads=None):
+        import onnxruntime as ort
+
+        options = ort.SessionOptions()
+        if threads:
+            options.intra_op_num_threads = threads
+        self.session = ort.InferenceSession(path, options, providers=["CPUExecutionProvider"])
+        self.input_name = self.session.get_inputs()[0].name
+        self.rescale = rescale
+
+    def __call__(self, batch):
+        return self.session.run(None, {self.input_name: batch.astype(np.float32) * self.rescale})[0]
+
+
+# --- Report ---
+def evaluate(runner, images, labels, batch_size=32, latency_samples=100):
+    """Returns (accuracy, predictions, single-image latency in ms (median), throughput img/s)."""
+    predictions = []
+    start = time.perf_counter()
+    for i in range(0, len(images), batch_size):
+        predictions.append(np.argmax(runner(np.asarray(images[i:i + batch_size])), axis=1))
+    throughput = len(images) / (time.perf_counter() - start)
+    predictions = np.concatenate(predictions)
+
+    runner(np.asarray(images[:1]))  # warm-up
+    timings = []
+    for image in images[:latency_samples]:
+        t0 = time.perf_counter()
+        runner(np.asarray(image)[np.newaxis])
+        timings.append((time.perf_counter() - t0) * 1000)
+    return float(np.mean(predictions == labels)), predictions, float(np.median(timings)), throughput
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export the animal classifier for CPU serving and compare accuracy/latency")
+    parser.add_argument("data_dir", help="dataset folder (validation split and int8 calibration images)")
+    parser.add_argument("--model", default="animal_classifier_v2_robust.keras")
+    parser.add_argument("--cache-dir", default="image_cache", help="decoded image cache shared with train.py")
+    parser.add_argument("--output-dir", default="exported")
+    parser.add_argument("--validation-split", type=float, default=0.2)
+    parser.add_argument("--calibration-images", type=int, default=300)
+    parser.add_argument("--max-eval", type=int, default=None, help="limit the validation images evaluated")
+    parser.add_argument("--threads", type=int, default=None)
+    parser.add_argument("--formats", nargs="+", default=["dynamic", "int8", "onnx"],
+                        choices=["float32", "dynamic", "int8", "onnx"])
+    args = parser.parse_args()
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    labels_info = load_labels(args.model)
+    rescale = labels_info.get("rescale", 1 / 255.0)
+    model = tf.keras.models.load_model(args.model)
+
+    class_names, splits = list_images(args.data_dir, args.validation_split)
+    train_cache = ImageCache(args.cache_dir, "training").build(*splits["training"], class_names)
+    val_cache = ImageCache(args.cache_dir, "validation").build(*splits["validation"], class_names)
+
+    rng = np.random.RandomState(0)
+    calibration_idx = np.sort(rng.choice(len(train_cache), min(args.calibration_images, len(train_cache)),
+                                         replace=False))
+    calibration = train_cache.images[calibration_idx].astype(np.float32) * rescale
+
+    base = os.path.splitext(os.path.basename(args.model))[0]
+    artifacts = {}
+    report = {"validation_images": 0, "results": {}}
+    for fmt in args.formats:
+        # One converter failing must not cost the results of the others
+        try:
+            if fmt == "onnx":
+                path = export_onnx(model, os.path.join(args.output_dir, f"{base}.onnx"))
+            else:
+                path = export_tflite(model, os.path.join(args.output_dir, f"{base}_{fmt}.tflite"),
+                                     "none" if fmt == "float32" else fmt, calibration)
+        except Exception as e:
+            print(f"[WARN] {fmt} export failed: {e!r}")
+            report["results"][fmt] = {"error": f"export failed: {e!r}"}
+            continue
+        if path:
+            save_labels(path, labels_info["class_names"], labels_info["translations"], labels_info["image_size"])
+            artifacts[fmt] = path
+            print(f"[EXPORT] {fmt}: {path}")
+        else:
+            report["results"][fmt] = {"error": "tf2onnx not installed"}
+
+    count = len(val_cache) if args.max_eval is None else min(args.max_eval, len(val_cache))
+    images, labels = val_cache.images[:count], val_cache.labels[:count]
+    runners = {"keras": (KerasRunner(model, rescale), args.model)}
+    for fmt, path in artifacts.items():
+        try:
+            if fmt == "onnx":
+                runners[fmt] = (OnnxRunner(path, rescale, args.threads), path)
+            else:
+                runners[fmt] = (TFLiteRunner(path, rescale, args.threads), path)
+        except ImportError:
+            print("[WARN] onnxruntime not installed, ONNX model not evaluated")
+            report["results"][fmt] = {"path": path, "error": "onnxruntime not installed"}
+        except Exception as e:
+            print(f"[WARN] {fmt} model could not be loaded: {e!r}")
+            report["results"][fmt] = {"path": path, "error": f"load failed: {e!r}"}
+
+    report["validation_images"] = int(count)
+    reference = None
+    print(f"\n{'format':<10}{'size MB':>9}{'accuracy':>10}{'delta':>9}{'agree':>8}{'latency ms':>12}{'img/s':>9}")
+    for name, (runner, path) in runners.items():
+        try:
+            accuracy, predictions, latency, throughput = evaluate(runner, images, labels)
+        except Exception as e:
+            print(f"{name:<10}evaluation failed: {e!r}")
+            report["results"][name] = {"path": path, "error": f"evaluation failed: {e!r}"}
+            continue
+        if reference is None:
+            reference = (accuracy, predictions)
+        delta = accuracy - reference[0]
+        agreement = float(np.mean(predictions == reference[1]))
+        size = os.path.getsize(path) / 1e6
+        report["results"][name] = {"path": path, "size_mb": size, "accuracy": accuracy, "accuracy_delta": delta,
+                                   "agreement_with_keras": agreement, "latency_ms": latency,
+                                   "throughput": throughput}
+        print(f"{name:<10}{size:>9.1f}{accuracy:>10.4f}{delta:>+9.4f}{agreement:>8.3f}{latency:>12.2f}{throughput:>9.1f}")
+
+    report_path = os.path.join(args.output_dir, f"{base}_export_report.json")
+    with open(report_path, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nReport saved to {report_path}")
+
+
+if __name__ == "__main__":
+    main()
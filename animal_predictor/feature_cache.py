@@ -0,0 +1,134 @@
+# feature_cache.py
+import hashlib
+import json
+import os
+import threading
+import time
+
+import numpy as np
+import tensorflow as tf
+
+from data_pipeline import AUTOTUNE, IMAGE_SIZE
+
+
+def build_feature_extractor(image_size=IMAGE_SIZE):
+    """
+    The frozen part of the classifier: MobileNetV2 + GlobalAveragePooling2D.
+    The pooling has no weights, so caching its output is exactly what the
+    trainable Dropout/Dense head would see.
+    """
+    base_model = tf.keras.applications.MobileNetV2(input_shape=(image_size, image_size, 3),
+                                                   include_top=False, weights="imagenet")
+    base_model.trainable = False
+    return tf.keras.Sequential([base_model, tf.keras.layers.GlobalAveragePooling2D()], name="feature_extractor")
+
+
+def augmenter_signature(augmenter):
+    """Digest of the augmentation settings (layer types and configs, minus their auto-generated names)."""
+    if augmenter is None:
+        return None
+    layers = getattr(augmenter, "layers", [augmenter])
+    config = [[type(layer).__name__, {k: v for k, v in layer.get_config().items() if k != "name"}]
+              for layer in layers]
+    return hashlib.sha1(json.dumps(config, sort_keys=True, default=str).encode()).hexdigest()
+
+
+class FeatureStore:
+    """
+    Backbone embeddings of one split, memory-mapped as float16 (views, N, features).
+    View 0 is the plain image; views 1.. are fixed augmented copies, so training the
+    head still sees augmentation without running the backbone again.
+    """
+
+    def __init__(self, cache_dir, subset):
+        self.cache_dir = cache_dir
+        self.subset = subset
+        self.features_path = os.path.join(cache_dir, f"{subset}_features.npy")
+        self.manifest_path = os.path.join(cache_dir, f"{subset}_features.json")
+        self.features = None
+        self.labels = None
+
+    def _key(self, image_cache, views, seed, augmenter):
+        return {"images": image_cache.manifest["fingerprint"], "views": views, "seed": seed,
+                "augmenter": augmenter_signature(augmenter), "backbone": "mobilenet_v2_imagenet_gap"}
+
+    def build(self, image_cache, views=1, augmenter=None, batch_size=64, seed=123, extractor=None):
+        if augmenter is None:
+            views = 1  # extra views would only be identical copies of the plain one
+        key = self._key(image_cache, views, seed, augmenter)
+        if os.path.isfile(self.manifest_path) and os.path.isfile(self.features_path):
+            with open(self.manifest_path) as f:
+                if json.load(f).get("key") == key:
+                    return self.open(image_cache)
+
+        # A run interrupted from here on must not leave the old manifest vouching for a half-written memmap
+        if os.path.exists(self.manifest_path):
+            os.remove(self.manifest_path)
+        extractor = extractor or build_feature_extractor(image_cache.images.shape[1])
+        dim = extractor.output_shape[-1]
+        count = len(image_cache)
+        features = np.lib.format.open_memmap(self.features_path, mode="w+", dtype=np.float16,
+                                             shape=(views, count, dim))
+        tf.keras.utils.set_random_seed(seed)
+        for view in range(views):
+            start = time.time()
+            ds = image_cache.dataset(batch_size).map(lambda x, y: tf.cast(x, tf.float32) / 255.0,
+                                                     num_parallel_calls=AUTOTUNE)
+            if view > 0:
+                ds = ds.map(lambda x: augmenter(x, training=True), num_parallel_calls=AUTOTUNE)
+            offset = 0
+            for images in ds.prefetch(AUTOTUNE):
+                batch = extractor(images, training=False).numpy()
+                features[view, offset:offset + len(batch)] = batch
+                offset += len(batch)
+            elapsed = time.time() - start
+            print(f"[FEATURES] {self.subset} view {view + 1}/{views}: {count} images in {elapsed:.1f}s "
+                  f"({count / max(elapsed, 1e-9):.0f} img/s)")
+        features.flush()
+        del features
+
+        # Written aside and renamed, so the manifest is either absent or complete
+        temp_path = self.manifest_path + ".tmp"
+        with open(temp_path, "w") as f:
+            json.dump({"key": key, "shape": [views, count, dim]}, f, indent=2)
+        os.replace(temp_path, self.manifest_path)
+        return self.open(image_cache)
+
+    def open(self, image_cache):
+        self.features = np.load(self.features_path, mmap_mode="r")
+        self.labels = image_cache.labels
+        return self
+
+    @property
+    def dim(self):
+        return self.features.shape[-1]
+
+    def dataset(self, batch_size=256, shuffle=False, seed=None):
+        """
+        Yields (features, labels) batches. When shuffling (training), every sample
+        is drawn from a random one of its cached views each epoch.
+        """
+        features, labels = self.features, self.labels
+        views, count, dim = features.shape
+        rng = np.random.RandomState(seed)
+        rng_lock = threading.Lock()  # batches are gathered on several tf.data threads
+
+        def gather(indices):
+            indices = np.sort(indices)
+            if shuffle:
+                with rng_lock:
+                    view = rng.randint(views, size=len(indices))
+            else:
+                view = np.zeros(len(indices), np.int64)
+            return features[view, indices].astype(np.float32), labels[indices]
+
+        def load(indices):
+            batch_features, batch_labels = tf.numpy_function(gather, [indices], (tf.float32, tf.int32))
+            batch_features.set_shape((None, dim))
+            batch_labels.set_shape((None,))
+            return batch_features, batch_labels
+
+        ds = tf.data.Dataset.range(count)
+        if shuffle:
+            ds = ds.shuffle(count, seed=seed, reshuffle_each_iteration=True)
+        return ds.batch(batch_size).map(load, num_parallel_calls=AUTOTUNE).prefetch(AUTOTUNE)
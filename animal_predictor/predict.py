@@ -0,0 +1,215 @@
+# predict.py
+import argparse
+import csv
+import json
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import tensorflow as tf
+from PIL import Image
+
+from data_pipeline import IMAGE_EXTENSIONS, IMAGE_SIZE
+
+# Italian folder names of the Animals-10 dataset -> English output
+TRANSLATION_DICT = {
+    'cane': 'Dog',
+    'cavallo': 'Horse',
+    'elefante': 'Elephant',
+    'farfalla': 'Butterfly',
+    'gallina': 'Chicken',
+    'gatto': 'Cat',
+    'mucca': 'Cow',
+    'pecora': 'Sheep',
+    'ragno': 'Spider',
+    'scoiattolo': 'Squirrel'
+}
+# Class order of flow_from_directory on Animals-10, for models saved before labels were stored
+DEFAULT_CLASS_NAMES = sorted(TRANSLATION_DICT)
+
+_MODELS = {}
+
+
+# --- Labels Sidecar ---
+def labels_path(model_path):
+    return os.path.splitext(model_path)[0] + ".labels.json"
+
+
+def save_labels(model_path, class_names, translations=None, image_size=IMAGE_SIZE):
+    """Stores everything needed to decode predictions next to the model."""
+    translations = TRANSLATION_DICT if translations is None else translations
+    info = {"class_names": list(class_names),
+            "translations": {name: translations.get(name, name) for name in class_names},
+            "image_size": image_size, "rescale": 1 / 255.0}
+    with open(labels_path(model_path), "w") as f:
+        json.dump(info, f, indent=2)
+    return info
+
+
+def load_labels(model_path):
+    path = labels_path(model_path)
+    if not os.path.isfile(path):
+        print(f"[WARN] {path} not found, assuming the Animals-10 classes")
+        return {"class_names": DEFAULT_CLASS_NAMES, "translations": dict(TRANSLATION_DICT),
+                "image_size": IMAGE_SIZE, "rescale": 1 / 255.0}
+    with open(path) as f:
+        return json.load(f)
+
+
+# --- Loading ---
+def load_image(path, image_size=IMAGE_SIZE, out=None):
+    """Decodes and resizes one image into out (uint8 HxWx3). JPEGs are decoded at reduced size when possible."""
+    with Image.open(path) as img:
+        # Lets the JPEG decoder skip detail that the resize would throw away
+        img.draft("RGB", (image_size, image_size))
+        img = img.convert("RGB").resize((image_size, image_size), Image.BILINEAR)
+        array = np.asarray(img)
+    if out is None:
+        return array.copy()
+    out[:] = array
+    return out
+
+
+def find_images(inputs):
+    """Expands files and directories (recursively) into a sorted list of image paths."""
+    paths = []
+    for item in inputs:
+        if os.path.isdir(item):
+            for root, _, files in os.walk(item):
+                paths.extend(os.path.join(root, f) for f in files if f.lower().endswith(IMAGE_EXTENSIONS))
+        else:
+            paths.append(item)
+    return sorted(paths)
+
+
+class BatchPrefetcher:
+    """
+    Decodes upcoming batches on a thread pool while the model runs on the current one.
+    Yields (paths, uint8 batch, ok mask); unreadable files are masked out instead of
+    stopping the run.
+    """
+
+    def __init__(self, paths, batch_size=64, image_size=IMAGE_SIZE, workers=None, depth=2):
+        self.paths = paths
+        self.batch_size = batch_size
+        self.image_size = image_size
+        self.workers = workers or min(16, (os.cpu_count() or 4))
+        self.batches = queue.Queue(maxsize=depth)
+
+    def _load_into(self, batch, i, path):
+        try:
+            load_image(path, self.image_size, out=batch[i])
+            return True
+        except (OSError, ValueError):
+            return False
+
+    def _produce(self):
+        try:
+            with ThreadPoolExecutor(self.workers) as pool:
+                for start in range(0, len(self.paths), self.batch_size):
+                    chunk = self.paths[start:start + self.batch_size]
+                    batch = np.empty((len(chunk), self.image_size, self.image_size, 3), np.uint8)
+                    ok = np.array(list(pool.map(lambda item: self._load_into(batch, *item), enumerate(chunk))))
+                    self.batches.put((chunk, batch, ok))
+        except BaseException as exc:
+            # Handed to the consumer, which would otherwise wait forever for the end marker
+            self.batches.put(exc)
+            return
+        self.batches.put(None)
+
+    def __iter__(self):
+        threading.Thread(target=self._produce, daemon=True).start()
+        while True:
+            item = self.batches.get()
+            if item is None:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+
+
+class AnimalPredictor:
+    """Loads a .keras model and its labels once and classifies images in batches."""
+
+    def __init__(self, model_path):
+        self.model_path = model_path
+        if model_path not in _MODELS:
+            _MODELS[model_path] = tf.keras.models.load_model(model_path)
+        self.model = _MODELS[model_path]
+        self.labels = load_labels(model_path)
+        self.class_names = self.labels["class_names"]
+        self.translations = self.labels["translations"]
+        self.image_size = self.labels.get("image_size", IMAGE_SIZE)
+        self.rescale = self.labels.get("rescale", 1 / 255.0)
+
+    def predict_batch(self, batch):
+        """uint8 (N, H, W, 3) -> probabilities (N, classes)."""
+        inputs = batch.astype(np.float32) * self.rescale
+        # Calling the model directly avoids predict()'s per-call dataset setup
+        return np.asarray(self.model(inputs, training=False))
+
+    def decode(self, probabilities):
+        index = int(np.argmax(probabilities))
+        name = self.class_names[index]
+        return name, self.translations.get(name, "Unknown"), float(probabilities[index])
+
+    def classify_paths(self, paths, batch_size=64, workers=None):
+        """Yields (path, italian label, english label, confidence); labels are None for unreadable files."""
+        for chunk, batch, ok in BatchPrefetcher(paths, batch_size, self.image_size, workers):
+            probabilities = self.predict_batch(batch[ok]) if ok.any() else []
+            rows = iter(probabilities)
+            for path, valid in zip(chunk, ok):
+                if valid:
+                    yield (path,) + self.decode(next(rows))
+                else:
+                    yield path, None, None, 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Classify images or folders of images with the animal classifier")
+    parser.add_argument("inputs", nargs="*", help="image files and/or folders")
+    parser.add_argument("--model", default="animal_classifier_v2_robust.keras")
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--workers", type=int, default=None, help="decode threads (default: CPU count)")
+    parser.add_argument("--output", help="write results to this CSV instead of printing them")
+    parser.add_argument("--write-labels", action="store_true",
+                        help="store the Animals-10 labels next to an existing model and exit")
+    args = parser.parse_args()
+
+    if args.write_labels:
+        save_labels(args.model, DEFAULT_CLASS_NAMES)
+        print(f"Labels saved to {labels_path(args.model)}")
+        return
+
+    paths = find_images(args.inputs)
+    if not paths:
+        parser.error("no images found")
+    predictor = AnimalPredictor(args.model)
+
+    start = time.time()
+    out = open(args.output, "w", newline="") if args.output else None
+    writer = csv.writer(out) if out else None
+    if writer:
+        writer.writerow(["path", "label", "english", "confidence"])
+    count = 0
+    try:
+        for path, label, english, confidence in predictor.classify_paths(paths, args.batch_size, args.workers):
+            count += 1
+            if writer:
+                writer.writerow([path, label, english, f"{confidence:.4f}"])
+            elif label is None:
+                print(f"{path}: could not be read")
+            else:
+                print(f"{path}: {english} ({confidence:.2%})")
+    finally:
+        if out:
+            out.close()
+    elapsed = time.time() - start
+    print(f"[INFO] {count} images in {elapsed:.1f}s ({count / max(elapsed, 1e-9):.1f} img/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+# train.py
+import argparse
+import time
+
+import tensorflow as tf
+from tensorflow.keras import layers, models
+
+from data_pipeline import IMAGE_SIZE, ImageCache, benchmark, build_augmenter, list_images, make_datasets
+from feature_cache import FeatureStore, build_feature_extractor
+from predict import save_labels
+
+
+def build_model(num_classes, dropout=0.5, image_size=IMAGE_SIZE):
+    """MobileNetV2 with a frozen backbone, as in the notebook (dropout=0 gives the v1 model)."""
+    base_model = tf.keras.applications.MobileNetV2(input_shape=(image_size, image_size, 3),
+                                                   include_top=False, weights="imagenet")
+    base_model.trainable = False
+    head = [layers.GlobalAveragePooling2D()]
+    if dropout:
+        head.append(layers.Dropout(dropout))
+    head.append(layers.Dense(num_classes, activation="softmax"))
+    return models.Sequential([base_model] + head)
+
+
+def build_head(feature_dim, num_classes, dropout=0.5):
+    """The trainable part of build_model(), taking pooled backbone features as input."""
+    head = [layers.Input((feature_dim,))]
+    if dropout:
+        head.append(layers.Dropout(dropout))
+    head.append(layers.Dense(num_classes, activation="softmax"))
+    return models.Sequential(head)
+
+
+def train_full(args, augmenter):
+    train_ds, val_ds, class_names = make_datasets(args.data_dir, args.cache_dir, args.batch_size,
+                                                  validation_split=args.validation_split, augmenter=augmenter)
+    print(f"Found {len(class_names)} classes: {class_names}")
+
+    if args.benchmark:
+        print(f"[BENCHMARK] training pipeline: {benchmark(train_ds):.0f} img/s")
+        print(f"[BENCHMARK] validation pipeline: {benchmark(val_ds):.0f} img/s")
+        return None
+
+    model = build_model(len(class_names), args.dropout)
+    model.compile(optimizer=tf.keras.optimizers.Adam(args.learning_rate), loss="sparse_categorical_crossentropy",
+                  metrics=["accuracy"])
+    model.summary()
+    model.fit(train_ds, epochs=args.epochs, validation_data=val_ds)
+    return model
+
+
+def train_head_only(args, augmenter):
+    """
+    Runs the frozen backbone once per image (and per augmented view), caches the
+    embeddings, and trains only the Dropout/Dense head on them. The head's weights
+    are then put back on top of the backbone, giving the same model as train_full().
+    """
+    class_names, splits = list_images(args.data_dir, args.validation_split)
+    print(f"Found {len(class_names)} classes: {class_names}")
+    extractor = build_feature_extractor()
+    stores = {}
+    for subset in ("training", "validation"):
+        images = ImageCache(args.cache_dir, subset).build(*splits[subset], class_names)
+        views = args.views if subset == "training" else 1
+        stores[subset] = FeatureStore(args.cache_dir, subset).build(images, views, augmenter, extractor=extractor)
+
+    head = build_head(stores["training"].dim, len(class_names), args.dropout)
+    head.compile(optimizer=tf.keras.optimizers.Adam(args.learning_rate), loss="sparse_categorical_crossentropy",
+                 metrics=["accuracy"])
+    start = time.time()
+    head.fit(stores["training"].dataset(args.head_batch_size, shuffle=True), epochs=args.epochs,
+             validation_data=stores["validation"].dataset(args.head_batch_size))
+    print(f"[HEAD] {args.epochs} epochs in {time.time() - start:.1f}s")
+
+    model = build_model(len(class_names), args.dropout)
+    model.layers[-1].set_weights(head.layers[-1].get_weights())
+    return model
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train the animal classifier from a cached tf.data pipeline")
+    parser.add_argument("data_dir", help="folder with one subfolder per class (e.g. animals10/raw-img)")
+    parser.add_argument("--cache-dir", default="image_cache", help="where decoded images and features are cached")
+    parser.add_argument("--output", default="animal_classifier_v2_robust.keras")
+    parser.add_argument("--epochs", type=int, default=5)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--learning-rate", type=float, default=1e-3)
+    parser.add_argument("--dropout", type=float, default=0.5, help="0 reproduces the v1 model")
+    parser.add_argument("--validation-split", type=float, default=0.2)
+    parser.add_argument("--no-augment", action="store_true")
+    parser.add_argument("--head-only", action="store_true",
+                        help="cache frozen-backbone features once and train only the classification head")
+    parser.add_argument("--views", type=int, default=3,
+                        help="--head-only: cached views per training image (1 plain + augmented copies)")
+    parser.add_argument("--head-batch-size", type=int, default=256)
+    parser.add_argument("--benchmark", action="store_true",
+                        help="only measure input pipeline throughput (images/s), no training")
+    args = parser.parse_args()
+
+    # v2 settings of the notebook: rotation 45, shifts 0.25, zoom 0.3
+    augmenter = None if args.no_augment else build_augmenter(rotation_range=45, shift_range=0.25, zoom_range=0.3)
+    model = train_head_only(args, augmenter) if args.head_only else train_full(args, augmenter)
+    if model is None:
+        return
+
+    model.save(args.output)
+    # Inference needs the class order and translations without the training data at hand
+    save_labels(args.output, list_images(args.data_dir, args.validation_split)[0])
+    print(f"Model '{args.output}' saved successfully!")
+
+
+if __name__ == "__main__":
+    main()
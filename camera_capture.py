@@ -0,0 +1,175 @@
+# camera_capture.py
+import os
+import threading
+import time
+
+import cv2
+import numpy as np
+
+
+class CameraCapture:
+    """
+    Shared frame source for all the demos.
+
+    - Negotiates codec (MJPEG by default), resolution and FPS with the camera and
+      reports what the driver actually granted.
+    - Decodes into a small ring of preallocated buffers (cap.read(image=buf)), and
+      mirrors with cv2.flip(..., dst=buf), so no new frame arrays are allocated per frame.
+    - Keeps the latest frame with its timestamp and sequence number, optionally
+      filled by a background reader thread.
+    - Accepts a video file path instead of a camera index for offline runs.
+
+    A frame returned by read()/latest() stays valid until ring_size - 1 further
+    frames have been read; copy it if it must be kept longer.
+    """
+
+    def __init__(self, source=0, width=None, height=None, fps=None, fourcc="MJPG", mirror=False,
+                 ring_size=4, api_preference=cv2.CAP_ANY):
+        self.source = source
+        self.is_file = isinstance(source, str) and os.path.isfile(source)
+        self.mirror = mirror
+        self.ring_size = max(2, ring_size)
+
+        self.cap = cv2.VideoCapture(source, api_preference)
+        if not self.cap.isOpened():
+            raise IOError(f"Cannot open video source: {source}")
+
+        if not self.is_file:
+            # The codec has to be set before the size, otherwise some drivers ignore it
+            if fourcc:
+                self.cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*fourcc))
+            if width:
+                self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+            if height:
+                self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+            if fps:
+                self.cap.set(cv2.CAP_PROP_FPS, fps)
+
+        self.width = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        self.height = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        self.fps = self.cap.get(cv2.CAP_PROP_FPS)
+
+        self._ring = []
+        self._raw = None
+        self._slot = 0
+        self._allocate((self.height, self.width, 3))
+
+        self.latest_frame = None
+        self.latest_timestamp = None
+        self.sequence = 0
+
+        self._lock = threading.Lock()
+        self._new_frame = threading.Condition(self._lock)
+        self._thread = None
+        self._running = False
+
+    def _allocate(self, shape):
+        if shape[0] <= 0 or shape[1] <= 0:
+            # Some backends only report a size after the first frame; read() will resize
+            self._ring = []
+            self._raw = None
+            return
+        self._ring = [np.empty(shape, np.uint8) for _ in range(self.ring_size)]
+        self._raw = np.empty(shape, np.uint8) if self.mirror else None
+
+    def describe(self):
+        """Returns a one-line summary of the negotiated format."""
+        fourcc = int(self.cap.get(cv2.CAP_PROP_FOURCC))
+        codec = "".join(chr((fourcc >> 8 * i) & 0xFF) for i in range(4)) if fourcc else "----"
+        kind = "file" if self.is_file else "camera"
+        return f"{kind} {self.source}: {self.width}x{self.height} @ {self.fps:.1f} FPS ({codec})"
+
+    def _read_into_ring(self):
+        """Decodes the next frame into the next ring slot. Returns (ok, frame, timestamp)."""
+        if not self._ring:
+            ok, frame = self.cap.read()
+            if not ok:
+                return False, None, None
+            self.height, self.width = frame.shape[:2]
+            self._allocate(frame.shape)
+            target = self._ring[self._slot]
+            if self.mirror:
+                cv2.flip(frame, 1, dst=target)
+            else:
+                np.copyto(target, frame)
+        else:
+            target = self._ring[self._slot]
+            buffer = self._raw if self.mirror else target
+            ok, frame = self.cap.read(image=buffer)
+            if not ok:
+                return False, None, None
+            if frame is not buffer:
+                # The stream changed size: reallocate the ring around the new shape
+                self.height, self.width = frame.shape[:2]
+                self._allocate(frame.shape)
+                target = self._ring[self._slot]
+                buffer = frame
+            if self.mirror:
+                cv2.flip(buffer, 1, dst=target)
+
+        if self.is_file:
+            timestamp = self.cap.get(cv2.CAP_PROP_POS_MSEC) / 1000.0
+        else:
+            timestamp = time.time()
+        self._slot = (self._slot + 1) % self.ring_size
+        return True, target, timestamp
+
+    def read(self):
+        """
+        Reads the next frame synchronously.
+        Returns (success, frame, timestamp) like cap.read() plus the capture time
+        (wall clock for cameras, stream position in seconds for video files).
+        """
+        ok, frame, timestamp = self._read_into_ring()
+        if ok:
+            with self._lock:
+                self.latest_frame, self.latest_timestamp = frame, timestamp
+                self.sequence += 1
+                self._new_frame.notify_all()
+        return ok, frame, timestamp
+
+    # --- Background Reader ---
+    def start(self):
+        """Starts a reader thread so latest() always returns the newest frame."""
+        if self._thread is None:
+            self._running = True
+            self._thread = threading.Thread(target=self._reader_loop, daemon=True)
+            self._thread.start()
+        return self
+
+    def _reader_loop(self):
+        while self._running:
+            ok, _, _ = self.read()
+            if not ok:
+                break
+        self._running = False
+        with self._lock:
+            self._new_frame.notify_all()
+
+    def latest(self, after_sequence=None, timeout=1.0):
+        """
+        Returns (frame, timestamp, sequence) for the newest frame.
+        If after_sequence is given, waits up to timeout seconds for a newer one.
+        """
+        with self._lock:
+            if after_sequence is not None:
+                self._new_frame.wait_for(lambda: self.sequence > after_sequence or not self._running,
+                                         timeout=timeout)
+            return self.latest_frame, self.latest_timestamp, self.sequence
+
+    @property
+    def running(self):
+        return self._running
+
+    def release(self):
+        self._running = False
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+        self.cap.release()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
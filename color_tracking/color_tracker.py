@@ -0,0 +1,184 @@
+# color_tracker.py
+import argparse
+import os
+import sys
+import time
+from collections import namedtuple
+
+import cv2
+import numpy as np
+
+# The shared capture module lives in the repository root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from camera_capture import CameraCapture
+
+# Define color ranges in HSV (OpenCV: H 0-179, S and V 0-255)
+COLOR_RANGES = {
+    'Red':    ([0, 120, 100],    [10, 255, 255]),
+    'Green':  ([40, 70, 70],     [80, 255, 255]),
+    'Blue':   ([90, 100, 100],   [130, 255, 255]),
+}
+
+# Assign unique colors for drawing
+DRAWING_COLORS = {
+    'Red':   (0, 0, 255),
+    'Green': (0, 255, 0),
+    'Blue':  (255, 0, 0),
+}
+
+Blob = namedtuple("Blob", ["name", "label", "box", "area", "centroid"])
+
+
+def build_hsv_lut(color_ranges, sv_shift=2):
+    """
+    Precomputes the label of every HSV value: a (180, 256 >> sv_shift, 256 >> sv_shift)
+    uint8 table, 0 = background, i + 1 = i-th color range. Later ranges win where they
+    overlap. A range whose lower hue is above its upper hue wraps around 180 (for reds).
+    S and V are binned by sv_shift bits so the table stays cache-sized; a bin takes the
+    label of its center value.
+    """
+    if len(color_ranges) > 255:
+        raise ValueError("At most 255 colors fit in a uint8 label image")
+    levels = 256 >> sv_shift
+    centers = (np.arange(levels) << sv_shift) + ((1 << sv_shift) >> 1)
+    hue = np.arange(180)[:, None, None]
+    sat = centers[None, :, None]
+    val = centers[None, None, :]
+
+    lut = np.zeros((180, levels, levels), np.uint8)
+    for label, (lower, upper) in enumerate(color_ranges.values(), start=1):
+        (h0, s0, v0), (h1, s1, v1) = lower, upper
+        hue_in = (hue >= h0) & (hue <= h1) if h0 <= h1 else (hue >= h0) | (hue <= h1)
+        inside = hue_in & (sat >= s0) & (sat <= s1) & (val >= v0) & (val <= v1)
+        lut[inside] = label
+    return lut
+
+
+class ColorTracker:
+    """
+    Finds blobs of many colors at once.
+
+    Instead of one inRange + dilate + findContours pass per color, every pixel is
+    classified against all ranges with a single lookup in a precomputed HSV table,
+    giving a label image. Blobs of all colors then come out of one
+    connectedComponentsWithStats call. The cost per frame barely depends on the
+    number of colors.
+    """
+
+    def __init__(self, color_ranges=None, min_area=300, dilate=5, sv_shift=2):
+        self.color_ranges = dict(color_ranges or COLOR_RANGES)
+        self.names = list(self.color_ranges)
+        self.min_area = min_area
+        self.kernel = np.ones((dilate, dilate), np.uint8) if dilate else None
+        self.sv_shift = sv_shift
+        self.lut = build_hsv_lut(self.color_ranges, sv_shift).ravel()
+        self._index = None
+
+    def label_image(self, frame):
+        """BGR frame -> uint8 label image (0 = no configured color)."""
+        hsv = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV)
+        bits = 8 - self.sv_shift
+        if self._index is None or self._index.shape != hsv.shape[:2]:
+            self._index = np.empty(hsv.shape[:2], np.int32)
+        index = self._index
+        # index = (h << 2 * bits) | (s >> shift << bits) | (v >> shift), in place
+        np.left_shift(hsv[:, :, 0], 2 * bits, out=index, dtype=np.int32)
+        index |= (hsv[:, :, 1] >> self.sv_shift).astype(np.int32) << bits
+        index |= hsv[:, :, 2] >> self.sv_shift
+        return self.lut.take(index)
+
+    def track(self, frame):
+        labels = self.label_image(frame)
+        if self.kernel is not None:
+            # Grayscale dilation of the label image closes small gaps, as the per-mask dilate did
+            labels = cv2.dilate(labels, self.kernel)
+
+        # Cut the borders between different colors so touching blobs stay separate
+        foreground = labels > 0
+        foreground[:, 1:] &= labels[:, 1:] == labels[:, :-1]
+        foreground[1:, :] &= labels[1:, :] == labels[:-1, :]
+
+        count, components, stats, centroids = cv2.connectedComponentsWithStats(foreground.view(np.uint8),
+                                                                               connectivity=4)
+        # Every component holds a single label, so its mean label is that label
+        label_sums = np.bincount(components.ravel(), weights=labels.ravel(), minlength=count)
+        blobs = []
+        for i in range(1, count):
+            x, y, w, h, area = stats[i]
+            if area <= self.min_area:
+                continue
+            label = int(round(label_sums[i] / area))
+            blobs.append(Blob(self.names[label - 1], label, (int(x), int(y), int(w), int(h)), int(area),
+                              (float(centroids[i][0]), float(centroids[i][1]))))
+        return blobs
+
+
+def draw_blobs(frame, blobs, drawing_colors=None):
+    drawing_colors = drawing_colors or DRAWING_COLORS
+    for blob in blobs:
+        x, y, w, h = blob.box
+        color = drawing_colors.get(blob.name, (255, 255, 255))
+        cv2.rectangle(frame, (x, y), (x + w, y + h), color, 2)
+        cv2.putText(frame, f"{blob.name}", (x, y - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.7, color, 2)
+
+
+def benchmark(frame, counts=(3, 12, 48), repeats=20):
+    """Compares per-frame cost against the per-color inRange loop for growing numbers of colors."""
+    rng = np.random.RandomState(0)
+    for count in counts:
+        ranges = {}
+        for i in range(count):
+            h = rng.randint(0, 170)
+            ranges[f"c{i}"] = ([h, 80, 80], [h + 8, 255, 255])
+        tracker = ColorTracker(ranges)
+        start = time.perf_counter()
+        for _ in range(repeats):
+            tracker.track(frame)
+        lut_ms = (time.perf_counter() - start) / repeats * 1000
+
+        start = time.perf_counter()
+        for _ in range(repeats):
+            hsv = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV)
+            for lower, upper in ranges.values():
+                mask = cv2.dilate(cv2.inRange(hsv, np.array(lower, np.uint8), np.array(upper, np.uint8)),
+                                  np.ones((5, 5), np.uint8))
+                cv2.findContours(mask, cv2.RETR_TREE, cv2.CHAIN_APPROX_SIMPLE)
+        loop_ms = (time.perf_counter() - start) / repeats * 1000
+        print(f"{count:>3} colors: lookup table {lut_ms:6.2f} ms/frame | inRange loop {loop_ms:6.2f} ms/frame")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Track colored markers")
+    parser.add_argument("--source", default="0", help="camera index or video file")
+    parser.add_argument("--min-area", type=int, default=300)
+    parser.add_argument("--benchmark", action="store_true", help="time against the per-color loop and exit")
+    args = parser.parse_args()
+
+    source = int(args.source) if args.source.isdigit() else args.source
+    cap = CameraCapture(source)
+    tracker = ColorTracker(COLOR_RANGES, min_area=args.min_area)
+
+    if args.benchmark:
+        ret, frame, _ = cap.read()
+        if ret:
+            benchmark(frame.copy())
+        cap.release()
+        return
+
+    while True:
+        ret, frame, _ = cap.read()
+        if not ret:
+            break
+
+        draw_blobs(frame, tracker.track(frame))
+        cv2.imshow("Color Detection", frame)
+
+        if cv2.waitKey(1) & 0xFF == ord('q'):
+            break
+
+    cap.release()
+    cv2.destroyAllWindows()
+
+
+if __name__ == "__main__":
+    main()
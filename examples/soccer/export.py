@@ -0,0 +1,217 @@
+# export.py
+"""
+Local export and benchmark of the player detector, no external service needed.
+
+    python export.py --weights runs/detect/train3/weights/best.pt \
+        --data datasets/football-players-detection-20/data.yaml --imgsz 640 960 1280 --int8
+
+For every image size it exports static ONNX and OpenVINO models (plus int8 versions
+calibrated on the local validation images with --int8), then measures each variant:
+mAP with Ultralytics' validator and frames/second through the same Detector used by
+inference.py (letterbox, network and NMS on CPU). The comparison is written as CSV
+and Markdown.
+"""
+import argparse
+import csv
+import glob
+import os
+import shutil
+import time
+
+import cv2
+import numpy as np
+import yaml
+
+from inference import Detector, Letterbox
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp")
+
+
+# --- Dataset ---
+def validation_images(data):
+    """Validation images listed in a YOLO data.yaml (paths may be relative to the file or its parent)."""
+    with open(data) as f:
+        config = yaml.safe_load(f)
+    root = os.path.dirname(os.path.abspath(data))
+    base = os.path.join(root, config.get("path", ""))
+    val = config["val"]
+    for candidate in (val, os.path.join(base, val), os.path.join(root, val.lstrip("./")),
+                      os.path.join(root, "valid", "images")):
+        if os.path.isdir(candidate):
+            return sorted(p for p in glob.glob(os.path.join(candidate, "*")) if p.lower().endswith(IMAGE_EXTENSIONS))
+    raise FileNotFoundError(f"Validation images of {data} not found")
+
+
+# --- Export ---
+def export_name(weights, imgsz, fmt, precision):
+    stem = os.path.splitext(os.path.basename(weights))[0]
+    suffix = "" if precision == "fp32" else "_int8"
+    return f"{stem}_{imgsz}{suffix}.onnx" if fmt == "onnx" else f"{stem}_{imgsz}{suffix}_openvino_model"
+
+
+class OnnxCalibrationReader:
+    """Feeds letterboxed validation images to ONNX Runtime's static quantization."""
+
+    def __init__(self, input_name, images, imgsz):
+        self.input_name = input_name
+        self.images = iter(images)
+        self.imgsz = imgsz
+
+    def get_next(self):
+        for path in self.images:
+            image = cv2.imread(path)
+            if image is not None:
+                return {self.input_name: Letterbox(image.shape, (self.imgsz, self.imgsz))([image])}
+        return None
+
+
+def quantize_onnx(fp32_path, int8_path, images, imgsz):
+    """
+    Static int8 quantization (QDQ, per-channel weights) calibrated on local images.
+    The detection head (last module) stays in float: its box regression and the
+    concatenated class scores lose most of the accuracy when quantized.
+    """
+    import onnx
+    from onnxruntime.quantization import CalibrationMethod, QuantFormat, QuantType, quantize_static
+
+    model = onnx.load(fp32_path)
+    # Node names look like /model.22/cv2.0/cv2.0.0/conv/Conv: the top-level module is "model.22"
+    modules = {node.name.split("/")[1] for node in model.graph.node if node.name.startswith("/model.")}
+    head = max(modules, key=lambda name: int(name.split(".")[1]))
+    exclude = [node.name for node in model.graph.node if node.name.startswith(f"/{head}/")]
+    input_name = model.graph.input[0].name
+
+    quantize_static(fp32_path, int8_path, OnnxCalibrationReader(input_name, images, imgsz),
+                    quant_format=QuantFormat.QDQ, per_channel=True, activation_type=QuantType.QUInt8,
+                    weight_type=QuantType.QInt8, calibrate_method=CalibrationMethod.MinMax,
+                    nodes_to_exclude=exclude)
+
+    # Keep the Ultralytics metadata (class names, stride, imgsz) so the validator can load it
+    quantized = onnx.load(int8_path)
+    del quantized.metadata_props[:]
+    quantized.metadata_props.extend(model.metadata_props)
+    onnx.save(quantized, int8_path)
+
+
+def export_variant(weights, fmt, precision, imgsz, data, out_dir, calibration_images, force=False):
+    from ultralytics import YOLO
+
+    target = os.path.join(out_dir, export_name(weights, imgsz, fmt, precision))
+    if os.path.exists(target) and not force:
+        return target
+    if fmt == "onnx" and precision == "int8":
+        fp32 = export_variant(weights, "onnx", "fp32", imgsz, data, out_dir, calibration_images, force)
+        quantize_onnx(fp32, target, calibration_images, imgsz)
+        return target
+
+    # Ultralytics writes next to the weights under a fixed name, so move it to a per-size name
+    exported = YOLO(weights).export(format=fmt, imgsz=imgsz, int8=precision == "int8", data=data,
+                                    dynamic=False, simplify=True, device="cpu")
+    if os.path.isdir(target):
+        shutil.rmtree(target)
+    elif os.path.exists(target):
+        os.remove(target)
+    shutil.move(str(exported), target)
+    return target
+
+
+# --- Benchmark ---
+def size_mb(path):
+    if os.path.isdir(path):
+        return sum(os.path.getsize(p) for p in glob.glob(os.path.join(path, "*"))) / 1e6
+    return os.path.getsize(path) / 1e6
+
+
+def measure_accuracy(model_path, data, imgsz):
+    from ultralytics import YOLO
+
+    metrics = YOLO(model_path, task="detect").val(data=data, imgsz=imgsz, batch=1, device="cpu", plots=False,
+                                                   verbose=False)
+    return float(metrics.box.map50), float(metrics.box.map)
+
+
+def measure_speed(model_path, images, imgsz, threads=None, warmup=5):
+    """Frames/second and ms per stage, one frame at a time as in a live stream."""
+    detector = Detector(model_path, imgsz, threads=threads)
+    frames = [frame for frame in (cv2.imread(p) for p in images) if frame is not None]
+    for frame in frames[:warmup]:
+        detector.detect_batch([frame])
+    detector.timings = dict.fromkeys(detector.timings, 0.0)
+    start = time.perf_counter()
+    for frame in frames:
+        detector.detect_batch([frame])
+    elapsed = time.perf_counter() - start
+    per_frame = {stage: seconds / len(frames) * 1000 for stage, seconds in detector.timings.items()}
+    return len(frames) / elapsed, per_frame
+
+
+def write_report(rows, output):
+    columns = ["model", "format", "precision", "imgsz", "size_mb", "map50", "map50_95", "fps", "inference_ms"]
+    with open(output + ".csv", "w", newline="") as f:
+        writer = csv.DictWriter(f, columns)
+        writer.writeheader()
+        writer.writerows(rows)
+
+    def cell(value):
+        if isinstance(value, float):
+            return f"{value:.3f}" if value < 1 else f"{value:.1f}"
+        return "-" if value is None else str(value)
+
+    lines = ["| " + " | ".join(columns) + " |", "|" + "---|" * len(columns)]
+    lines += ["| " + " | ".join(cell(row.get(c)) for c in columns) + " |" for row in rows]
+    with open(output + ".md", "w") as f:
+        f.write("\n".join(lines) + "\n")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export the player detector to ONNX/OpenVINO and benchmark it")
+    parser.add_argument("--weights", default="runs/detect/train3/weights/best.pt")
+    parser.add_argument("--data", required=True, help="data.yaml of the dataset (validation split is used)")
+    parser.add_argument("--formats", nargs="+", default=["torch", "onnx", "openvino"],
+                        choices=["torch", "onnx", "openvino"])
+    parser.add_argument("--imgsz", type=int, nargs="+", default=[640, 960, 1280])
+    parser.add_argument("--int8", action="store_true", help="also export int8 models calibrated on validation images")
+    parser.add_argument("--calibration-images", type=int, default=200)
+    parser.add_argument("--speed-images", type=int, default=100, help="validation images timed per variant")
+    parser.add_argument("--threads", type=int, default=None)
+    parser.add_argument("--skip-accuracy", action="store_true", help="only measure speed")
+    parser.add_argument("--out-dir", default=None, help="default: <weights dir>/exports")
+    parser.add_argument("--force", action="store_true", help="re-export models that already exist")
+    args = parser.parse_args()
+
+    out_dir = args.out_dir or os.path.join(os.path.dirname(os.path.abspath(args.weights)), "exports")
+    os.makedirs(out_dir, exist_ok=True)
+    images = validation_images(args.data)
+    # Spread calibration and timing images over the whole split rather than its first clip
+    calibration = images[::max(1, len(images) // args.calibration_images)][:args.calibration_images]
+    timing = images[::max(1, len(images) // args.speed_images)][:args.speed_images]
+    print(f"[INFO] {len(images)} validation images, exports in {out_dir}")
+
+    rows = []
+    for imgsz in args.imgsz:
+        for fmt in args.formats:
+            for precision in ["fp32", "int8"] if args.int8 and fmt != "torch" else ["fp32"]:
+                if fmt == "torch":
+                    path = args.weights
+                else:
+                    print(f"[INFO] Exporting {fmt} {precision} @ {imgsz}...")
+                    path = export_variant(args.weights, fmt, precision, imgsz, args.data, out_dir, calibration,
+                                          args.force)
+                row = {"model": os.path.basename(path.rstrip("/")), "format": fmt, "precision": precision,
+                       "imgsz": imgsz, "size_mb": size_mb(path)}
+                if not args.skip_accuracy:
+                    row["map50"], row["map50_95"] = measure_accuracy(path, args.data, imgsz)
+                row["fps"], per_frame = measure_speed(path, timing, imgsz, args.threads)
+                row["inference_ms"] = per_frame["inference"]
+                print(f"[INFO] {row['model']}: mAP50 {row.get('map50', float('nan')):.3f} | "
+                      f"{row['fps']:.1f} frames/s | inference {row['inference_ms']:.1f} ms")
+                rows.append(row)
+
+    output = os.path.join(out_dir, "benchmark")
+    print(write_report(rows, output))
+    print(f"[INFO] Report written to {output}.csv and {output}.md")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,475 @@
+# inference.py
+"""
+Streaming inference of the player detector trained in notebooks/train_player_detector.ipynb.
+
+    python inference.py match.mp4 --weights runs/detect/train3/weights/best.pt --output match.parquet
+
+Frames are decoded on a reader thread, letterboxed into one preallocated batch
+array, run through the raw network (no per-frame framework overhead) and
+post-processed (confidence/class filtering and NMS) with NumPy on the whole
+batch. Detections are streamed to Parquet (or .npz) as columns:
+frame, class_id, confidence, x1, y1, x2, y2.
+"""
+import argparse
+import ast
+import glob
+import json
+import math
+import os
+import queue
+import threading
+import time
+
+import cv2
+import numpy as np
+
+# Class order of the football-players-detection dataset (data.yaml)
+CLASS_NAMES = {0: "ball", 1: "goalkeeper", 2: "player", 3: "referee"}
+STRIDE = 32
+
+
+# --- Reading ---
+class FrameReader:
+    """Decodes a video on its own thread into a bounded queue of (frame index, frame)."""
+
+    def __init__(self, source, stride=1, queue_size=16, start=0, end=None):
+        self.cap = cv2.VideoCapture(source)
+        if not self.cap.isOpened():
+            raise IOError(f"Cannot open video: {source}")
+        self.fps = self.cap.get(cv2.CAP_PROP_FPS) or 25.0
+        self.frame_count = int(self.cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        self.width = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        self.height = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        self.stride = max(1, stride)
+        self.start = start
+        self.end = end
+        self.frames = queue.Queue(maxsize=queue_size)
+        self.decode_time = 0.0
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        if self.start:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, self.start)
+        index = self.start
+        while self.end is None or index < self.end:
+            t0 = time.perf_counter()
+            if (index - self.start) % self.stride:
+                ok = self.cap.grab()  # skipped frame: no colour conversion or copy
+                frame = None
+            else:
+                ok, frame = self.cap.read()
+            self.decode_time += time.perf_counter() - t0
+            if not ok:
+                break
+            if frame is not None:
+                self.frames.put((index, frame))
+            index += 1
+        self.frames.put(None)
+        self.cap.release()
+
+    def batches(self, batch_size):
+        """Yields lists of (frame index, frame) of up to batch_size frames."""
+        self._thread.start()
+        batch = []
+        while True:
+            item = self.frames.get()
+            if item is None:
+                break
+            batch.append(item)
+            if len(batch) == batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+
+# --- Backends: float32 (B, 3, H, W) in [0, 1] -> raw (B, 4 + classes, anchors) ---
+class TorchBackend:
+    """Runs the network inside a YOLOv8 .pt checkpoint directly (no Ultralytics predictor)."""
+
+    fixed_shape = None
+
+    def __init__(self, weights, device="cpu", threads=None):
+        import torch
+        from ultralytics import YOLO
+
+        if threads:
+            torch.set_num_threads(threads)
+        self.torch = torch
+        yolo = YOLO(weights)
+        self.names = dict(yolo.names)
+        self.device = torch.device(device)
+        self.model = yolo.model.fuse().eval().to(self.device)
+
+    def __call__(self, batch):
+        with self.torch.inference_mode():
+            output = self.model(self.torch.from_numpy(batch).to(self.device))
+        if isinstance(output, (list, tuple)):
+            output = output[0]
+        return output.float().cpu().numpy()
+
+
+class OnnxBackend:
+    """ONNX Runtime on CPU, for models exported with export.py or `yolo export format=onnx`."""
+
+    def __init__(self, weights, threads=None):
+        import onnxruntime as ort
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if threads:
+            options.intra_op_num_threads = threads
+        self.session = ort.InferenceSession(weights, options, providers=["CPUExecutionProvider"])
+        model_input = self.session.get_inputs()[0]
+        self.input_name = model_input.name
+        height, width = model_input.shape[2:4]
+        # Static exports only accept their own size; dynamic ones report names instead of ints
+        self.fixed_shape = (height, width) if isinstance(height, int) and isinstance(width, int) else None
+        self.fixed_batch = model_input.shape[0] if isinstance(model_input.shape[0], int) else None
+        metadata = self.session.get_modelmeta().custom_metadata_map
+        self.names = ast.literal_eval(metadata["names"]) if "names" in metadata else dict(CLASS_NAMES)
+
+    def __call__(self, batch):
+        if self.fixed_batch and len(batch) != self.fixed_batch:
+            return np.concatenate([self.session.run(None, {self.input_name: batch[i:i + 1]})[0]
+                                   for i in range(len(batch))])
+        return self.session.run(None, {self.input_name: batch})[0]
+
+
+class OpenVinoBackend:
+    """OpenVINO on CPU, for <name>_openvino_model/ directories (or .xml files) written by export.py."""
+
+    def __init__(self, weights, threads=None):
+        import openvino as ov
+
+        xml = weights if weights.endswith(".xml") else glob.glob(os.path.join(weights, "*.xml"))[0]
+        core = ov.Core()
+        model = core.read_model(xml)
+        config = {"PERFORMANCE_HINT": "LATENCY"}
+        if threads:
+            config["INFERENCE_NUM_THREADS"] = threads
+        self.compiled = core.compile_model(model, "CPU", config)
+        self.request = self.compiled.create_infer_request()
+        self.output = self.compiled.output(0)
+        shape = model.input(0).get_partial_shape()
+        self.fixed_shape = (shape[2].get_length(), shape[3].get_length()) if shape.is_static else None
+        self.fixed_batch = shape[0].get_length() if shape[0].is_static else None
+        self.names = dict(CLASS_NAMES)
+        metadata = os.path.join(os.path.dirname(xml), "metadata.yaml")
+        if os.path.isfile(metadata):
+            import yaml
+
+            with open(metadata) as f:
+                self.names = yaml.safe_load(f).get("names", self.names)
+
+    def _run(self, batch):
+        # The request reuses its output buffer, so copy before the next call
+        return self.request.infer({0: batch})[self.output].copy()
+
+    def __call__(self, batch):
+        if self.fixed_batch and len(batch) != self.fixed_batch:
+            return np.concatenate([self._run(batch[i:i + 1]) for i in range(len(batch))])
+        return self._run(batch)
+
+
+def create_backend(weights, threads=None, device="cpu"):
+    if weights.endswith(".onnx"):
+        return OnnxBackend(weights, threads)
+    if weights.endswith(".xml") or os.path.isdir(weights):
+        return OpenVinoBackend(weights, threads)
+    return TorchBackend(weights, device, threads)
+
+
+# --- Pre/Post-processing ---
+def letterbox_shape(frame_shape, imgsz, fixed_shape=None):
+    """Network input (height, width) for frames of frame_shape: the long side becomes imgsz and
+    the short side is padded only up to a multiple of the stride (unless the model is static)."""
+    if fixed_shape:
+        return fixed_shape
+    height, width = frame_shape[:2]
+    scale = imgsz / max(height, width)
+    return (int(math.ceil(height * scale / STRIDE) * STRIDE), int(math.ceil(width * scale / STRIDE) * STRIDE))
+
+
+class Letterbox:
+    """Resizes and pads a batch of same-sized frames into one reusable NCHW float32 array."""
+
+    def __init__(self, frame_shape, input_shape):
+        height, width = frame_shape[:2]
+        in_h, in_w = input_shape
+        self.scale = min(in_h / height, in_w / width)
+        self.new_w, self.new_h = int(round(width * self.scale)), int(round(height * self.scale))
+        self.pad_x, self.pad_y = (in_w - self.new_w) // 2, (in_h - self.new_h) // 2
+        self.input_shape = input_shape
+        self._canvas = None
+
+    def __call__(self, frames):
+        in_h, in_w = self.input_shape
+        if self._canvas is None or len(self._canvas) < len(frames):
+            self._canvas = np.full((len(frames), in_h, in_w, 3), 114, np.uint8)
+        canvas = self._canvas[:len(frames)]
+        for i, frame in enumerate(frames):
+            region = canvas[i, self.pad_y:self.pad_y + self.new_h, self.pad_x:self.pad_x + self.new_w]
+            cv2.resize(frame, (self.new_w, self.new_h), dst=region, interpolation=cv2.INTER_LINEAR)
+        # BGR -> RGB, NHWC -> NCHW, [0, 1] for the whole batch at once
+        return np.ascontiguousarray(canvas[..., ::-1].transpose(0, 3, 1, 2), dtype=np.float32) / 255.0
+
+    def to_frame(self, boxes, frame_shape):
+        """Maps xyxy boxes from network input back to frame pixels (in place)."""
+        boxes[:, [0, 2]] = ((boxes[:, [0, 2]] - self.pad_x) / self.scale).clip(0, frame_shape[1])
+        boxes[:, [1, 3]] = ((boxes[:, [1, 3]] - self.pad_y) / self.scale).clip(0, frame_shape[0])
+        return boxes
+
+
+def box_iou(box, boxes):
+    """IoU of one xyxy box against many."""
+    x1 = np.maximum(box[0], boxes[:, 0])
+    y1 = np.maximum(box[1], boxes[:, 1])
+    x2 = np.minimum(box[2], boxes[:, 2])
+    y2 = np.minimum(box[3], boxes[:, 3])
+    inter = np.clip(x2 - x1, 0, None) * np.clip(y2 - y1, 0, None)
+    area = (box[2] - box[0]) * (box[3] - box[1])
+    areas = (boxes[:, 2] - boxes[:, 0]) * (boxes[:, 3] - boxes[:, 1])
+    return inter / np.maximum(area + areas - inter, 1e-9)
+
+
+def nms(boxes, scores, iou_threshold, class_ids=None, max_det=300):
+    """
+    Greedy NMS; each step suppresses against all remaining boxes at once. With class_ids,
+    boxes are shifted apart per class so one pass handles every class (batched NMS).
+    Returns the kept indices, best first.
+    """
+    if class_ids is not None and len(boxes):
+        boxes = boxes + (class_ids.astype(np.float32) * (boxes.max() + 1))[:, None]
+    order = np.argsort(-scores)
+    keep = []
+    while order.size and len(keep) < max_det:
+        best = order[0]
+        keep.append(best)
+        if order.size == 1:
+            break
+        rest = order[1:]
+        order = rest[box_iou(boxes[best], boxes[rest]) <= iou_threshold]
+    return np.asarray(keep, np.int64)
+
+
+def postprocess(raw, conf=0.25, iou=0.7, classes=None, max_det=300, max_candidates=30000):
+    """
+    raw: (B, 4 + classes, anchors) YOLOv8 output (xywh in input pixels, class scores).
+    Returns one (N, 6) float32 array [x1, y1, x2, y2, confidence, class_id] per image.
+    """
+    predictions = raw.transpose(0, 2, 1)
+    scores = predictions[:, :, 4:]
+    class_ids = scores.argmax(axis=2)
+    confidences = np.take_along_axis(scores, class_ids[..., None], axis=2)[..., 0]
+    candidates = confidences > conf
+    if classes is not None:
+        candidates &= np.isin(class_ids, classes)
+
+    results = []
+    for i in range(len(predictions)):
+        index = np.flatnonzero(candidates[i])
+        if index.size > max_candidates:
+            index = index[np.argsort(-confidences[i, index])[:max_candidates]]
+        xywh = predictions[i, index, :4]
+        boxes = np.empty_like(xywh)
+        boxes[:, :2] = xywh[:, :2] - xywh[:, 2:] / 2
+        boxes[:, 2:] = xywh[:, :2] + xywh[:, 2:] / 2
+        keep = nms(boxes, confidences[i, index], iou, class_ids[i, index], max_det)
+        results.append(np.column_stack([boxes[keep], confidences[i, index][keep],
+                                        class_ids[i, index][keep]]).astype(np.float32))
+    return results
+
+
+class Detector:
+    """Backend + letterbox + NMS. detect_batch() takes same-sized BGR frames."""
+
+    def __init__(self, weights, imgsz=1280, conf=0.25, iou=0.7, classes=None, max_det=300, threads=None,
+                 backend=None):
+        self.backend = backend or create_backend(weights, threads)
+        self.names = getattr(self.backend, "names", CLASS_NAMES)
+        self.imgsz = imgsz
+        self.conf = conf
+        self.iou = iou
+        self.classes = classes
+        self.max_det = max_det
+        self._letterboxes = {}
+        self.timings = {"preprocess": 0.0, "inference": 0.0, "postprocess": 0.0}
+
+    def letterbox_for(self, frame_shape, imgsz):
+        key = (frame_shape[:2], imgsz)
+        if key not in self._letterboxes:
+            self._letterboxes[key] = Letterbox(frame_shape, letterbox_shape(frame_shape, imgsz,
+                                                                             self.backend.fixed_shape))
+        return self._letterboxes[key]
+
+    def detect_batch(self, frames, imgsz=None):
+        letterbox = self.letterbox_for(frames[0].shape, imgsz or self.imgsz)
+        t0 = time.perf_counter()
+        batch = letterbox(frames)
+        t1 = time.perf_counter()
+        raw = self.backend(batch)
+        t2 = time.perf_counter()
+        detections = postprocess(raw, self.conf, self.iou, self.classes, self.max_det)
+        for det, frame in zip(detections, frames):
+            letterbox.to_frame(det[:, :4], frame.shape)
+        t3 = time.perf_counter()
+        self.timings["preprocess"] += t1 - t0
+        self.timings["inference"] += t2 - t1
+        self.timings["postprocess"] += t3 - t2
+        return detections
+
+
+# --- Writing ---
+COLUMNS = ("frame", "class_id", "confidence", "x1", "y1", "x2", "y2")
+
+
+class DetectionWriter:
+    """
+    Streams detections to disk in chunks: Parquet (needs pyarrow) with one row group
+    per chunk, or a compressed .npz of columns. Memory use is one chunk.
+    """
+
+    def __init__(self, path, chunk_rows=200000):
+        self.path = path
+        self.chunk_rows = chunk_rows
+        self.parquet = path.endswith(".parquet")
+        self._pending = []
+        self._pending_rows = 0
+        self._chunks = []        # .npz only: compact per-chunk column arrays
+        self._writer = None
+        self.rows = 0
+
+    def add(self, frame_index, detections):
+        if len(detections):
+            frame_column = np.full((len(detections), 1), frame_index, np.float32)
+            self._pending.append(np.hstack([frame_column, detections]))
+            self._pending_rows += len(detections)
+            if self._pending_rows >= self.chunk_rows:
+                self._flush()
+
+    def _flush(self):
+        if not self._pending:
+            return
+        rows = np.vstack(self._pending)
+        self._pending, self._pending_rows = [], 0
+        # rows: frame, x1, y1, x2, y2, confidence, class_id
+        columns = {"frame": rows[:, 0].astype(np.int32), "class_id": rows[:, 6].astype(np.uint8),
+                   "confidence": rows[:, 5].astype(np.float16), "x1": rows[:, 1], "y1": rows[:, 2],
+                   "x2": rows[:, 3], "y2": rows[:, 4]}
+        self.rows += len(rows)
+        if self.parquet:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            table = pa.table({name: columns[name] for name in COLUMNS})
+            if self._writer is None:
+                self._writer = pq.ParquetWriter(self.path, table.schema, compression="zstd")
+            self._writer.write_table(table)
+        else:
+            self._chunks.append(columns)
+
+    def close(self, metadata=None):
+        self._flush()
+        if self.parquet:
+            if self._writer is not None:
+                self._writer.close()
+        else:
+            merged = {name: np.concatenate([c[name] for c in self._chunks]) if self._chunks else np.empty(0)
+                      for name in COLUMNS}
+            np.savez_compressed(self.path, **merged)
+        if metadata:
+            # Video size, fps and class names for the tracking/stats stages
+            with open(os.path.splitext(self.path)[0] + ".json", "w") as f:
+                json.dump(metadata, f, indent=2)
+
+
+def read_detections(path):
+    """Yields (frame index, (N, 6) [x1, y1, x2, y2, confidence, class_id]) in frame order, streaming."""
+    def frames_of(columns):
+        frames = columns["frame"]
+        boxes = np.column_stack([columns["x1"], columns["y1"], columns["x2"], columns["y2"],
+                                 columns["confidence"].astype(np.float32),
+                                 columns["class_id"].astype(np.float32)])
+        splits = np.flatnonzero(np.diff(frames)) + 1
+        for part, rows in zip(np.split(frames, splits), np.split(boxes, splits)):
+            if len(part):
+                yield int(part[0]), rows
+
+    if path.endswith(".parquet"):
+        import pyarrow.parquet as pq
+
+        carry_frame, carry = None, None
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=65536):
+            columns = {name: batch.column(name).to_numpy() for name in COLUMNS}
+            for frame, rows in frames_of(columns):
+                if carry is not None and frame != carry_frame:
+                    yield carry_frame, carry
+                    carry = None
+                carry = rows if carry is None else np.vstack([carry, rows])
+                carry_frame = frame
+        if carry is not None:
+            yield carry_frame, carry
+    else:
+        with np.load(path) as data:
+            yield from frames_of({name: data[name] for name in COLUMNS})
+
+
+# --- CLI ---
+def add_common_arguments(parser):
+    parser.add_argument("video")
+    parser.add_argument("--weights", default="runs/detect/train3/weights/best.pt",
+                        help=".pt, .onnx or OpenVINO model directory")
+    parser.add_argument("--output", default=None, help=".parquet or .npz (default: <video>.parquet)")
+    parser.add_argument("--conf", type=float, default=0.25)
+    parser.add_argument("--iou", type=float, default=0.7)
+    parser.add_argument("--classes", type=int, nargs="+", default=None, help="keep only these class ids")
+    parser.add_argument("--batch", type=int, default=4)
+    parser.add_argument("--stride", type=int, default=1, help="process every n-th frame")
+    parser.add_argument("--threads", type=int, default=None, help="inference threads")
+    parser.add_argument("--start", type=int, default=0)
+    parser.add_argument("--end", type=int, default=None)
+
+
+def report(processed, elapsed, reader, detector, total=None):
+    fps = processed / max(elapsed, 1e-9)
+    line = f"[INFO] {processed} frames, {fps:.2f} frames/s"
+    if total:
+        remaining = (total - processed * reader.stride) / reader.stride / max(fps, 1e-9)
+        line += f" | ETA {remaining / 3600:.1f} h"
+    timings = " ".join(f"{k} {v / max(processed, 1) * 1000:.1f}" for k, v in detector.timings.items())
+    print(f"{line} | ms/frame: decode {reader.decode_time / max(processed, 1) * 1000:.1f} {timings}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the soccer player detector over a video")
+    add_common_arguments(parser)
+    parser.add_argument("--imgsz", type=int, default=1280)
+    args = parser.parse_args()
+
+    output = args.output or os.path.splitext(args.video)[0] + ".parquet"
+    detector = Detector(args.weights, args.imgsz, args.conf, args.iou, args.classes, threads=args.threads)
+    reader = FrameReader(args.video, args.stride, queue_size=args.batch * 4, start=args.start, end=args.end)
+    writer = DetectionWriter(output)
+
+    processed = 0
+    start = last_report = time.time()
+    for batch in reader.batches(args.batch):
+        indices, frames = zip(*batch)
+        for index, detections in zip(indices, detector.detect_batch(list(frames))):
+            writer.add(index, detections)
+        processed += len(batch)
+        if time.time() - last_report >= 10:
+            report(processed, time.time() - start, reader, detector, reader.frame_count)
+            last_report = time.time()
+
+    elapsed = time.time() - start
+    writer.close({"video": args.video, "weights": args.weights, "imgsz": args.imgsz, "fps": reader.fps,
+                  "width": reader.width, "height": reader.height, "stride": args.stride,
+                  "names": {int(k): v for k, v in detector.names.items()}})
+    report(processed, elapsed, reader, detector)
+    print(f"[INFO] {writer.rows} detections written to {output}")
+
+
+if __name__ == "__main__":
+    main()
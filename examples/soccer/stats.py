@@ -0,0 +1,212 @@
+# stats.py
+"""
+Streaming per-player match statistics from tracks (see tracking.py):
+distance covered, top speed, time on the ball and positional heatmaps.
+
+Positions are the foot point of each box (bottom centre; the ball uses its centre)
+projected onto the pitch in metres. Everything is accumulated incrementally in
+per-track arrays, so memory does not grow with match length, and a JSON line per
+time window is written while the video is still being processed.
+"""
+import json
+import os
+
+import numpy as np
+
+from inference import CLASS_NAMES
+
+BALL_CLASS = 0
+PEOPLE_WITH_BALL = (1, 2)   # goalkeepers and players can have possession, referees cannot
+
+
+def homography_from_points(image_points, pitch_points):
+    """3x3 homography mapping four (or more) image points onto pitch points (DLT, least squares)."""
+    rows = []
+    for (x, y), (u, v) in zip(image_points, pitch_points):
+        rows.append([x, y, 1, 0, 0, 0, -u * x, -u * y, -u])
+        rows.append([0, 0, 0, x, y, 1, -v * x, -v * y, -v])
+    _, _, vt = np.linalg.svd(np.asarray(rows, np.float64))
+    matrix = vt[-1].reshape(3, 3)
+    return matrix / matrix[2, 2]
+
+
+def load_homography(path, frame_size, pitch_size=(105.0, 68.0)):
+    """
+    Reads {"matrix": 3x3} or {"image": [[x, y], ...], "pitch": [[x, y], ...]} (metres).
+    Without a file the frame is stretched over the whole pitch, which is only a rough
+    approximation for a broadcast camera.
+    """
+    if path is None:
+        return np.diag([pitch_size[0] / frame_size[0], pitch_size[1] / frame_size[1], 1.0])
+    with open(path) as f:
+        data = json.load(f)
+    if "matrix" in data:
+        return np.asarray(data["matrix"], np.float64)
+    return homography_from_points(data["image"], data["pitch"])
+
+
+class StatsAggregator:
+    def __init__(self, frame_size, fps, homography, pitch_size=(105.0, 68.0), cell=1.0, window=60.0, out=None,
+                 heatmap_path=None, smoothing=0.3, max_speed=12.0, max_gap=1.0, possession_radius=1.5):
+        self.frame_size = frame_size
+        self.fps = fps
+        self.homography = homography
+        self.pitch_size = pitch_size
+        self.grid = (int(np.ceil(pitch_size[1] / cell)), int(np.ceil(pitch_size[0] / cell)))
+        self.cell = cell
+        self.window = window                        # seconds of video per streamed line
+        self.out = out
+        self.heatmap_path = heatmap_path or (os.path.splitext(out.name)[0] + "_heatmaps.npz" if out else None)
+        self.smoothing = smoothing                  # weight of the new position in the smoothed one
+        self.max_speed = max_speed                  # m/s; faster steps are ID switches or projection noise
+        self.max_gap = max_gap                      # seconds; longer gaps restart the distance integration
+        self.possession_radius = possession_radius  # metres from the ball
+
+        self.slots = {}
+        capacity = 64
+        self.ids = np.zeros(capacity, np.int64)
+        self.position = np.zeros((capacity, 2))
+        self.last_frame = np.full(capacity, -1, np.int64)
+        self.distance = np.zeros(capacity)
+        self.top_speed = np.zeros(capacity)
+        self.seconds = np.zeros(capacity)
+        self.possession = np.zeros(capacity)
+        self.class_votes = np.zeros((capacity, len(CLASS_NAMES)))
+        self.heatmaps = np.zeros((capacity,) + self.grid, np.float32)
+
+        self.previous_frame = None
+        self.window_start = None
+        self.window_distance = np.zeros(capacity)
+        self.window_possession = np.zeros(capacity)
+
+    # --- Per-track storage ---
+    def _grow(self):
+        for name in ("ids", "position", "last_frame", "distance", "top_speed", "seconds", "possession",
+                     "class_votes", "heatmaps", "window_distance", "window_possession"):
+            array = getattr(self, name)
+            grown = np.zeros((len(array) * 2,) + array.shape[1:], array.dtype)
+            if name == "last_frame":
+                grown[:] = -1
+            grown[:len(array)] = array
+            setattr(self, name, grown)
+
+    def _slots_for(self, track_ids):
+        slots = np.empty(len(track_ids), np.int64)
+        for i, track_id in enumerate(track_ids.tolist()):
+            slot = self.slots.get(track_id)
+            if slot is None:
+                slot = self.slots[track_id] = len(self.slots)
+                if slot >= len(self.ids):
+                    self._grow()
+                self.ids[slot] = track_id
+            slots[i] = slot
+        return slots
+
+    def to_pitch(self, points):
+        projected = np.column_stack([points, np.ones(len(points))]) @ self.homography.T
+        return projected[:, :2] / projected[:, 2:3]
+
+    # --- Streaming ---
+    def add(self, frame_index, tracks):
+        """tracks: (M, 7) [track_id, x1, y1, x2, y2, confidence, class_id] for one frame."""
+        if self.window_start is None:
+            self.window_start = frame_index
+        # Each observation stands for the time since the previous processed frame (handles --stride)
+        step = 1.0 / self.fps if self.previous_frame is None else (frame_index - self.previous_frame) / self.fps
+        self.previous_frame = frame_index
+
+        if len(tracks):
+            classes = tracks[:, 6].astype(np.int64)
+            is_ball = classes == BALL_CLASS
+            points = np.column_stack([(tracks[:, 1] + tracks[:, 3]) / 2,
+                                      np.where(is_ball, (tracks[:, 2] + tracks[:, 4]) / 2, tracks[:, 4])])
+            pitch = self.to_pitch(points)
+            people = ~is_ball
+            if people.any():
+                self._add_people(frame_index, tracks[people, 0].astype(np.int64), classes[people], pitch[people],
+                                 step)
+                if is_ball.any():
+                    self._add_possession(pitch[is_ball][0], classes[people], pitch[people],
+                                         tracks[people, 0].astype(np.int64), step)
+
+        if (frame_index - self.window_start) / self.fps >= self.window:
+            self._emit_window(frame_index)
+
+    def _add_people(self, frame_index, track_ids, classes, pitch, step):
+        slots = self._slots_for(track_ids)
+        self.class_votes[slots, classes] += 1
+        self.seconds[slots] += step
+
+        known = self.last_frame[slots] >= 0
+        dt = (frame_index - self.last_frame[slots]) / self.fps
+        continuing = known & (dt <= self.max_gap)
+        smoothed = np.where(continuing[:, None],
+                            self.position[slots] + self.smoothing * (pitch - self.position[slots]), pitch)
+        moved = np.linalg.norm(smoothed - self.position[slots], axis=1)
+        speed = moved / np.maximum(dt, 1e-9)
+        valid = continuing & (speed <= self.max_speed)
+        self.distance[slots[valid]] += moved[valid]
+        self.window_distance[slots[valid]] += moved[valid]
+        self.top_speed[slots[valid]] = np.maximum(self.top_speed[slots[valid]], speed[valid])
+        self.position[slots] = smoothed
+        self.last_frame[slots] = frame_index
+
+        cells = np.floor(pitch / self.cell).astype(np.int64)
+        inside = ((cells[:, 0] >= 0) & (cells[:, 0] < self.grid[1]) & (cells[:, 1] >= 0) &
+                  (cells[:, 1] < self.grid[0]))
+        np.add.at(self.heatmaps, (slots[inside], cells[inside, 1], cells[inside, 0]), step)
+
+    def _add_possession(self, ball, classes, pitch, track_ids, step):
+        candidates = np.isin(classes, PEOPLE_WITH_BALL)
+        if not candidates.any():
+            return
+        distances = np.linalg.norm(pitch[candidates] - ball, axis=1)
+        nearest = int(np.argmin(distances))
+        if distances[nearest] <= self.possession_radius:
+            slot = self.slots[int(track_ids[candidates][nearest])]
+            self.possession[slot] += step
+            self.window_possession[slot] += step
+
+    def _players(self, distance, possession, only_active=False):
+        players = {}
+        for track_id, slot in self.slots.items():
+            if only_active and distance[slot] == 0 and possession[slot] == 0:
+                continue
+            players[str(track_id)] = {
+                "class": CLASS_NAMES[int(self.class_votes[slot].argmax())],
+                "distance_m": round(float(distance[slot]), 1),
+                "possession_s": round(float(possession[slot]), 2),
+            }
+        return players
+
+    def _emit_window(self, frame_index):
+        if self.out is not None:
+            line = {"type": "window", "start_s": round(self.window_start / self.fps, 2),
+                    "end_s": round(frame_index / self.fps, 2),
+                    "players": self._players(self.window_distance, self.window_possession, only_active=True)}
+            self.out.write(json.dumps(line) + "\n")
+            self.out.flush()
+        self.window_start = frame_index
+        self.window_distance[:] = 0
+        self.window_possession[:] = 0
+
+    def close(self):
+        """Flushes the last window, writes the match totals and heatmaps, returns the totals."""
+        if self.previous_frame is not None and self.previous_frame > self.window_start:
+            self._emit_window(self.previous_frame)
+        players = self._players(self.distance, self.possession)
+        for track_id, slot in self.slots.items():
+            players[str(track_id)].update(seconds_visible=round(float(self.seconds[slot]), 1),
+                                          top_speed_kmh=round(float(self.top_speed[slot]) * 3.6, 1))
+        summary = {"type": "summary", "pitch_size": list(self.pitch_size), "cell_m": self.cell, "players": players}
+        if self.out is not None:
+            self.out.write(json.dumps(summary) + "\n")
+            self.out.close()
+        if self.heatmap_path:
+            count = len(self.slots)
+            # Per-track seconds spent in each pitch cell, plus one map per class
+            per_class = {f"class_{name}": self.heatmaps[:count][self.class_votes[:count].argmax(axis=1) == class_id]
+                         .sum(axis=0) for class_id, name in CLASS_NAMES.items() if class_id != BALL_CLASS}
+            np.savez_compressed(self.heatmap_path, track_ids=self.ids[:count], heatmaps=self.heatmaps[:count],
+                                **per_class)
+        return summary
@@ -0,0 +1,48 @@
+# test_tracking.py
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from tracking import SoccerTracker
+
+
+def synthetic_frame(t):
+    """Two players walking right, a referee standing still and a fast ball."""
+    return np.array([
+        [100 + 4 * t, 200, 140 + 4 * t, 300, 0.9, 2],
+        [600 + 3 * t, 400, 640 + 3 * t, 500, 0.85, 2],
+        [900, 300, 940, 400, 0.8, 3],
+        [300 + 15 * t, 600, 310 + 15 * t, 610, 0.6, 0],
+    ], np.float32)
+
+
+def test_ids_persist_over_frames():
+    tracker = SoccerTracker()
+    ids_per_frame = [tracker.update(synthetic_frame(t))[:, 0] for t in range(30)]
+    # Tracks are confirmed after two hits, the ball after one
+    assert len(ids_per_frame[-1]) == 4
+    assert all(set(ids) == set(ids_per_frame[-1]) for ids in ids_per_frame[2:])
+
+
+def test_tracks_survive_a_gap_and_keep_class():
+    tracker = SoccerTracker()
+    for t in range(10):
+        before = tracker.update(synthetic_frame(t))
+    for _ in range(5):
+        tracker.update(np.empty((0, 6), np.float32))
+    after = tracker.update(synthetic_frame(15))
+    assert set(after[:, 0]) >= set(before[before[:, 6] != 0, 0])
+    classes = dict(zip(after[:, 0], after[:, 6]))
+    assert sorted(classes.values()) == [0, 2, 2, 3]
+
+
+def test_low_confidence_detection_rescues_track():
+    tracker = SoccerTracker()
+    for t in range(5):
+        tracker.update(synthetic_frame(t))
+    weak = synthetic_frame(5)
+    weak[0, 4] = 0.2
+    tracks = tracker.update(weak)
+    assert len(tracks[tracks[:, 6] == 2]) == 2
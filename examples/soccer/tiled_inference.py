@@ -0,0 +1,187 @@
+# tiled_inference.py
+"""
+Adaptive-resolution inference: a cheap low-resolution pass over the whole frame,
+plus full-resolution tiles only where small objects are (or were):
+
+- the neighbourhood of the ball in the previous frame,
+- small or low-confidence detections of the coarse pass,
+- one rotating search tile per frame while the ball is lost, so the whole pitch
+  is still scanned at full resolution every few frames.
+
+Tiles are cropped so objects appear at the same scale as in a full --imgsz pass,
+the scale the detector was trained at. Tile detections cut by an inner tile edge
+are dropped, and everything is merged with class-aware NMS across tiles.
+
+The passes run at different input sizes, so this needs a backend that accepts
+any size: a .pt checkpoint or a dynamic export. A static ONNX/OpenVINO export
+(what export.py writes) would run every pass at its own size, which costs more
+than one full pass. With such a model the script falls back to plain full-frame
+detection.
+
+    python tiled_inference.py match.mp4 --weights best.pt --output match_tiled.parquet
+"""
+import argparse
+import math
+import os
+import time
+
+import numpy as np
+
+from inference import DetectionWriter, Detector, FrameReader, add_common_arguments, nms, report
+
+BALL_CLASS = 0
+
+
+class TiledDetector:
+    def __init__(self, detector, imgsz=1280, coarse_imgsz=640, tile_imgsz=384, small_size=32, search_tiles=1,
+                 merge_iou=0.5, max_tiles=6):
+        if detector.backend.fixed_shape:
+            raise ValueError(f"tiled inference needs a dynamic-shape model, this backend only runs at "
+                             f"{detector.backend.fixed_shape}")
+        self.detector = detector
+        self.imgsz = imgsz                  # reference full-resolution inference size
+        self.coarse_imgsz = coarse_imgsz
+        self.tile_imgsz = tile_imgsz
+        self.small_size = small_size        # short side (frame pixels) below which coarse boxes get a tile
+        self.search_tiles = search_tiles    # rotating search tiles per frame while the ball is lost
+        self.merge_iou = merge_iou
+        self.max_tiles = max_tiles
+        self.previous_ball = None
+        self._search_cursor = 0
+        self.stats = {"frames": 0, "tiles": 0, "pixels": 0.0, "full_pixels": 0.0}
+
+    def _tile_side(self, frame_shape):
+        # Crop size that the tile resize maps to the same scale as a full --imgsz pass
+        return min(max(frame_shape[:2]), int(round(self.tile_imgsz * max(frame_shape[:2]) / self.imgsz)))
+
+    @staticmethod
+    def _place(cx, cy, side, frame_shape):
+        height, width = frame_shape[:2]
+        x0 = int(min(max(cx - side / 2, 0), max(width - side, 0)))
+        y0 = int(min(max(cy - side / 2, 0), max(height - side, 0)))
+        return x0, y0
+
+    def _search_grid(self, frame_shape, side):
+        height, width = frame_shape[:2]
+        cols, rows = math.ceil(width / side), math.ceil(height / side)
+        return [self._place((c + 0.5) * width / cols, (r + 0.5) * height / rows, side, frame_shape)
+                for r in range(rows) for c in range(cols)]
+
+    def plan_tiles(self, frame_shape, coarse):
+        """Top-left corners of the tiles for this frame."""
+        side = self._tile_side(frame_shape)
+        centers = []
+        if self.previous_ball is not None:
+            x1, y1, x2, y2 = self.previous_ball[:4]
+            centers.append(((x1 + x2) / 2, (y1 + y2) / 2))
+        short_sides = np.minimum(coarse[:, 2] - coarse[:, 0], coarse[:, 3] - coarse[:, 1])
+        small = coarse[(short_sides < self.small_size) | (coarse[:, 5] == BALL_CLASS)]
+        for x1, y1, x2, y2, conf, _ in small[np.argsort(-small[:, 4])]:
+            centers.append(((x1 + x2) / 2, (y1 + y2) / 2))
+
+        tiles = []
+        inner = side * 0.25  # a center this close to a tile edge gets its own tile
+        for cx, cy in centers:
+            covered = any(x0 + inner <= cx <= x0 + side - inner and y0 + inner <= cy <= y0 + side - inner
+                          for x0, y0 in tiles)
+            if not covered and len(tiles) < self.max_tiles:
+                tiles.append(self._place(cx, cy, side, frame_shape))
+
+        if self.previous_ball is None:
+            grid = self._search_grid(frame_shape, side)
+            for _ in range(min(self.search_tiles, len(grid))):
+                tiles.append(grid[self._search_cursor % len(grid)])
+                self._search_cursor += 1
+        return tiles, side
+
+    def detect(self, frame):
+        coarse = self.detector.detect_batch([frame], imgsz=self.coarse_imgsz)[0]
+        tiles, side = self.plan_tiles(frame.shape, coarse)
+        height, width = frame.shape[:2]
+
+        parts = [coarse]
+        if tiles:
+            crops = [frame[y0:y0 + side, x0:x0 + side] for x0, y0 in tiles]
+            for (x0, y0), detections in zip(tiles, self.detector.detect_batch(crops, imgsz=self.tile_imgsz)):
+                if not len(detections):
+                    continue
+                detections[:, [0, 2]] += x0
+                detections[:, [1, 3]] += y0
+                # Objects cut by an inner tile edge are left to the coarse pass or a neighbouring tile
+                edge = 2
+                cut = (((detections[:, 0] <= x0 + edge) & (x0 > 0)) |
+                       ((detections[:, 1] <= y0 + edge) & (y0 > 0)) |
+                       ((detections[:, 2] >= x0 + side - edge) & (x0 + side < width)) |
+                       ((detections[:, 3] >= y0 + side - edge) & (y0 + side < height)))
+                parts.append(detections[~cut])
+
+        merged = np.vstack(parts)
+        if len(parts) > 1 and len(merged):
+            merged = merged[nms(merged[:, :4], merged[:, 4], self.merge_iou, merged[:, 5].astype(np.int64))]
+
+        balls = merged[merged[:, 5] == BALL_CLASS]
+        self.previous_ball = balls[np.argmax(balls[:, 4])] if len(balls) else None
+
+        coarse_shape = self.detector.letterbox_for(frame.shape, self.coarse_imgsz).input_shape
+        tile_shape = self.detector.letterbox_for((side, side), self.tile_imgsz).input_shape
+        full_shape = self.detector.letterbox_for(frame.shape, self.imgsz).input_shape
+        self.stats["frames"] += 1
+        self.stats["tiles"] += len(tiles)
+        self.stats["pixels"] += coarse_shape[0] * coarse_shape[1] + len(tiles) * tile_shape[0] * tile_shape[1]
+        self.stats["full_pixels"] += full_shape[0] * full_shape[1]
+        return merged
+
+    def summary(self):
+        frames = max(self.stats["frames"], 1)
+        ratio = self.stats["pixels"] / max(self.stats["full_pixels"], 1)
+        return f"{self.stats['tiles'] / frames:.2f} tiles/frame, {ratio:.0%} of full-resolution input pixels"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Soccer detection with a coarse pass and full-resolution tiles")
+    add_common_arguments(parser)
+    parser.add_argument("--imgsz", type=int, default=1280, help="full resolution the model was trained at")
+    parser.add_argument("--coarse-imgsz", type=int, default=640)
+    parser.add_argument("--tile-imgsz", type=int, default=384)
+    parser.add_argument("--max-tiles", type=int, default=6)
+    parser.add_argument("--search-tiles", type=int, default=1, help="search tiles per frame while the ball is lost")
+    args = parser.parse_args()
+
+    output = args.output or os.path.splitext(args.video)[0] + "_tiled.parquet"
+    detector = Detector(args.weights, args.imgsz, args.conf, args.iou, args.classes, threads=args.threads)
+    if detector.backend.fixed_shape:
+        print(f"[WARN] {args.weights} is a static {detector.backend.fixed_shape} export: every tile would run at "
+              f"that size, so running single-pass detection instead (tiles need a dynamic export)")
+        tiled = None
+    else:
+        tiled = TiledDetector(detector, args.imgsz, args.coarse_imgsz, args.tile_imgsz, max_tiles=args.max_tiles,
+                              search_tiles=args.search_tiles)
+    # Tiles depend on the previous frame, so frames go through one at a time; tiles are batched
+    reader = FrameReader(args.video, args.stride, queue_size=8, start=args.start, end=args.end)
+    writer = DetectionWriter(output)
+
+    processed = 0
+    start = last_report = time.time()
+    for batch in reader.batches(1):
+        index, frame = batch[0]
+        writer.add(index, tiled.detect(frame) if tiled else detector.detect_batch([frame])[0])
+        processed += 1
+        if time.time() - last_report >= 10:
+            report(processed, time.time() - start, reader, detector, reader.frame_count)
+            if tiled:
+                print(f"[INFO] {tiled.summary()}")
+            last_report = time.time()
+
+    writer.close({"video": args.video, "weights": args.weights, "imgsz": args.imgsz,
+                  "mode": "tiled" if tiled else "single",
+                  "coarse_imgsz": args.coarse_imgsz, "tile_imgsz": args.tile_imgsz, "fps": reader.fps,
+                  "width": reader.width, "height": reader.height, "stride": args.stride,
+                  "names": {int(k): v for k, v in detector.names.items()}})
+    report(processed, time.time() - start, reader, detector)
+    if tiled:
+        print(f"[INFO] {tiled.summary()}")
+    print(f"[INFO] {writer.rows} detections written to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,382 @@
+# tracking.py
+"""
+ByteTrack-style multi-object tracking over precomputed detections (inference.py output).
+
+    python tracking.py match.parquet --output match_tracks.parquet --stats match_stats.jsonl
+
+All tracks of a group live in NumPy arrays: the Kalman predict/update and the IoU
+cost matrices are computed for every track at once, so tracking runs far faster than
+real time on a CPU. People (goalkeeper, player, referee) share one tracker, and their
+class is a vote over the track's history, so a player misclassified as a referee for a
+frame keeps its ID. The ball has its own tracker with enlarged boxes for matching,
+because a fast, tiny box rarely overlaps its previous position.
+"""
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+
+from inference import CLASS_NAMES, read_detections
+
+try:
+    from scipy.optimize import linear_sum_assignment
+except ImportError:  # greedy matching is used instead
+    linear_sum_assignment = None
+
+
+# --- Geometry ---
+def iou_matrix(a, b):
+    """Pairwise IoU of xyxy boxes a (N, 4) and b (M, 4)."""
+    if len(a) == 0 or len(b) == 0:
+        return np.zeros((len(a), len(b)), np.float32)
+    x1 = np.maximum(a[:, None, 0], b[None, :, 0])
+    y1 = np.maximum(a[:, None, 1], b[None, :, 1])
+    x2 = np.minimum(a[:, None, 2], b[None, :, 2])
+    y2 = np.minimum(a[:, None, 3], b[None, :, 3])
+    inter = np.clip(x2 - x1, 0, None) * np.clip(y2 - y1, 0, None)
+    area_a = (a[:, 2] - a[:, 0]) * (a[:, 3] - a[:, 1])
+    area_b = (b[:, 2] - b[:, 0]) * (b[:, 3] - b[:, 1])
+    return inter / np.maximum(area_a[:, None] + area_b[None, :] - inter, 1e-9)
+
+
+def scale_boxes(boxes, factor):
+    if factor == 1.0:
+        return boxes
+    centers = (boxes[:, :2] + boxes[:, 2:4]) / 2
+    half = (boxes[:, 2:4] - boxes[:, :2]) * factor / 2
+    return np.hstack([centers - half, centers + half])
+
+
+def xyxy_to_xyah(boxes):
+    boxes = boxes.astype(np.float64)
+    w, h = boxes[:, 2] - boxes[:, 0], boxes[:, 3] - boxes[:, 1]
+    return np.column_stack([boxes[:, 0] + w / 2, boxes[:, 1] + h / 2, w / np.maximum(h, 1e-6), h])
+
+
+def xyah_to_xyxy(xyah):
+    w = xyah[:, 2] * xyah[:, 3]
+    return np.column_stack([xyah[:, 0] - w / 2, xyah[:, 1] - xyah[:, 3] / 2,
+                            xyah[:, 0] + w / 2, xyah[:, 1] + xyah[:, 3] / 2])
+
+
+def linear_assignment(cost, max_cost):
+    """Returns (matches (K, 2), unmatched rows, unmatched cols) for costs <= max_cost."""
+    rows, cols = cost.shape
+    if rows == 0 or cols == 0:
+        return np.empty((0, 2), np.int64), np.arange(rows), np.arange(cols)
+    if linear_sum_assignment is not None:
+        r, c = linear_sum_assignment(cost)
+        good = cost[r, c] <= max_cost
+        matches = np.column_stack([r[good], c[good]])
+    else:
+        matches = []
+        order = np.dstack(np.unravel_index(np.argsort(cost, axis=None), cost.shape))[0]
+        used_r, used_c = set(), set()
+        for r, c in order:
+            if cost[r, c] > max_cost:
+                break
+            if r not in used_r and c not in used_c:
+                used_r.add(r)
+                used_c.add(c)
+                matches.append((r, c))
+        matches = np.array(matches, np.int64).reshape(-1, 2)
+    return (matches, np.setdiff1d(np.arange(rows), matches[:, 0]), np.setdiff1d(np.arange(cols), matches[:, 1]))
+
+
+# --- Kalman Filter (constant velocity in x, y, aspect, height), batched over tracks ---
+class BatchKalman:
+    def __init__(self, std_position=1 / 20, std_velocity=1 / 160):
+        self.F = np.eye(8)
+        self.F[:4, 4:] = np.eye(4)
+        self.H = np.eye(4, 8)
+        self.std_position = std_position
+        self.std_velocity = std_velocity
+
+    def initiate(self, xyah):
+        n = len(xyah)
+        mean = np.hstack([xyah, np.zeros((n, 4))])
+        h = xyah[:, 3]
+        std = np.column_stack([2 * self.std_position * h, 2 * self.std_position * h, np.full(n, 1e-2),
+                               2 * self.std_position * h, 10 * self.std_velocity * h, 10 * self.std_velocity * h,
+                               np.full(n, 1e-5), 10 * self.std_velocity * h])
+        cov = np.zeros((n, 8, 8))
+        cov[:, np.arange(8), np.arange(8)] = std ** 2
+        return mean, cov
+
+    def predict(self, mean, cov):
+        h = mean[:, 3]
+        n = len(mean)
+        std = np.column_stack([self.std_position * h, self.std_position * h, np.full(n, 1e-2),
+                               self.std_position * h, self.std_velocity * h, self.std_velocity * h,
+                               np.full(n, 1e-5), self.std_velocity * h])
+        mean = mean @ self.F.T
+        cov = np.einsum("ij,njk,lk->nil", self.F, cov, self.F)
+        cov[:, np.arange(8), np.arange(8)] += std ** 2
+        return mean, cov
+
+    def update(self, mean, cov, xyah):
+        h = mean[:, 3]
+        n = len(mean)
+        std = np.column_stack([self.std_position * h, self.std_position * h, np.full(n, 1e-1),
+                               self.std_position * h])
+        projected_mean = mean[:, :4]
+        projected_cov = cov[:, :4, :4].copy()
+        projected_cov[:, np.arange(4), np.arange(4)] += std ** 2
+        # K = P H^T S^-1, solved for all tracks at once
+        gain = np.linalg.solve(projected_cov, cov[:, :4, :]).transpose(0, 2, 1)
+        innovation = xyah - projected_mean
+        mean = mean + np.einsum("nij,nj->ni", gain, innovation)
+        cov = cov - np.einsum("nij,njk,nlk->nil", gain, projected_cov, gain)
+        return mean, cov
+
+
+# --- Tracker ---
+class ByteTracker:
+    """
+    One group of objects. ByteTrack association: high-confidence detections are
+    matched to all tracks first, then low-confidence detections rescue tracks that
+    were seen in the previous frame; unmatched high detections start new tracks.
+    """
+
+    def __init__(self, num_classes, high_thresh=0.5, low_thresh=0.1, new_track_thresh=0.6, match_thresh=0.8,
+                 second_match_thresh=0.5, max_age=30, min_hits=2, box_scale=1.0, max_tracks=None, id_start=1):
+        self.num_classes = num_classes
+        self.high_thresh = high_thresh
+        self.low_thresh = low_thresh
+        self.new_track_thresh = new_track_thresh
+        self.match_thresh = match_thresh                # max 1 - IoU for the first association
+        self.second_match_thresh = second_match_thresh
+        self.max_age = max_age                          # frames a lost track is kept
+        self.min_hits = min_hits                        # detections before a track is reported
+        self.box_scale = box_scale                      # boxes are enlarged by this for matching
+        self.max_tracks = max_tracks                    # e.g. 1 for the ball
+        self.kalman = BatchKalman()
+        self.next_id = id_start
+
+        self.ids = np.empty(0, np.int64)
+        self.mean = np.empty((0, 8))
+        self.cov = np.empty((0, 8, 8))
+        self.hits = np.empty(0, np.int64)
+        self.missed = np.empty(0, np.int64)
+        self.score = np.empty(0)
+        self.votes = np.empty((0, num_classes))
+
+    def _boxes(self, index=slice(None)):
+        return xyah_to_xyxy(self.mean[index, :4])
+
+    def _apply_update(self, track_index, detections):
+        self.mean[track_index], self.cov[track_index] = self.kalman.update(
+            self.mean[track_index], self.cov[track_index], xyxy_to_xyah(detections[:, :4]))
+        self.hits[track_index] += 1
+        self.missed[track_index] = 0
+        self.score[track_index] = detections[:, 4]
+        self.votes[track_index, detections[:, 5].astype(np.int64)] += detections[:, 4]
+
+    def update(self, detections):
+        """
+        detections: (N, 6) [x1, y1, x2, y2, confidence, class_id] of this group for one frame.
+        Returns (M, 7) [track_id, x1, y1, x2, y2, confidence, class_id] of the tracks seen this frame.
+        """
+        if len(self.ids):
+            self.mean, self.cov = self.kalman.predict(self.mean, self.cov)
+        was_tracked = self.missed == 0
+
+        high = detections[detections[:, 4] >= self.high_thresh]
+        low = detections[(detections[:, 4] >= self.low_thresh) & (detections[:, 4] < self.high_thresh)]
+        if self.max_tracks:
+            high = high[np.argsort(-high[:, 4])[:self.max_tracks]]
+
+        # 1) high-confidence detections against every track
+        track_boxes = scale_boxes(self._boxes(), self.box_scale)
+        cost = 1 - iou_matrix(track_boxes, scale_boxes(high[:, :4], self.box_scale))
+        matches, unmatched_tracks, unmatched_high = linear_assignment(cost, self.match_thresh)
+        if len(matches):
+            self._apply_update(matches[:, 0], high[matches[:, 1]])
+        matched = set(matches[:, 0].tolist())
+
+        # 2) low-confidence detections rescue tracks that were seen last frame
+        candidates = unmatched_tracks[was_tracked[unmatched_tracks]]
+        if len(candidates) and len(low):
+            cost = 1 - iou_matrix(track_boxes[candidates], scale_boxes(low[:, :4], self.box_scale))
+            second, _, _ = linear_assignment(cost, self.second_match_thresh)
+            if len(second):
+                self._apply_update(candidates[second[:, 0]], low[second[:, 1]])
+                matched.update(candidates[second[:, 0]].tolist())
+
+        # 3) age the rest; drop unconfirmed tracks on their first miss and lost tracks after max_age
+        unmatched = np.array([i for i in range(len(self.ids)) if i not in matched], np.int64)
+        self.missed[unmatched] += 1
+        keep = (self.missed <= self.max_age) & ((self.hits >= self.min_hits) | (self.missed == 0))
+        self._select(keep)
+
+        # 4) new tracks
+        new = high[unmatched_high]
+        new = new[new[:, 4] >= self.new_track_thresh]
+        if self.max_tracks:
+            new = new[:max(0, self.max_tracks - int(np.sum(self.missed == 0)))]
+        if len(new):
+            mean, cov = self.kalman.initiate(xyxy_to_xyah(new[:, :4]))
+            votes = np.zeros((len(new), self.num_classes))
+            votes[np.arange(len(new)), new[:, 5].astype(np.int64)] = new[:, 4]
+            self.ids = np.concatenate([self.ids, np.arange(self.next_id, self.next_id + len(new))])
+            self.next_id += len(new)
+            self.mean = np.concatenate([self.mean, mean])
+            self.cov = np.concatenate([self.cov, cov])
+            self.hits = np.concatenate([self.hits, np.ones(len(new), np.int64)])
+            self.missed = np.concatenate([self.missed, np.zeros(len(new), np.int64)])
+            self.score = np.concatenate([self.score, new[:, 4]])
+            self.votes = np.concatenate([self.votes, votes])
+
+        visible = (self.missed == 0) & (self.hits >= self.min_hits)
+        return np.column_stack([self.ids[visible], self._boxes(visible), self.score[visible],
+                                self.votes[visible].argmax(axis=1)])
+
+    def _select(self, keep):
+        self.ids, self.mean, self.cov = self.ids[keep], self.mean[keep], self.cov[keep]
+        self.hits, self.missed = self.hits[keep], self.missed[keep]
+        self.score, self.votes = self.score[keep], self.votes[keep]
+
+
+class SoccerTracker:
+    """People and ball trackers side by side, with IDs that never collide."""
+
+    def __init__(self, ball_class=0, num_classes=len(CLASS_NAMES), max_age=30):
+        self.ball_class = ball_class
+        self.people = ByteTracker(num_classes, max_age=max_age, id_start=1)
+        # One ball; it moves fast and is tiny, so match on boxes enlarged 4x and keep it a short while
+        self.ball = ByteTracker(num_classes, high_thresh=0.3, low_thresh=0.05, new_track_thresh=0.3,
+                                match_thresh=0.95, second_match_thresh=0.95, max_age=10, min_hits=1,
+                                box_scale=4.0, max_tracks=1, id_start=1_000_000)
+
+    def update(self, detections):
+        is_ball = detections[:, 5] == self.ball_class
+        return np.vstack([self.people.update(detections[~is_ball]), self.ball.update(detections[is_ball])])
+
+
+# --- Output ---
+TRACK_COLUMNS = ("frame", "track_id", "class_id", "confidence", "x1", "y1", "x2", "y2")
+
+
+class TrackWriter:
+    """Streams tracks to Parquet or .npz in chunks, like inference.DetectionWriter."""
+
+    def __init__(self, path, chunk_rows=200000):
+        self.path = path
+        self.chunk_rows = chunk_rows
+        self.parquet = path.endswith(".parquet")
+        self._pending = []
+        self._pending_rows = 0
+        self._chunks = []
+        self._writer = None
+        self.rows = 0
+
+    def add(self, frame_index, tracks):
+        if len(tracks):
+            self._pending.append(np.hstack([np.full((len(tracks), 1), frame_index), tracks]))
+            self._pending_rows += len(tracks)
+            if self._pending_rows >= self.chunk_rows:
+                self._flush()
+
+    def _flush(self):
+        if not self._pending:
+            return
+        rows = np.vstack(self._pending)
+        self._pending, self._pending_rows = [], 0
+        # rows: frame, track_id, x1, y1, x2, y2, confidence, class_id
+        columns = {"frame": rows[:, 0].astype(np.int32), "track_id": rows[:, 1].astype(np.int32),
+                   "class_id": rows[:, 7].astype(np.uint8), "confidence": rows[:, 6].astype(np.float16),
+                   "x1": rows[:, 2].astype(np.float32), "y1": rows[:, 3].astype(np.float32),
+                   "x2": rows[:, 4].astype(np.float32), "y2": rows[:, 5].astype(np.float32)}
+        self.rows += len(rows)
+        if self.parquet:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            table = pa.table({name: columns[name] for name in TRACK_COLUMNS})
+            if self._writer is None:
+                self._writer = pq.ParquetWriter(self.path, table.schema, compression="zstd")
+            self._writer.write_table(table)
+        else:
+            self._chunks.append(columns)
+
+    def close(self, metadata=None):
+        self._flush()
+        if self.parquet:
+            if self._writer is not None:
+                self._writer.close()
+        else:
+            merged = {name: np.concatenate([c[name] for c in self._chunks]) if self._chunks else np.empty(0)
+                      for name in TRACK_COLUMNS}
+            np.savez_compressed(self.path, **merged)
+        if metadata:
+            with open(os.path.splitext(self.path)[0] + ".json", "w") as f:
+                json.dump(metadata, f, indent=2)
+
+
+def load_metadata(detections_path):
+    path = os.path.splitext(detections_path)[0] + ".json"
+    if os.path.isfile(path):
+        with open(path) as f:
+            return json.load(f)
+    return {}
+
+
+def main():
+    from stats import StatsAggregator, load_homography
+
+    parser = argparse.ArgumentParser(description="Track players, referees and the ball over inference.py detections")
+    parser.add_argument("detections", help=".parquet or .npz written by inference.py / tiled_inference.py")
+    parser.add_argument("--output", default=None, help="tracks .parquet/.npz (default: <detections>_tracks.parquet)")
+    parser.add_argument("--stats", default=None, help="stream per-window stats to this JSONL file")
+    parser.add_argument("--homography", default=None,
+                        help="JSON 3x3 image->pitch (metres) homography; without it the frame is stretched "
+                             "over the pitch, which only approximates distances")
+    parser.add_argument("--window", type=float, default=60.0, help="seconds of video per stats line")
+    parser.add_argument("--max-age", type=int, default=30)
+    args = parser.parse_args()
+
+    metadata = load_metadata(args.detections)
+    fps = metadata.get("fps", 25.0)
+    step = metadata.get("stride", 1)
+    output = args.output or os.path.splitext(args.detections)[0] + "_tracks.parquet"
+
+    tracker = SoccerTracker(max_age=args.max_age)
+    writer = TrackWriter(output)
+    stats = None
+    if args.stats:
+        frame_size = (metadata.get("width", 1920), metadata.get("height", 1080))
+        stats = StatsAggregator(frame_size, fps, load_homography(args.homography, frame_size),
+                                window=args.window, out=open(args.stats, "w"))
+
+    frames = 0
+    previous = None
+    start = time.time()
+    for frame_index, detections in read_detections(args.detections):
+        # Frames without any detection are missing from the file but still age the tracks
+        if previous is not None:
+            for missing in range(previous + step, frame_index, step):
+                tracks = tracker.update(np.empty((0, 6), np.float32))
+                writer.add(missing, tracks)
+                if stats:
+                    stats.add(missing, tracks)
+                frames += 1
+        tracks = tracker.update(detections)
+        writer.add(frame_index, tracks)
+        if stats:
+            stats.add(frame_index, tracks)
+        previous = frame_index
+        frames += 1
+
+    writer.close(metadata)
+    elapsed = time.time() - start
+    print(f"[INFO] {frames} frames tracked in {elapsed:.1f}s ({frames / max(elapsed, 1e-9):.0f} frames/s, "
+          f"{frames / max(elapsed, 1e-9) / (fps / step):.1f}x real time) -> {output}")
+    if stats:
+        summary = stats.close()
+        print(f"[INFO] {len(summary['players'])} tracks with stats, heatmaps in {stats.heatmap_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+# benchmark_detectors.py
+import argparse
+import json
+import os
+import time
+
+import cv2
+
+from face_detectors import DNN_MODEL, DNN_PROTOTXT, create_detector, match_count
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp")
+
+
+def load_images(folder, limit=None):
+    names = sorted(f for f in os.listdir(folder) if f.lower().endswith(IMAGE_EXTENSIONS))[:limit]
+    images = {}
+    for name in names:
+        image = cv2.imread(os.path.join(folder, name))
+        if image is not None:
+            images[name] = image
+    return images
+
+
+def run(detector, images, batch_size):
+    """Returns ({name: boxes}, images per second). Decoding is excluded from the timing."""
+    names = list(images)
+    results = {}
+    start = time.perf_counter()
+    for i in range(0, len(names), batch_size):
+        chunk = names[i:i + batch_size]
+        if batch_size == 1:
+            batches = [detector.detect(images[chunk[0]])]
+        else:
+            batches = detector.detect_batch([images[n] for n in chunk])
+        results.update(zip(chunk, batches))
+    return results, len(names) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare face detector backends on a folder of images")
+    parser.add_argument("folder")
+    parser.add_argument("--annotations",
+                        help="JSON {image name: [[x, y, w, h], ...]}; without it every image is assumed "
+                             "to contain at least one face and recall is the share of images with a detection")
+    parser.add_argument("--backends", nargs="+", default=["haar", "dnn"], choices=["haar", "dnn"])
+    parser.add_argument("--batch-sizes", nargs="+", type=int, default=[1, 8], help="DNN batch sizes to try")
+    parser.add_argument("--threads", nargs="+", type=int, default=[0], help="OpenCV thread counts (0 = default)")
+    parser.add_argument("--prototxt", default=DNN_PROTOTXT)
+    parser.add_argument("--dnn-model", default=DNN_MODEL)
+    parser.add_argument("--confidence", type=float, default=0.5)
+    parser.add_argument("--iou", type=float, default=0.5)
+    parser.add_argument("--limit", type=int, default=None)
+    args = parser.parse_args()
+
+    images = load_images(args.folder, args.limit)
+    if not images:
+        parser.error("no images found")
+    truth = None
+    if args.annotations:
+        with open(args.annotations) as f:
+            truth = {name: boxes for name, boxes in json.load(f).items() if name in images}
+
+    print(f"{len(images)} images\n")
+    print(f"{'backend':<8}{'threads':>8}{'batch':>7}{'img/s':>9}{'recall':>9}{'faces/img':>11}")
+    for backend in args.backends:
+        for threads in args.threads:
+            cv2.setNumThreads(threads if threads > 0 else -1)
+            if backend == "dnn":
+                detector = create_detector("dnn", prototxt=args.prototxt, model=args.dnn_model,
+                                           confidence=args.confidence)
+                batch_sizes = args.batch_sizes
+            else:
+                detector = create_detector("haar")
+                batch_sizes = [1]
+            for batch_size in batch_sizes:
+                detector.detect(next(iter(images.values())))  # warm-up
+                results, rate = run(detector, images, batch_size)
+                if truth is not None:
+                    total = sum(len(boxes) for boxes in truth.values())
+                    found = sum(match_count(results[name], boxes, args.iou) for name, boxes in truth.items())
+                    recall = found / total if total else 0.0
+                else:
+                    recall = sum(1 for boxes in results.values() if boxes) / len(results)
+                per_image = sum(len(boxes) for boxes in results.values()) / len(results)
+                print(f"{backend:<8}{threads or 'auto':>8}{batch_size:>7}{rate:>9.1f}{recall:>9.3f}{per_image:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
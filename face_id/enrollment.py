@@ -0,0 +1,308 @@
+# enrollment.py
+import argparse
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import cv2
+import numpy as np
+
+from face_detectors import CASCADE_PATH
+
+FACE_SIZE = (100, 100)          # every stored face is resized to this, for recognition too
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp", ".pgm")
+
+_detector = None
+
+
+# --- Face Cropping (runs in worker processes) ---
+def _init_worker():
+    global _detector
+    _detector = cv2.CascadeClassifier(CASCADE_PATH)
+    # Parallelism comes from the process pool; nested OpenCV threads would only contend
+    cv2.setNumThreads(1)
+
+
+def crop_faces(path, assume_cropped=False):
+    """
+    Reads one image and returns its detected faces as FACE_SIZE uint8 crops.
+    assume_cropped: the image already is a face crop (as saved by create_user);
+    it is used whole when the cascade finds nothing in it.
+    """
+    global _detector
+    if _detector is None:
+        _init_worker()
+    gray = cv2.imread(path, cv2.IMREAD_GRAYSCALE)
+    if gray is None:
+        return []
+    faces = _detector.detectMultiScale(gray)
+    crops = [cv2.resize(gray[y:y + h, x:x + w], FACE_SIZE) for (x, y, w, h) in faces]
+    if not crops and assume_cropped:
+        crops = [cv2.resize(gray, FACE_SIZE)]
+    return crops
+
+
+def _crop_faces_job(job):
+    return crop_faces(*job)
+
+
+def user_id_from_filename(path):
+    """The notebook's create_user names files <name>.<id>.<count>.jpg."""
+    try:
+        return int(os.path.basename(path).split(".")[1])
+    except (IndexError, ValueError):
+        return None
+
+
+def files_fingerprint(paths):
+    digest = hashlib.sha1()
+    for path in sorted(paths):
+        stat = os.stat(path)
+        digest.update(f"{os.path.basename(path)}|{stat.st_size}|{stat.st_mtime_ns}".encode())
+    return digest.hexdigest()
+
+
+# --- Face Store ---
+class FaceStore:
+    """
+    Cropped faces of every user, one compressed .npz per user plus an index.json with
+    names, face counts and the fingerprint of the source images. Faces are detected
+    once per image; retraining or rebuilding the recognizer only reads these arrays.
+    """
+
+    def __init__(self, store_dir="face_store"):
+        self.store_dir = store_dir
+        os.makedirs(store_dir, exist_ok=True)
+        self.index_path = os.path.join(store_dir, "index.json")
+        self.index = {}
+        if os.path.isfile(self.index_path):
+            with open(self.index_path) as f:
+                self.index = json.load(f)
+
+    def _path(self, user_id):
+        return os.path.join(self.store_dir, f"user_{user_id}.npz")
+
+    def save_index(self):
+        tmp = self.index_path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.index, f, indent=2)
+        os.replace(tmp, self.index_path)
+
+    def put(self, user_id, name, faces, fingerprint=None):
+        faces = np.asarray(faces, np.uint8).reshape(-1, FACE_SIZE[1], FACE_SIZE[0])
+        np.savez_compressed(self._path(user_id), faces=faces)
+        # in_model turns True once trainer.yml has been written with these faces
+        self.index[str(user_id)] = {"name": name, "count": int(len(faces)), "fingerprint": fingerprint,
+                                    "in_model": False}
+        self.save_index()
+
+    def get(self, user_id):
+        with np.load(self._path(user_id)) as data:
+            return data["faces"]
+
+    def fingerprint(self, user_id):
+        entry = self.index.get(str(user_id))
+        return entry and entry.get("fingerprint")
+
+    def names(self):
+        return {int(user_id): entry["name"] for user_id, entry in self.index.items()}
+
+    def user_ids(self):
+        return sorted(int(user_id) for user_id in self.index)
+
+
+# --- Enrollment ---
+class Enroller:
+    """
+    Keeps trainer.yml in step with the face store.
+
+    New users are added with LBPHFaceRecognizer.update(), which appends their
+    histograms to the existing model instead of retraining everyone. A full
+    rebuild (only needed when an enrolled user's images change) trains from the
+    cached crops, so it never runs face detection again.
+
+    The model and the store are checked against each other on load: store users
+    missing from the model (e.g. after a crash before the model was written) are
+    re-added by the next save(). Model users missing from the store (a model trained
+    by the notebook) would be lost by any retrain, so enrolling is refused unless
+    discard_legacy allows retraining from the store (sync --rebuild, which keeps
+    every user whose dataset folder is part of the sync).
+    """
+
+    def __init__(self, model_path="trainer.yml", store_dir="face_store", workers=None, discard_legacy=False):
+        self.model_path = model_path
+        self.store = FaceStore(store_dir)
+        self.workers = workers or os.cpu_count()
+        self.recognizer = cv2.face.LBPHFaceRecognizer_create()
+        self.trained = os.path.isfile(model_path)
+        self.dirty = False              # in-memory model has updates not yet written
+        self.needs_rebuild = False      # a user was replaced (or the model is stale): retrain on save()
+        self.legacy = []                # model labels with no faces in the store
+        if self.trained:
+            self.recognizer.read(model_path)
+            modelled = set(np.unique(self.recognizer.getLabels()).tolist())
+            stored = set(self.store.user_ids())
+            self.legacy = sorted(modelled - stored)
+            stale = [user_id for user_id in stored
+                     if user_id not in modelled or not self.store.index[str(user_id)].get("in_model", True)]
+            if self.legacy and discard_legacy:
+                print(f"[INFO] Dropping user(s) {self.legacy} of {model_path}: not in the store")
+                self.legacy = []
+                self.needs_rebuild = True
+            elif self.legacy:
+                print(f"[WARN] {model_path} has user(s) {self.legacy} missing from the store; "
+                      f"enrolling is disabled until sync --rebuild")
+            elif stale:
+                print(f"[INFO] {len(stale)} stored user(s) missing from {model_path}; they will be re-added")
+                self.needs_rebuild = True
+
+    def crop_all(self, paths, assume_cropped=False, pool=None):
+        """Detects and crops faces of many images in parallel; returns one list of crops."""
+        jobs = [(path, assume_cropped) for path in paths]
+        chunk = max(1, len(jobs) // (self.workers * 4))
+        if pool is not None:
+            results = pool.map(_crop_faces_job, jobs, chunksize=chunk)
+        else:
+            with ProcessPoolExecutor(self.workers, initializer=_init_worker) as own_pool:
+                results = list(own_pool.map(_crop_faces_job, jobs, chunksize=chunk))
+        return [face for faces in results for face in faces]
+
+    def enroll(self, user_id, name, paths, assume_cropped=False, pool=None, save=True):
+        """
+        Adds or refreshes one user. Returns the number of faces stored.
+        With save=False the model is only updated in memory; call save() afterwards.
+        """
+        if self.legacy:
+            # Any retrain would start from the store and silently lose these users
+            raise RuntimeError(f"{self.model_path} has user(s) {self.legacy} that are not in the face store; "
+                               f"use sync --rebuild to retrain from the dataset (users without a folder are dropped)")
+        fingerprint = files_fingerprint(paths)
+        if self.store.fingerprint(user_id) == fingerprint:
+            return 0  # unchanged since the last enrollment
+
+        was_enrolled = str(user_id) in self.store.index
+        faces = self.crop_all(paths, assume_cropped, pool)
+        if not faces:
+            print(f"[WARN] No faces found for {name} ({user_id})")
+            return 0
+        self.store.put(user_id, name, faces, fingerprint)
+
+        if was_enrolled or not self.trained:
+            # update() can only append: replacing a user's samples needs a rebuild
+            self.needs_rebuild = True
+        elif not self.needs_rebuild:
+            self.recognizer.update(faces, np.full(len(faces), user_id, np.int32))
+            self.dirty = True
+        if save:
+            self.save()
+        return len(faces)
+
+    def save(self):
+        """Writes the model once for all pending changes (a rebuild if one is needed)."""
+        if self.needs_rebuild:
+            self.rebuild()
+        elif self.dirty:
+            self.recognizer.write(self.model_path)
+            self.dirty = False
+        else:
+            return
+        self._mark_in_model()
+
+    def _mark_in_model(self):
+        pending = [entry for entry in self.store.index.values() if not entry.get("in_model", True)]
+        for entry in pending:
+            entry["in_model"] = True
+        if pending:
+            self.store.save_index()
+
+    def rebuild(self):
+        """Trains from scratch on every cached face (no detection)."""
+        faces, labels = [], []
+        for user_id in self.store.user_ids():
+            user_faces = self.store.get(user_id)
+            faces.extend(user_faces)
+            labels.extend([user_id] * len(user_faces))
+        if not faces:
+            return
+        self.recognizer = cv2.face.LBPHFaceRecognizer_create()
+        self.recognizer.train(faces, np.array(labels, np.int32))
+        self.recognizer.write(self.model_path)
+        self.trained = True
+        self.needs_rebuild = self.dirty = False
+        self.legacy = []
+
+    def sync(self, dataset_dir, assume_cropped=True):
+        """
+        Enrolls every dataset/<name>/ folder (files named <name>.<id>.<count>.jpg) whose
+        images changed since the last sync. One process pool serves all users.
+        """
+        start = time.time()
+        added = 0
+        with ProcessPoolExecutor(self.workers, initializer=_init_worker) as pool:
+            for folder in sorted(os.listdir(dataset_dir)):
+                folder_path = os.path.join(dataset_dir, folder)
+                if not os.path.isdir(folder_path):
+                    continue
+                paths = [os.path.join(folder_path, f) for f in sorted(os.listdir(folder_path))
+                         if f.lower().endswith(IMAGE_EXTENSIONS)]
+                ids = {user_id_from_filename(p) for p in paths} - {None}
+                if len(ids) != 1:
+                    print(f"[WARN] Skipping {folder_path}: expected files named <name>.<id>.<n>.jpg with one id")
+                    continue
+                count = self.enroll(ids.pop(), folder, paths, assume_cropped, pool, save=False)
+                if count:
+                    added += 1
+                    print(f"[INFO] Enrolled {folder}: {count} faces")
+        # One model write (or one retrain) for the whole sync, not one per user
+        self.save()
+        print(f"[INFO] {added} user(s) enrolled in {time.time() - start:.1f}s, "
+              f"{len(self.store.index)} in the model")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Incremental LBPH face enrollment")
+    parser.add_argument("--model", default="trainer.yml")
+    parser.add_argument("--store", default="face_store", help="folder of cached face crops")
+    parser.add_argument("--workers", type=int, default=None)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    sync = sub.add_parser("sync", help="enroll new or changed users of a dataset folder")
+    sync.add_argument("dataset", nargs="?", default="dataset")
+    sync.add_argument("--detect", action="store_true",
+                      help="images are not face crops: drop those where no face is detected")
+    sync.add_argument("--rebuild", action="store_true",
+                      help="retrain from the store, dropping model users that are not in it")
+
+    enroll = sub.add_parser("enroll", help="enroll one user from images or a folder")
+    enroll.add_argument("id", type=int)
+    enroll.add_argument("name")
+    enroll.add_argument("images", nargs="+")
+
+    sub.add_parser("rebuild", help="retrain the model from the cached faces")
+    args = parser.parse_args()
+
+    enroller = Enroller(args.model, args.store, args.workers,
+                        discard_legacy=args.command == "sync" and args.rebuild)
+    if enroller.legacy and args.command != "rebuild":
+        parser.error(f"{args.model} has user(s) {enroller.legacy} that are not in {args.store}; use sync --rebuild "
+                     f"to retrain from the dataset (users without a folder are dropped)")
+    if args.command == "sync":
+        enroller.sync(args.dataset, assume_cropped=not args.detect)
+    elif args.command == "enroll":
+        paths = []
+        for item in args.images:
+            if os.path.isdir(item):
+                paths.extend(os.path.join(item, f) for f in sorted(os.listdir(item))
+                             if f.lower().endswith(IMAGE_EXTENSIONS))
+            else:
+                paths.append(item)
+        print(f"[INFO] {enroller.enroll(args.id, args.name, paths)} faces enrolled for {args.name}")
+    else:
+        enroller.rebuild()
+        print(f"[INFO] Model rebuilt with {len(enroller.store.index)} users")
+
+
+if __name__ == "__main__":
+    main()
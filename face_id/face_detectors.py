@@ -0,0 +1,116 @@
+# face_detectors.py
+import cv2
+import numpy as np
+
+CASCADE_PATH = cv2.data.haarcascades + "haarcascade_frontalface_default.xml"
+DNN_PROTOTXT = "deploy.prototxt"
+DNN_MODEL = "res10_300x300_ssd_iter_140000.caffemodel"
+
+
+class HaarFaceDetector:
+    """Viola-Jones cascade (cv2.CascadeClassifier). Boxes carry a score of 1.0."""
+
+    name = "haar"
+
+    def __init__(self, cascade_path=CASCADE_PATH, scale_factor=1.2, min_neighbors=5, min_size=(30, 30)):
+        self.cascade = cv2.CascadeClassifier(cascade_path)
+        if self.cascade.empty():
+            raise IOError(f"Cannot load cascade: {cascade_path}")
+        self.scale_factor = scale_factor
+        self.min_neighbors = min_neighbors
+        self.min_size = min_size
+
+    def detect(self, image):
+        """Returns [(x, y, w, h, score)] for a BGR or grayscale image."""
+        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if image.ndim == 3 else image
+        faces = self.cascade.detectMultiScale(gray, scaleFactor=self.scale_factor, minNeighbors=self.min_neighbors,
+                                              minSize=self.min_size)
+        return [(int(x), int(y), int(w), int(h), 1.0) for (x, y, w, h) in faces]
+
+    def detect_batch(self, images):
+        # The cascade has no batched mode
+        return [self.detect(image) for image in images]
+
+
+class DnnFaceDetector:
+    """
+    ResNet-10 SSD face detector (res10_300x300_ssd) through cv2.dnn.
+    detect_batch() packs several frames into one blob with blobFromImages, so a
+    batch costs a single forward pass. threads sets OpenCV's (process-wide) thread
+    count used by the DNN module.
+    """
+
+    name = "dnn"
+
+    def __init__(self, prototxt=DNN_PROTOTXT, model=DNN_MODEL, confidence=0.5, input_size=(300, 300),
+                 threads=None, mean=(104.0, 177.0, 123.0)):
+        self.net = cv2.dnn.readNetFromCaffe(prototxt, model)
+        self.net.setPreferableBackend(cv2.dnn.DNN_BACKEND_OPENCV)
+        self.net.setPreferableTarget(cv2.dnn.DNN_TARGET_CPU)
+        if threads:
+            cv2.setNumThreads(threads)
+        self.confidence = confidence
+        self.input_size = input_size
+        self.mean = mean
+
+    def _boxes(self, detections, shape):
+        h, w = shape[:2]
+        keep = detections[:, 2] > self.confidence
+        boxes = []
+        for _, _, score, x1, y1, x2, y2 in detections[keep]:
+            x1, y1 = max(0, int(x1 * w)), max(0, int(y1 * h))
+            x2, y2 = min(w, int(x2 * w)), min(h, int(y2 * h))
+            if x2 > x1 and y2 > y1:
+                boxes.append((x1, y1, x2 - x1, y2 - y1, float(score)))
+        return boxes
+
+    def detect(self, image):
+        if image.ndim == 2:
+            image = cv2.cvtColor(image, cv2.COLOR_GRAY2BGR)
+        blob = cv2.dnn.blobFromImage(image, scalefactor=1.0, size=self.input_size, mean=self.mean)
+        self.net.setInput(blob)
+        return self._boxes(self.net.forward()[0, 0], image.shape)
+
+    def detect_batch(self, images):
+        images = [cv2.cvtColor(im, cv2.COLOR_GRAY2BGR) if im.ndim == 2 else im for im in images]
+        blob = cv2.dnn.blobFromImages(images, scalefactor=1.0, size=self.input_size, mean=self.mean)
+        self.net.setInput(blob)
+        # (1, 1, K, 7) for the whole batch; column 0 is the index of the image in the batch
+        detections = self.net.forward()[0, 0]
+        image_ids = detections[:, 0].astype(int)
+        return [self._boxes(detections[image_ids == i], image.shape) for i, image in enumerate(images)]
+
+
+BACKENDS = {"haar": HaarFaceDetector, "dnn": DnnFaceDetector}
+
+
+def create_detector(name="haar", **kwargs):
+    """Builds a detector by backend name; kwargs go to its constructor."""
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown face detector '{name}', choose from {sorted(BACKENDS)}")
+    return BACKENDS[name](**kwargs)
+
+
+def iou(a, b):
+    """IoU of two (x, y, w, h, ...) boxes."""
+    ax, ay, aw, ah = a[:4]
+    bx, by, bw, bh = b[:4]
+    iw = max(0, min(ax + aw, bx + bw) - max(ax, bx))
+    ih = max(0, min(ay + ah, by + bh) - max(ay, by))
+    inter = iw * ih
+    union = aw * ah + bw * bh - inter
+    return inter / union if union else 0.0
+
+
+def match_count(predicted, truth, threshold=0.5):
+    """Number of ground-truth boxes matched one-to-one by a prediction with IoU >= threshold."""
+    if not predicted or not truth:
+        return 0
+    overlaps = np.array([[iou(p, t) for t in truth] for p in predicted])
+    matched = 0
+    while overlaps.size and overlaps.max() >= threshold:
+        p, t = np.unravel_index(np.argmax(overlaps), overlaps.shape)
+        overlaps[p, :] = -1
+        overlaps[:, t] = -1
+        matched += 1
+    return matched
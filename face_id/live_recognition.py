@@ -0,0 +1,245 @@
+# live_recognition.py
+import argparse
+import itertools
+import os
+import sys
+import time
+
+import cv2
+
+from enrollment import FACE_SIZE, FaceStore
+from face_detectors import DNN_MODEL, DNN_PROTOTXT, HaarFaceDetector, create_detector, iou
+
+# The shared capture module lives in the repository root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from camera_capture import CameraCapture
+
+
+def create_tracker(kind="mosse"):
+    """Returns an OpenCV single-object tracker, or None if this build has none."""
+    factories = {
+        "mosse": ["legacy.TrackerMOSSE_create", "TrackerMOSSE_create"],
+        "kcf": ["TrackerKCF_create", "legacy.TrackerKCF_create"],
+        "csrt": ["TrackerCSRT_create", "legacy.TrackerCSRT_create"],
+    }
+    for name in factories.get(kind, []):
+        owner = cv2
+        for part in name.split("."):
+            owner = getattr(owner, part, None)
+            if owner is None:
+                break
+        if owner is not None:
+            return owner()
+    return None
+
+
+class Track:
+    """One face followed across frames, with its cached identity."""
+
+    def __init__(self, track_id, box, tracker):
+        self.track_id = track_id
+        self.box = box
+        self.tracker = tracker
+        self.label = None            # enrolled id, or -1 for unknown
+        self.confidence = 0.0        # 0-100 from the last prediction
+        self.frames_since_predict = 0
+        self.missed_detections = 0
+
+
+class LiveRecognizer:
+    """
+    Recognizes faces in a live stream without detecting and predicting every face
+    every frame:
+
+    - the face detector (any face_detectors backend, Haar by default) runs only
+      every `detect_every` frames; in between, each face
+      is followed by a cheap correlation tracker;
+    - detections are matched to tracks by IoU, so a face keeps its track (and its
+      identity) from one detection to the next;
+    - the LBPH verdict, known or unknown, is cached per track. Trust in a known
+      label decays by `decay` confidence points per frame since its prediction,
+      and the face is predicted again once the decayed confidence falls below
+      `repredict_below` (at most every `repredict_every` frames), so a strong
+      match is rechecked less often than a weak one. New tracks, and any track
+      older than `max_identity_age` frames, are always predicted.
+    """
+
+    def __init__(self, model_path="trainer.yml", names=None, detect_every=5, tracker="mosse",
+                 repredict_below=35.0, decay=0.5, repredict_every=15, max_identity_age=90, match_iou=0.3,
+                 max_missed=1, detector=None):
+        self.recognizer = cv2.face.LBPHFaceRecognizer_create()
+        self.recognizer.read(model_path)
+        self.names = names or {}
+        self.detector = detector or HaarFaceDetector(scale_factor=1.2, min_neighbors=5, min_size=(64, 48))
+        self.detect_every = detect_every
+        self.tracker_kind = tracker
+        self.repredict_below = repredict_below
+        self.decay = decay
+        self.repredict_every = repredict_every
+        self.max_identity_age = max_identity_age
+        self.match_iou = match_iou
+        self.max_missed = max_missed
+
+        self.tracks = []
+        self.track_ids = itertools.count(1)
+        self.frame_index = 0
+        self.detections_run = 0
+        self.predictions_run = 0
+
+    def detect(self, frame, gray):
+        # The cascade works on grayscale; the DNN needs colour
+        image = gray if isinstance(self.detector, HaarFaceDetector) else frame
+        return [box[:4] for box in self.detector.detect(image)]
+
+    def _new_track(self, frame, box):
+        tracker = create_tracker(self.tracker_kind)
+        if tracker is not None:
+            tracker.init(frame, box)
+        return Track(next(self.track_ids), box, tracker)
+
+    def _associate(self, frame, detections):
+        """Greedy IoU matching of fresh detections to existing tracks."""
+        pairs = sorted(((iou(t.box, d), ti, di) for ti, t in enumerate(self.tracks)
+                        for di, d in enumerate(detections)), reverse=True)
+        used_tracks, used_detections = set(), set()
+        for overlap, ti, di in pairs:
+            if overlap < self.match_iou:
+                break
+            if ti in used_tracks or di in used_detections:
+                continue
+            used_tracks.add(ti)
+            used_detections.add(di)
+            track = self.tracks[ti]
+            track.box = detections[di]
+            track.missed_detections = 0
+            # Re-anchor the tracker on the detection so drift never accumulates
+            track.tracker = create_tracker(self.tracker_kind)
+            if track.tracker is not None:
+                track.tracker.init(frame, track.box)
+
+        kept = []
+        for ti, track in enumerate(self.tracks):
+            if ti not in used_tracks:
+                track.missed_detections += 1
+            if track.missed_detections <= self.max_missed:
+                kept.append(track)
+        kept.extend(self._new_track(frame, d) for di, d in enumerate(detections) if di not in used_detections)
+        self.tracks = kept
+
+    def _follow(self, frame):
+        kept = []
+        for track in self.tracks:
+            if track.tracker is None:
+                kept.append(track)  # no tracker available: hold the box until the next detection
+                continue
+            ok, box = track.tracker.update(frame)
+            if ok:
+                track.box = tuple(int(v) for v in box)
+                kept.append(track)
+        self.tracks = kept
+
+    def _predict(self, gray, track):
+        x, y, w, h = track.box
+        height, width = gray.shape[:2]
+        x0, y0, x1, y1 = max(0, x), max(0, y), min(width, x + w), min(height, y + h)
+        if x1 - x0 < 8 or y1 - y0 < 8:
+            return
+        face = cv2.resize(gray[y0:y1, x0:x1], FACE_SIZE)
+        label, distance = self.recognizer.predict(face)
+        self.predictions_run += 1
+        # Same rule as the notebook: an LBPH distance of 100 or more is not a match
+        track.label = label if distance < 100 else -1
+        track.confidence = max(0.0, 100.0 - distance)
+        track.frames_since_predict = 0
+
+    def identity_confidence(self, track):
+        """The cached confidence, decayed with the frames since it was measured."""
+        return max(0.0, track.confidence - self.decay * track.frames_since_predict)
+
+    def _needs_prediction(self, track):
+        if track.label is None or track.frames_since_predict > self.max_identity_age:
+            return True
+        # The stored confidence stays as measured; only the trigger sees the decayed value.
+        # An unknown face stays unknown until it ages out
+        return (track.label >= 0 and self.identity_confidence(track) < self.repredict_below and
+                track.frames_since_predict >= self.repredict_every)
+
+    def process(self, frame):
+        """Updates tracks and identities for one BGR frame and returns the tracks."""
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        if self.frame_index % self.detect_every == 0:
+            self._associate(frame, self.detect(frame, gray))
+            self.detections_run += 1
+        else:
+            self._follow(frame)
+
+        for track in self.tracks:
+            track.frames_since_predict += 1
+            if self._needs_prediction(track):
+                self._predict(gray, track)
+        self.frame_index += 1
+        return self.tracks
+
+    def name(self, track):
+        if track.label is None or track.label < 0:
+            return "Unknown"
+        return self.names.get(track.label, "Unknown")
+
+
+def draw_tracks(img, recognizer):
+    font = cv2.FONT_HERSHEY_SIMPLEX
+    for track in recognizer.tracks:
+        x, y, w, h = track.box
+        cv2.rectangle(img, (x, y), (x + w, y + h), (0, 255, 0), 2)
+        cv2.putText(img, recognizer.name(track), (x + 5, y - 5), font, 1, (255, 255, 255), 2)
+        cv2.putText(img, f"{round(track.confidence)}%", (x + 5, y + h - 5), font, 1, (255, 255, 0), 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Live face recognition with tracking between detections")
+    parser.add_argument("--model", default="trainer.yml")
+    parser.add_argument("--store", default="face_store", help="face store of enrollment.py (for user names)")
+    parser.add_argument("--source", default="0", help="camera index or video file")
+    parser.add_argument("--detect-every", type=int, default=5)
+    parser.add_argument("--tracker", choices=["mosse", "kcf", "csrt"], default="mosse")
+    parser.add_argument("--detector", choices=["haar", "dnn"], default="haar")
+    parser.add_argument("--prototxt", default=DNN_PROTOTXT)
+    parser.add_argument("--dnn-model", default=DNN_MODEL)
+    parser.add_argument("--threads", type=int, default=None, help="OpenCV threads for the DNN detector")
+    args = parser.parse_args()
+
+    detector = None
+    if args.detector == "dnn":
+        detector = create_detector("dnn", prototxt=args.prototxt, model=args.dnn_model, threads=args.threads)
+    names = FaceStore(args.store).names()
+    recognizer = LiveRecognizer(args.model, names, detect_every=args.detect_every, tracker=args.tracker,
+                                detector=detector)
+
+    source = int(args.source) if args.source.isdigit() else args.source
+    cam = CameraCapture(source, width=640, height=480, mirror=True)
+    print(f"[INFO] {cam.describe()}")
+
+    frames, start = 0, time.time()
+    while True:
+        ret, img, _ = cam.read()
+        if not ret:
+            break
+        recognizer.process(img)
+        frames += 1
+        draw_tracks(img, recognizer)
+        cv2.putText(img, f"{frames / (time.time() - start):.1f} FPS | predictions/frame: "
+                         f"{recognizer.predictions_run / frames:.2f}", (10, 20), cv2.FONT_HERSHEY_SIMPLEX, 0.5,
+                    (0, 255, 255), 1)
+        cv2.imshow('camera', img)
+        k = cv2.waitKey(10) & 0xff
+        if k == 27:
+            break
+
+    print(f"\n[INFO] {frames} frames, {recognizer.detections_run} detections, "
+          f"{recognizer.predictions_run} predictions")
+    cam.release()
+    cv2.destroyAllWindows()
+
+
+if __name__ == "__main__":
+    main()
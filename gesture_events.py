@@ -0,0 +1,128 @@
+# gesture_events.py
+import math
+import time
+from collections import namedtuple
+
+# Landmark indices used for hand-size normalization (MediaPipe hand model)
+WRIST = 0
+MIDDLE_MCP = 9
+INDEX_TIP = 8
+MIDDLE_TIP = 12
+
+# A single gesture event: type is one of
+# 'press', 'hold', 'drag_start', 'drag', 'release', 'click', 'double_click'
+GestureEvent = namedtuple("GestureEvent", ["type", "position", "timestamp"])
+
+
+def _distance(p1, p2):
+    return math.hypot(p1[0] - p2[0], p1[1] - p2[1])
+
+
+class PinchEventEngine:
+    """
+    Turns a stream of hand landmarks into pinch events.
+
+    The pinch distance is divided by the hand size (wrist to middle-finger MCP), so
+    the same thresholds work close to and far from the camera. Separate press and
+    release thresholds (hysteresis) stop the state flickering around a single
+    cut-off, so no fixed delay between actions is needed: a press is reported
+    once it has been stable for a couple of frames, and the next one can follow
+    as soon as the fingers have actually opened again.
+
+    A press ends as exactly one of: a click (released early, without moving), a
+    hold (kept still for hold_time) or a drag (moved first); once a press has
+    become a hold it can no longer turn into a drag, and the other way round.
+    A second click soon after the first and close to it is also reported as a
+    'double_click' (after its own 'click').
+    """
+
+    def __init__(self, tip_a=INDEX_TIP, tip_b=MIDDLE_TIP, press_ratio=0.3, release_ratio=0.4,
+                 min_press_frames=2, hold_time=0.5, drag_ratio=0.3, double_click_time=0.35):
+        self.tip_a = tip_a
+        self.tip_b = tip_b
+        self.press_ratio = press_ratio              # pinch closes below this (distance / hand size)
+        self.release_ratio = release_ratio          # pinch opens above this
+        self.min_press_frames = min_press_frames    # consecutive closed frames before 'press'
+        self.hold_time = hold_time                  # seconds pressed without moving before 'hold'
+        self.drag_ratio = drag_ratio                # movement (in hand sizes) that turns a press into a drag
+        self.double_click_time = double_click_time  # max gap between two clicks of a double click
+        self.reset()
+
+    def reset(self):
+        """Forgets any gesture in progress (e.g. when the hand leaves the frame)."""
+        self.state = "idle"        # 'idle', 'pending', 'pressed'
+        self.closed_frames = 0
+        self.press_time = 0
+        self.press_position = None
+        self.held = False
+        self.dragging = False
+        self.last_click_time = -math.inf
+        self.last_click_position = None
+        self.ratio = None
+        self.hand_size = None
+
+    @property
+    def is_pressed(self):
+        return self.state == "pressed"
+
+    def update(self, lm_list, timestamp=None):
+        """
+        Feeds one frame of landmarks ([x, y, ...] per point, or an empty list when no
+        hand is visible). Returns the list of GestureEvents triggered by this frame.
+        """
+        now = time.time() if timestamp is None else timestamp
+        events = []
+
+        if not lm_list:
+            if self.state == "pressed":
+                events.append(GestureEvent("release", self.press_position, now))
+            self.state = "idle"
+            self.closed_frames = 0
+            self.held = self.dragging = False
+            return events
+
+        self.hand_size = max(_distance(lm_list[WRIST], lm_list[MIDDLE_MCP]), 1e-6)
+        self.ratio = _distance(lm_list[self.tip_a], lm_list[self.tip_b]) / self.hand_size
+        position = (lm_list[self.tip_a][0], lm_list[self.tip_a][1])
+
+        if self.state in ("idle", "pending"):
+            if self.ratio < self.press_ratio:
+                self.closed_frames += 1
+                self.state = "pending"
+                if self.closed_frames >= self.min_press_frames:
+                    self.state = "pressed"
+                    self.press_time = now
+                    self.press_position = position
+                    self.held = self.dragging = False
+                    events.append(GestureEvent("press", position, now))
+            elif self.ratio > self.release_ratio or self.state == "idle":
+                # Bounced open again before the press was confirmed
+                self.state = "idle"
+                self.closed_frames = 0
+
+        elif self.state == "pressed":
+            if self.ratio > self.release_ratio:
+                self.state = "idle"
+                self.closed_frames = 0
+                events.append(GestureEvent("release", position, now))
+                if not self.held and not self.dragging:
+                    events.append(GestureEvent("click", position, now))
+                    if (now - self.last_click_time < self.double_click_time and
+                            _distance(position, self.last_click_position) < self.drag_ratio * self.hand_size):
+                        events.append(GestureEvent("double_click", position, now))
+                        self.last_click_time = -math.inf  # a third click starts a new pair
+                    else:
+                        self.last_click_time = now
+                        self.last_click_position = position
+            elif not self.held:
+                moved = _distance(position, self.press_position) / self.hand_size
+                if not self.dragging and moved > self.drag_ratio:
+                    self.dragging = True
+                    events.append(GestureEvent("drag_start", self.press_position, now))
+                if self.dragging:
+                    events.append(GestureEvent("drag", position, now))
+                elif now - self.press_time > self.hold_time:
+                    self.held = True
+                    events.append(GestureEvent("hold", position, now))
+
+        return events
@@ -10,6 +10,11 @@ import csv
 import os
 from datetime import datetime
 import threading
+import sys
+
+# The shared capture module lives in the repository root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from camera_capture import CameraCapture
 
 
 class GymAssistantApp(ctk.CTk):
@@ -51,9 +56,7 @@ class GymAssistantApp(ctk.CTk):
 
         # --- THREADING SETUP ---
         self.detector = PoseDetector(complexity=0)
-        self.cap = cv2.VideoCapture(0, cv2.CAP_DSHOW)
-        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
-        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
+        self.cap = CameraCapture(0, width=640, height=480, mirror=True, api_preference=cv2.CAP_DSHOW)
 
         self.latest_frame = None
         self.data_lock = threading.Lock()
@@ -76,12 +79,11 @@ class GymAssistantApp(ctk.CTk):
 
     def _video_processing_loop(self):
         while not self.stop_event.is_set():
-            success, frame = self.cap.read()
+            success, frame, _ = self.cap.read()
             if not success:
                 time.sleep(0.01)
                 continue
 
-            frame = cv2.flip(frame, 1)
             annotated_frame = self.detector.find_pose(frame, draw=True)
             lm_list = self.detector.find_landmarks(annotated_frame)
 
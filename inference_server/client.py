@@ -0,0 +1,305 @@
+# client.py
+"""
+Subscriber side of the inference server.
+
+    from client import LandmarkSubscriber
+
+    with LandmarkSubscriber("cam0") as subscriber:
+        while True:
+            result = subscriber.wait()
+            if result and result.hands:
+                detect_move(as_mediapipe(result.hands[0].landmarks).landmark)
+
+Landmarks are read straight from the camera's shared-memory segment, so any
+number of apps share one camera and one model run per frame. stream_landmarks()
+reads the same data as JSON from the server socket instead.
+
+The demos switch to the server with ServerCapture, which replaces both their
+CameraCapture and their MediaPipe model (see --server in rps_game.py).
+"""
+import argparse
+import asyncio
+import json
+import socket
+import time
+from collections import namedtuple
+from types import SimpleNamespace
+
+import cv2
+import numpy as np
+
+from protocol import DEFAULT_HOST, DEFAULT_PORT, HANDEDNESS, SegmentView, attach_segment, request
+
+Hand = namedtuple("Hand", ["handedness", "score", "landmarks"])    # landmarks: (21, 3) normalized x, y, z
+Landmarks = namedtuple("Landmarks", ["sequence", "timestamp", "hands", "pose", "frame", "inference_ms"])
+Point = namedtuple("Point", ["x", "y", "z", "visibility"], defaults=(1.0,))
+
+HAND_CONNECTIONS = ((0, 1), (1, 2), (2, 3), (3, 4), (0, 5), (5, 6), (6, 7), (7, 8), (5, 9), (9, 10), (10, 11),
+                    (11, 12), (9, 13), (13, 14), (14, 15), (15, 16), (13, 17), (0, 17), (17, 18), (18, 19), (19, 20))
+
+
+def list_cameras(host=DEFAULT_HOST, port=DEFAULT_PORT):
+    return asyncio.run(request(host, port, {"type": "cameras"}))["cameras"]
+
+
+def server_stats(host=DEFAULT_HOST, port=DEFAULT_PORT):
+    return asyncio.run(request(host, port, {"type": "stats"}))["cameras"]
+
+
+class LandmarkSubscriber:
+    """
+    Reads one camera's latest landmarks (and frame) from shared memory.
+
+    Frames are copied into a small ring of buffers: a returned frame stays valid
+    until ring_size - 1 further reads, as with CameraCapture. With with_frame=False
+    only the landmarks are copied.
+    """
+
+    def __init__(self, camera="cam0", host=DEFAULT_HOST, port=DEFAULT_PORT, with_frame=True, ring_size=2):
+        cameras = {c["name"]: c for c in list_cameras(host, port)}
+        if camera not in cameras:
+            raise KeyError(f"Camera {camera!r} is not served (available: {', '.join(cameras) or 'none'})")
+        info = cameras[camera]
+        self.camera = camera
+        self.width, self.height = info["width"], info["height"]
+        self.view = SegmentView(attach_segment(info["shm"]), self.width, self.height)
+        self.mirror = info.get("mirror", False)
+        self.fps = info.get("fps") or 0.0
+        self.with_frame = with_frame and info["frames"]
+        self._frames = [np.empty((self.height, self.width, 3), np.uint8)
+                        for _ in range(max(2, ring_size))] if self.with_frame else None
+        self._slot = 0
+        self.last_sequence = 0
+
+    def read(self, retries=50):
+        """Returns the latest Landmarks, or None before the first frame (or if every copy was torn)."""
+        header = self.view.header
+        for _ in range(retries):
+            before = int(header["sequence"])
+            if before == 0:
+                return None
+            if before % 2:
+                time.sleep(0)   # the server is writing
+                continue
+            snapshot = header.copy()
+            frame = None
+            if self.with_frame and snapshot["has_frame"]:
+                frame = self._frames[self._slot]
+                np.copyto(frame, self.view.frame)
+            if int(header["sequence"]) == before:
+                if frame is not None:
+                    self._slot = (self._slot + 1) % len(self._frames)
+                return self._unpack(snapshot, frame)
+        return None
+
+    def _unpack(self, snapshot, frame):
+        hands = [Hand(HANDEDNESS[snapshot["handedness"][i]], float(snapshot["hand_scores"][i]), snapshot["hands"][i])
+                 for i in range(int(snapshot["num_hands"]))]
+        pose = snapshot["pose"] if snapshot["has_pose"] else None
+        self.last_sequence = int(snapshot["frame_sequence"])
+        return Landmarks(self.last_sequence, float(snapshot["timestamp"]), hands, pose, frame,
+                         float(snapshot["inference_ms"]))
+
+    def wait(self, timeout=1.0, poll=0.001):
+        """Waits for landmarks newer than the last ones returned. Returns None on timeout."""
+        deadline = time.time() + timeout
+        header = self.view.header
+        while time.time() < deadline:
+            if int(header["frame_sequence"]) > self.last_sequence:
+                result = self.read()
+                if result is not None:
+                    return result
+            time.sleep(poll)
+        return None
+
+    def close(self):
+        self.view.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def stream_landmarks(camera="cam0", host=DEFAULT_HOST, port=DEFAULT_PORT):
+    """Yields the server's JSON landmark messages for one camera (latest only; slow readers skip frames)."""
+    with socket.create_connection((host, port)) as connection:
+        connection.sendall((json.dumps({"type": "subscribe", "camera": camera}) + "\n").encode("utf-8"))
+        for line in connection.makefile("r", encoding="utf-8"):
+            message = json.loads(line)
+            if message.get("type") == "error":
+                raise KeyError(message["error"])
+            yield message
+
+
+# --- Helpers for the existing demos ---
+def as_mediapipe(landmarks):
+    """Wraps an (N, 3) or (N, 4) array like a MediaPipe landmark list, so code using .landmark[i].x keeps working."""
+    return SimpleNamespace(landmark=[Point(*map(float, row)) for row in landmarks])
+
+
+def as_cvzone(hand, width, height):
+    """A Hand as the dict cvzone's HandDetector.findHands() returns (pixel lmList, bbox, center, type)."""
+    points = hand.landmarks[:, :2] * (width, height)
+    lm_list = [[int(x), int(y), int(z * width)] for (x, y), z in zip(points, hand.landmarks[:, 2])]
+    (x0, y0), (x1, y1) = points.min(axis=0).astype(int), points.max(axis=0).astype(int)
+    return {"lmList": lm_list, "bbox": (x0, y0, x1 - x0, y1 - y0), "center": ((x0 + x1) // 2, (y0 + y1) // 2),
+            "type": hand.handedness}
+
+
+def draw_landmarks(image, landmark_list, connections=HAND_CONNECTIONS, color=(0, 0, 255), line_color=(255, 255, 255)):
+    """Same call as MediaPipe's drawing_utils.draw_landmarks, for as_mediapipe() landmarks."""
+    height, width = image.shape[:2]
+    points = [(int(p.x * width), int(p.y * height)) for p in landmark_list.landmark]
+    for a, b in connections or ():
+        cv2.line(image, points[a], points[b], line_color, 2)
+    for point in points:
+        cv2.circle(image, point, 3, color, cv2.FILLED)
+    return image
+
+
+class ServerCapture:
+    """
+    An inference-server camera behind the CameraCapture interface (read, start,
+    latest, release), whose process() stands in for a MediaPipe Hands/Pose object:
+    it returns the server's results for the frame last returned, shaped like
+    MediaPipe's. An app moves to the shared server by replacing its capture and
+    its model with one ServerCapture.
+
+    mirror is what the app expects; if the server publishes the other way, frames
+    and landmarks are flipped here, so mirrored and unmirrored apps share a camera.
+    """
+
+    is_file = False
+
+    def __init__(self, camera="cam0", mirror=False, host=DEFAULT_HOST, port=DEFAULT_PORT, ring_size=4,
+                 timeout=5.0):
+        self.subscriber = LandmarkSubscriber(camera, host, port, ring_size=ring_size)
+        if not self.subscriber.with_frame:
+            raise IOError(f"The server does not publish frames of {camera} (started with --no-frames)")
+        self.camera = camera
+        self.width, self.height, self.fps = self.subscriber.width, self.subscriber.height, self.subscriber.fps
+        self.flip = bool(mirror) != bool(self.subscriber.mirror)
+        self._flipped = [np.empty((self.height, self.width, 3), np.uint8) for _ in range(max(2, ring_size))]
+        self._slot = 0
+        self.timeout = timeout
+        self.current = None
+        self._running = True
+
+    def describe(self):
+        flip = ", flipped here" if self.flip else ""
+        return f"inference server {self.camera}: {self.width}x{self.height} @ {self.fps:.1f} FPS{flip}"
+
+    def _next(self, timeout):
+        result = self.subscriber.wait(timeout)
+        if result is None or result.frame is None:
+            return None
+        if self.flip:
+            frame = self._flipped[self._slot]
+            self._slot = (self._slot + 1) % len(self._flipped)
+            cv2.flip(result.frame, 1, dst=frame)
+            hands = [Hand(HANDEDNESS[1 - HANDEDNESS.index(h.handedness)], h.score, _flip_x(h.landmarks))
+                     for h in result.hands]
+            pose = None if result.pose is None else _flip_x(result.pose)
+            result = result._replace(frame=frame, hands=hands, pose=pose)
+        self.current = result
+        return result
+
+    def read(self):
+        """Next frame as (ok, frame, timestamp); not ok once the server stopped sending for `timeout` seconds."""
+        result = self._next(self.timeout)
+        if result is None:
+            self._running = False
+            return False, None, None
+        return True, result.frame, result.timestamp
+
+    def start(self):
+        return self
+
+    def latest(self, after_sequence=None, timeout=1.0):
+        """Same contract as CameraCapture.latest(): (frame, timestamp, sequence)."""
+        current = self.current
+        if current is None or (after_sequence is not None and current.sequence <= after_sequence):
+            current = self._next(timeout)
+        if current is None:
+            return None, None, self.subscriber.last_sequence
+        return current.frame, current.timestamp, current.sequence
+
+    @property
+    def running(self):
+        return self._running
+
+    def process(self, image=None):
+        """MediaPipe-shaped results (multi_hand_landmarks, multi_handedness, pose_landmarks); image is ignored."""
+        hands = self.current.hands if self.current else []
+        pose = self.current.pose if self.current else None
+        handedness = [SimpleNamespace(classification=[SimpleNamespace(index=HANDEDNESS.index(h.handedness),
+                                                                      label=h.handedness, score=h.score)])
+                      for h in hands]
+        return SimpleNamespace(multi_hand_landmarks=[as_mediapipe(h.landmarks) for h in hands] or None,
+                               multi_handedness=handedness or None,
+                               pose_landmarks=None if pose is None else as_mediapipe(pose))
+
+    def find_hands(self):
+        """The current hands as cvzone HandDetector.findHands() dicts."""
+        hands = self.current.hands if self.current else []
+        return [as_cvzone(hand, self.width, self.height) for hand in hands]
+
+    def release(self):
+        self._running = False
+        self.subscriber.close()
+
+
+def _flip_x(landmarks):
+    flipped = landmarks.copy()
+    flipped[:, 0] = 1.0 - flipped[:, 0]
+    return flipped
+
+
+def to_pixels(landmarks, width, height):
+    """Normalized landmarks -> (N, 2) int pixel coordinates."""
+    return np.round(landmarks[:, :2] * (width, height)).astype(np.int32)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Show what the inference server publishes for one camera")
+    parser.add_argument("--camera", default="cam0")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--socket", action="store_true", help="read the JSON stream instead of shared memory")
+    args = parser.parse_args()
+
+    if args.socket:
+        count, start = 0, time.time()
+        for message in stream_landmarks(args.camera, args.host, args.port):
+            count += 1
+            if time.time() - start >= 1.0:
+                print(f"[CLIENT] {count / (time.time() - start):.1f} messages/s, {len(message['hands'])} hand(s)")
+                count, start = 0, time.time()
+        return
+
+    with LandmarkSubscriber(args.camera, args.host, args.port) as subscriber:
+        print(f"[CLIENT] {args.camera}: {subscriber.width}x{subscriber.height}")
+        while True:
+            result = subscriber.wait()
+            if result is None or result.frame is None:
+                continue
+            frame = result.frame
+            for hand in result.hands:
+                for x, y in to_pixels(hand.landmarks, subscriber.width, subscriber.height):
+                    cv2.circle(frame, (int(x), int(y)), 4, (0, 255, 0), -1)
+            if result.pose is not None:
+                for x, y in to_pixels(result.pose, subscriber.width, subscriber.height):
+                    cv2.circle(frame, (int(x), int(y)), 4, (255, 0, 255), -1)
+            latency = (time.time() - result.timestamp) * 1000
+            cv2.putText(frame, f"frame {result.sequence} | inference {result.inference_ms:.1f} ms | "
+                               f"age {latency:.0f} ms", (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
+            cv2.imshow(f"Inference server: {args.camera}", frame)
+            if cv2.waitKey(1) & 0xFF == ord('q'):
+                break
+        cv2.destroyAllWindows()
+
+
+if __name__ == "__main__":
+    main()
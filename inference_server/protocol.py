@@ -0,0 +1,157 @@
+# protocol.py
+"""
+What the inference server publishes, shared by server.py and client.py.
+
+Every camera gets one shared-memory segment: a fixed header with the latest
+landmarks, followed by the latest frame. The segment is written as a seqlock:
+the sequence number is odd while the server writes, so a reader copies the
+data and retries if the sequence was odd or changed during the copy. Readers
+never block the server and the server never waits for slow readers.
+
+A local TCP socket (JSON lines, like the rock-paper-scissors protocol) lists
+the cameras and their segment names, reports stats, and streams landmarks as
+JSON for subscribers that cannot map shared memory.
+"""
+import asyncio
+import json
+import sys
+from multiprocessing import shared_memory
+
+import numpy as np
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8766
+
+MAX_HANDS = 2
+HAND_LANDMARKS = 21
+POSE_LANDMARKS = 33
+HANDEDNESS = ("Left", "Right")
+
+HEADER = np.dtype([
+    ("sequence", "<u8"),         # seqlock counter: odd while a write is in progress
+    ("frame_sequence", "<u8"),   # camera frame number the landmarks belong to
+    ("timestamp", "<f8"),        # capture time (CameraCapture timestamp)
+    ("inference_ms", "<f4"),
+    ("width", "<u4"),
+    ("height", "<u4"),
+    ("has_frame", "<u4"),        # 0 when frames are not published or did not fit
+    ("num_hands", "<u4"),
+    ("has_pose", "<u4"),
+    ("handedness", "<u1", (MAX_HANDS,)),
+    ("hand_scores", "<f4", (MAX_HANDS,)),
+    ("hands", "<f4", (MAX_HANDS, HAND_LANDMARKS, 3)),    # normalized x, y, z
+    ("pose", "<f4", (POSE_LANDMARKS, 4)),                # normalized x, y, z, visibility
+])
+FRAME_OFFSET = (HEADER.itemsize + 63) // 64 * 64
+
+
+def segment_name(camera):
+    return f"mp_inference_{camera}"
+
+
+def segment_size(width, height):
+    return FRAME_OFFSET + width * height * 3
+
+
+def attach_segment(name):
+    """Opens an existing segment without letting this process's resource tracker delete it on exit."""
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name, track=False)
+    segment = shared_memory.SharedMemory(name)
+    from multiprocessing import resource_tracker
+    resource_tracker.unregister(segment._name, "shared_memory")
+    return segment
+
+
+class SegmentView:
+    """NumPy views of the header and frame area of a segment."""
+
+    def __init__(self, segment, width, height):
+        self.segment = segment
+        self.header = np.ndarray((), HEADER, buffer=segment.buf)
+        self.frame_capacity = segment.size - FRAME_OFFSET
+        self.width, self.height = width, height
+        self.frame = np.ndarray((height, width, 3), np.uint8, buffer=segment.buf, offset=FRAME_OFFSET)
+
+    def close(self):
+        # Views must go before the mapping can be closed
+        del self.header, self.frame
+        self.segment.close()
+
+
+class LandmarkWriter(SegmentView):
+    """Server side of one camera's segment."""
+
+    def __init__(self, camera, width, height):
+        name = segment_name(camera)
+        try:
+            # A segment left behind by a crashed server
+            stale = shared_memory.SharedMemory(name)
+            stale.close()
+            stale.unlink()
+        except FileNotFoundError:
+            pass
+        super().__init__(shared_memory.SharedMemory(name, create=True, size=segment_size(width, height)),
+                         width, height)
+        self.name = name
+        self.header["sequence"] = 0
+
+    def publish(self, frame_sequence, timestamp, inference_ms, hands, pose, frame=None):
+        """
+        hands: list of (handedness index, score, (21, 3) array); pose: (33, 4) array or None.
+        frame: BGR image to share, or None.
+        """
+        header = self.header
+        sequence = int(header["sequence"])
+        header["sequence"] = sequence + 1
+        header["frame_sequence"] = frame_sequence
+        header["timestamp"] = timestamp
+        header["inference_ms"] = inference_ms
+        header["num_hands"] = len(hands)
+        for i, (handedness, score, landmarks) in enumerate(hands[:MAX_HANDS]):
+            header["handedness"][i] = handedness
+            header["hand_scores"][i] = score
+            header["hands"][i] = landmarks
+        header["has_pose"] = pose is not None
+        if pose is not None:
+            header["pose"] = pose
+        fits = frame is not None and frame.shape == self.frame.shape
+        if fits:
+            np.copyto(self.frame, frame)
+        header["has_frame"] = fits
+        header["sequence"] = sequence + 2
+
+    def close(self):
+        super().close()
+        self.segment.unlink()
+
+
+# --- Socket messages ---
+async def send_message(writer, message):
+    writer.write((json.dumps(message) + "\n").encode("utf-8"))
+    await writer.drain()
+
+
+async def read_message(reader):
+    line = await reader.readline()
+    if not line:
+        return None
+    return json.loads(line)
+
+
+def landmarks_message(camera, frame_sequence, timestamp, hands, pose):
+    """JSON form of one frame's landmarks for socket subscribers."""
+    return {"type": "landmarks", "camera": camera, "sequence": frame_sequence, "timestamp": timestamp,
+            "hands": [{"handedness": HANDEDNESS[h], "score": round(float(s), 3),
+                       "landmarks": np.round(lm, 4).tolist()} for h, s, lm in hands],
+            "pose": None if pose is None else np.round(pose, 4).tolist()}
+
+
+async def request(host, port, message):
+    """One request/reply exchange on a fresh connection."""
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        await send_message(writer, message)
+        return await read_message(reader)
+    finally:
+        writer.close()
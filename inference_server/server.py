@@ -0,0 +1,269 @@
+# server.py
+"""
+Local inference daemon: owns the cameras and runs the MediaPipe models once per
+frame for every app on the machine.
+
+    python server.py --camera 0 --camera 1 --models hands pose --mirror
+
+Each camera gets a worker thread that runs the models on the newest frame and
+publishes the landmarks (and the frame itself) to the camera's shared-memory
+segment, where any number of apps read them with client.py. A local socket
+lists the cameras, reports stats, and streams the landmarks as JSON.
+"""
+import argparse
+import asyncio
+import os
+import sys
+import threading
+import time
+
+import cv2
+import numpy as np
+
+from protocol import (DEFAULT_HOST, DEFAULT_PORT, HANDEDNESS, MAX_HANDS, LandmarkWriter, landmarks_message,
+                      read_message, send_message)
+
+# The shared capture module lives in the repository root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from camera_capture import CameraCapture
+
+
+class CameraWorker(threading.Thread):
+    """Reads one camera and runs every model once on each frame it processes."""
+
+    def __init__(self, name, source, config, on_result=None):
+        super().__init__(daemon=True)
+        self.name = name
+        self.source = source
+        self.config = config
+        self.on_result = on_result      # called from this thread with (camera, sequence, timestamp, hands, pose)
+        self.ready = threading.Event()
+        self.running = True
+        self.capture = None
+        self.writer = None
+        self.error = None
+        self.frames = 0
+        self.fps = 0.0
+        self.inference_ms = 0.0
+
+    def describe(self):
+        return {"name": self.name, "source": str(self.source), "shm": self.writer.name if self.writer else None,
+                "width": self.writer.width if self.writer else None,
+                "height": self.writer.height if self.writer else None,
+                "fps": round(self.capture.fps, 1) if self.capture else None, "models": self.config.models,
+                "frames": self.config.publish_frames, "mirror": self.config.mirror}
+
+    def _create_models(self):
+        import mediapipe as mp
+
+        hands = pose = None
+        if "hands" in self.config.models:
+            hands = mp.solutions.hands.Hands(max_num_hands=MAX_HANDS, model_complexity=self.config.complexity,
+                                             min_detection_confidence=0.5, min_tracking_confidence=0.5)
+        if "pose" in self.config.models:
+            pose = mp.solutions.pose.Pose(model_complexity=self.config.complexity, smooth_landmarks=True,
+                                          min_detection_confidence=0.5, min_tracking_confidence=0.5)
+        return hands, pose
+
+    def run(self):
+        try:
+            self._run()
+        except Exception as exc:  # reported through stats, the other cameras keep running
+            self.error = str(exc)
+            print(f"[SERVER] {self.name}: {exc}")
+        finally:
+            self.ready.set()
+            if self.capture is not None:
+                self.capture.release()
+            if self.writer is not None:
+                # Unlinked: the camera is no longer listed and subscribers see no new frames
+                self.writer.close()
+                self.writer = None
+
+    def _run(self):
+        config = self.config
+        self.capture = CameraCapture(self.source, config.width, config.height, config.fps,
+                                     mirror=config.mirror).start()
+        print(f"[SERVER] {self.name}: {self.capture.describe()}")
+        hands_model, pose_model = self._create_models()
+
+        sequence = 0
+        rate_start, rate_frames = time.time(), 0
+        while self.running and self.capture.running:
+            frame, timestamp, new_sequence = self.capture.latest(after_sequence=sequence, timeout=1.0)
+            if frame is None or new_sequence == sequence:
+                continue
+            sequence = new_sequence
+            if self.writer is None:
+                self.writer = LandmarkWriter(self.name, frame.shape[1], frame.shape[0])
+                self.ready.set()
+
+            # One colour conversion shared by all models
+            start = time.perf_counter()
+            rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            rgb.flags.writeable = False
+            hands = []
+            if hands_model is not None:
+                results = hands_model.process(rgb)
+                for landmarks, handedness in zip(results.multi_hand_landmarks or [],
+                                                 results.multi_handedness or []):
+                    label = handedness.classification[0]
+                    hands.append((HANDEDNESS.index(label.label), label.score,
+                                  np.array([(p.x, p.y, p.z) for p in landmarks.landmark], np.float32)))
+            pose = None
+            if pose_model is not None:
+                results = pose_model.process(rgb)
+                if results.pose_landmarks:
+                    pose = np.array([(p.x, p.y, p.z, p.visibility) for p in results.pose_landmarks.landmark],
+                                    np.float32)
+            elapsed_ms = (time.perf_counter() - start) * 1000
+
+            self.writer.publish(sequence, timestamp, elapsed_ms, hands, pose,
+                                frame if config.publish_frames else None)
+            if self.on_result is not None:
+                self.on_result(self.name, sequence, timestamp, hands, pose)
+
+            self.frames += 1
+            rate_frames += 1
+            self.inference_ms = 0.9 * self.inference_ms + 0.1 * elapsed_ms if self.frames > 1 else elapsed_ms
+            now = time.time()
+            if now - rate_start >= 1.0:
+                self.fps = rate_frames / (now - rate_start)
+                rate_start, rate_frames = now, 0
+
+    def stop(self):
+        self.running = False
+
+
+class InferenceServer:
+    """Camera workers plus the socket that serves the camera list, stats and JSON streams."""
+
+    def __init__(self, config):
+        self.config = config
+        self.loop = None
+        self.subscribers = {}       # camera -> set of asyncio.Queue(maxsize=1)
+        self.workers = [CameraWorker(name, source, config, self._on_result)
+                        for name, source in parse_cameras(config.camera)]
+
+    # Runs on the worker threads
+    def _on_result(self, camera, sequence, timestamp, hands, pose):
+        if self.loop is not None and self.subscribers.get(camera):
+            message = landmarks_message(camera, sequence, timestamp, hands, pose)
+            self.loop.call_soon_threadsafe(self._fan_out, camera, message)
+
+    def _fan_out(self, camera, message):
+        for queue in self.subscribers.get(camera, ()):
+            # Latest wins: a slow subscriber skips frames instead of queueing them
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(message)
+
+    def stats(self):
+        return {worker.name: {"fps": round(worker.fps, 1), "inference_ms": round(worker.inference_ms, 1),
+                              "frames": worker.frames, "error": worker.error,
+                              "socket_subscribers": len(self.subscribers.get(worker.name, ()))}
+                for worker in self.workers}
+
+    async def handle_client(self, reader, writer):
+        try:
+            while True:
+                message = await read_message(reader)
+                if message is None:
+                    break
+                kind = message.get("type")
+                if kind == "cameras":
+                    await send_message(writer, {"type": "cameras",
+                                                "cameras": [w.describe() for w in self.workers if w.writer]})
+                elif kind == "stats":
+                    await send_message(writer, {"type": "stats", "cameras": self.stats()})
+                elif kind == "subscribe":
+                    await self.stream(writer, message.get("camera"))
+                    break
+                else:
+                    await send_message(writer, {"type": "error", "error": f"unknown request {kind!r}"})
+        except (ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def stream(self, writer, camera):
+        if camera not in {w.name for w in self.workers}:
+            await send_message(writer, {"type": "error", "error": f"unknown camera {camera!r}"})
+            return
+        queue = asyncio.Queue(maxsize=1)
+        self.subscribers.setdefault(camera, set()).add(queue)
+        try:
+            while True:
+                await send_message(writer, await queue.get())
+        finally:
+            self.subscribers[camera].discard(queue)
+
+    async def report(self, interval):
+        while True:
+            await asyncio.sleep(interval)
+            line = " | ".join(f"{name}: {s['fps']:.1f} FPS, {s['inference_ms']:.1f} ms"
+                              for name, s in self.stats().items())
+            print(f"[SERVER] {line}")
+
+    async def serve(self):
+        self.loop = asyncio.get_running_loop()
+        for worker in self.workers:
+            worker.start()
+        # Segments are sized from the first frame; list cameras only once they exist
+        for worker in self.workers:
+            await self.loop.run_in_executor(None, worker.ready.wait, 10.0)
+
+        server = await asyncio.start_server(self.handle_client, self.config.host, self.config.port)
+        print(f"[SERVER] Listening on {self.config.host}:{self.config.port}")
+        background = [asyncio.ensure_future(self.report(self.config.report_interval))] \
+            if self.config.report_interval else []
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            for task in background:
+                task.cancel()
+
+    def stop(self):
+        for worker in self.workers:
+            worker.stop()
+        for worker in self.workers:
+            worker.join(timeout=2.0)
+
+
+def parse_cameras(specs):
+    """'0', 'video.mp4' or 'name=source' -> [(name, source)]; numeric sources are camera indices."""
+    cameras = []
+    for i, spec in enumerate(specs or ["0"]):
+        name, _, source = spec.rpartition("=")
+        cameras.append((name or f"cam{i}", int(source) if source.isdigit() else source))
+    return cameras
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Shared MediaPipe inference daemon for the camera demos")
+    parser.add_argument("--camera", action="append", help="camera index, video file or name=source (repeatable)")
+    parser.add_argument("--models", nargs="+", choices=["hands", "pose"], default=["hands"])
+    parser.add_argument("--complexity", type=int, choices=[0, 1], default=0, help="MediaPipe model complexity")
+    parser.add_argument("--width", type=int, default=1280)
+    parser.add_argument("--height", type=int, default=720)
+    parser.add_argument("--fps", type=int, default=30)
+    parser.add_argument("--mirror", action="store_true", help="publish mirrored (selfie) frames")
+    parser.add_argument("--no-frames", dest="publish_frames", action="store_false",
+                        help="publish landmarks only, not the frames")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--report-interval", type=float, default=10.0)
+    config = parser.parse_args()
+
+    server = InferenceServer(config)
+    try:
+        asyncio.run(server.serve())
+    except KeyboardInterrupt:
+        print("\n[SERVER] Stopped")
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
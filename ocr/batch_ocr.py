@@ -0,0 +1,161 @@
+# batch_ocr.py
+import argparse
+import json
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import cv2
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp", ".tif", ".tiff")
+PLATE_CASCADE = cv2.data.haarcascades + "haarcascade_russian_plate_number.xml"
+
+# Per-process state, built once by the pool initializer
+_reader = None
+_plate_detector = None
+
+
+def _init_worker(languages, gpu, plate_crop, threads):
+    """Builds the (expensive) easyocr.Reader once per worker process."""
+    global _reader, _plate_detector
+    import easyocr
+    import torch
+
+    if threads:
+        torch.set_num_threads(threads)
+    cv2.setNumThreads(1)
+    _reader = easyocr.Reader(languages, gpu=gpu, verbose=False)
+    _plate_detector = cv2.CascadeClassifier(PLATE_CASCADE) if plate_crop else None
+
+
+def find_plates(gray, detector, padding=0.15):
+    """Candidate plate regions as (x0, y0, x1, y1), padded so no characters are cut off."""
+    height, width = gray.shape[:2]
+    regions = []
+    for (x, y, w, h) in detector.detectMultiScale(gray, scaleFactor=1.1, minNeighbors=4, minSize=(40, 12)):
+        pad_x, pad_y = int(w * padding), int(h * padding)
+        regions.append((max(0, x - pad_x), max(0, y - pad_y), min(width, x + w + pad_x), min(height, y + h + pad_y)))
+    return regions
+
+
+def ocr_image(path):
+    """Runs OCR on one image (inside a worker). Returns a JSON-serializable record."""
+    start = time.perf_counter()
+    image = cv2.imread(path)
+    if image is None:
+        return {"path": path, "error": "could not read image"}
+
+    regions = []
+    if _plate_detector is not None:
+        regions = find_plates(cv2.cvtColor(image, cv2.COLOR_BGR2GRAY), _plate_detector)
+    if not regions:
+        # No plate found (or pre-cropping disabled): read the whole image
+        regions = [(0, 0, image.shape[1], image.shape[0])]
+
+    results = []
+    for x0, y0, x1, y1 in regions:
+        for box, text, score in _reader.readtext(image[y0:y1, x0:x1]):
+            # Boxes back in full-image coordinates
+            results.append({"text": text, "score": float(score),
+                            "box": [[int(px) + x0, int(py) + y0] for px, py in box]})
+    return {"path": path, "regions": [list(map(int, r)) for r in regions], "results": results,
+            "seconds": round(time.perf_counter() - start, 4)}
+
+
+def iter_images(inputs):
+    """Yields image paths lazily so huge folders start processing immediately."""
+    for item in inputs:
+        if os.path.isdir(item):
+            for root, _, files in os.walk(item):
+                for name in sorted(files):
+                    if name.lower().endswith(IMAGE_EXTENSIONS):
+                        yield os.path.join(root, name)
+        else:
+            yield item
+
+
+def run_batch(inputs, output, workers=2, queue_size=None, languages=("en",), gpu=False, plate_crop=False,
+              threads=None, max_restarts=10):
+    """
+    Streams images through a pool of OCR workers and writes one JSON line per image.
+    At most queue_size images are queued or in flight, so memory stays flat however
+    large the input folder is. Lines are written in completion order.
+
+    If a worker process dies (out of memory, a crash in native code), the images
+    in flight are recorded as errors and a fresh pool takes over the rest of the
+    batch, up to max_restarts times.
+    """
+    queue_size = queue_size or workers * 4
+    slots = threading.BoundedSemaphore(queue_size)
+    write_lock = threading.Lock()
+    stats = {"done": 0, "errors": 0}
+    start = time.time()
+
+    def write(future):
+        try:
+            record = future.result()
+        except Exception as e:  # a crashing image must not stop the batch
+            record = {"path": future.path, "error": repr(e)}
+        with write_lock:
+            output.write(json.dumps(record, ensure_ascii=False) + "\n")
+            stats["done"] += 1
+            stats["errors"] += "error" in record
+            if stats["done"] % 100 == 0:
+                output.flush()
+                print(f"[INFO] {stats['done']} images, {stats['done'] / (time.time() - start):.1f} img/s")
+        slots.release()
+
+    def new_pool():
+        return ProcessPoolExecutor(workers, initializer=_init_worker,
+                                   initargs=(list(languages), gpu, plate_crop, threads))
+
+    pool, restarts = new_pool(), 0
+    try:
+        for path in iter_images(inputs):
+            slots.acquire()
+            while True:
+                try:
+                    future = pool.submit(ocr_image, path)
+                    break
+                except BrokenProcessPool:
+                    # Futures of the dead pool already failed, so write() has recorded them
+                    if restarts == max_restarts:
+                        slots.release()
+                        raise
+                    restarts += 1
+                    print(f"[WARN] a worker process died, restarting the pool ({restarts}/{max_restarts})")
+                    pool.shutdown(wait=True)
+                    pool = new_pool()
+            future.path = path
+            future.add_done_callback(write)
+    finally:
+        pool.shutdown(wait=True)
+    output.flush()
+    return stats["done"], stats["errors"], time.time() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch OCR of image folders to JSONL")
+    parser.add_argument("inputs", nargs="+", help="image files and/or folders")
+    parser.add_argument("--output", default="ocr_results.jsonl")
+    parser.add_argument("--workers", type=int, default=max(1, (os.cpu_count() or 2) // 2),
+                        help="worker processes, each with its own reader")
+    parser.add_argument("--threads", type=int, default=2, help="torch threads per worker")
+    parser.add_argument("--queue-size", type=int, default=None, help="max images queued or in flight")
+    parser.add_argument("--languages", nargs="+", default=["en"])
+    parser.add_argument("--gpu", action="store_true", help="use the GPU (one worker is usually best)")
+    parser.add_argument("--plate-crop", action="store_true",
+                        help="read only licence-plate regions found by a Haar cascade (whole image if none)")
+    args = parser.parse_args()
+
+    with open(args.output, "w", encoding="utf-8") as output:
+        count, errors, elapsed = run_batch(args.inputs, output, args.workers, args.queue_size, args.languages,
+                                           args.gpu, args.plate_crop, args.threads)
+    print(f"[INFO] {count} images ({errors} errors) in {elapsed:.1f}s "
+          f"({count / max(elapsed, 1e-9):.1f} img/s) -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
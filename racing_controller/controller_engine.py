@@ -0,0 +1,192 @@
+# controller_engine.py
+import threading
+import time
+from collections import deque, namedtuple
+
+# Key held for each control, as in car_racing.ipynb
+ACTION_KEYS = {"accelerate": "up", "brake": "down"}
+TURN_KEYS = {"left": "left", "right": "right"}
+
+# What one tracked frame asks the car to do; steer/throttle are analog values in [-1, 1]
+Controls = namedtuple("Controls", ["action", "turn", "debug", "points", "steer", "throttle"],
+                      defaults=(0.0, 0.0))
+
+
+def controls_to_keys(action, turn):
+    """Returns the set of keys that should be held for an action/turn pair."""
+    keys = set()
+    if action in ACTION_KEYS:
+        keys.add(ACTION_KEYS[action])
+    if turn in TURN_KEYS:
+        keys.add(TURN_KEYS[turn])
+    return frozenset(keys)
+
+
+class KeyInjector:
+    """
+    Owns the keyboard on its own thread.
+
+    The tracking thread only submits the set of keys it wants held; the injector
+    diffs it against the keys currently down and sends just the keyUp/keyDown
+    events that changed. Submissions replace each other (latest wins), so a slow
+    key backend never makes the tracker wait and never replays stale frames.
+    """
+
+    def __init__(self, backend=None, history=300):
+        if backend is None:
+            import pydirectinput
+            backend = pydirectinput
+            # pydirectinput sleeps after every call by default, which is pure input lag here
+            backend.PAUSE = 0
+        self.backend = backend
+        self.held = set()
+        self.latencies = deque(maxlen=history)   # frame capture -> key event, seconds
+        self.events_sent = 0
+
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+        self._target = frozenset()
+        self._target_time = None
+        self._running = False
+        self._thread = None
+
+    def apply(self, controls, frame_time):
+        """Output interface used by ControllerEngine."""
+        self.submit(controls_to_keys(controls.action, controls.turn), frame_time)
+
+    def submit(self, keys, frame_time):
+        """Requests that exactly `keys` be held, for the frame captured at frame_time."""
+        with self._lock:
+            if keys == self._target:
+                return
+            self._target = frozenset(keys)
+            self._target_time = frame_time
+            self._changed.notify()
+
+    def start(self):
+        if self._thread is None:
+            self._running = True
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+        return self
+
+    def _run(self):
+        while True:
+            with self._lock:
+                self._changed.wait_for(lambda: self._target != self.held or not self._running)
+                if not self._running:
+                    break
+                target, frame_time = self._target, self._target_time
+
+            # Release first so opposite keys (left/right) are never down together
+            for key in self.held - target:
+                self.backend.keyUp(key)
+                self.events_sent += 1
+            for key in target - self.held:
+                self.backend.keyDown(key)
+                self.events_sent += 1
+            with self._lock:
+                self.held = set(target)
+            if frame_time is not None:
+                self.latencies.append(time.time() - frame_time)
+
+        self.release_all()
+
+    def release_all(self):
+        for key in list(self.held):
+            self.backend.keyUp(key)
+        self.held.clear()
+
+    def latency_stats(self):
+        """Returns (median, 95th percentile, max) input latency in seconds, or None before any event."""
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return (ordered[len(ordered) // 2], ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))],
+                ordered[-1])
+
+    def stop(self):
+        with self._lock:
+            self._running = False
+            self._changed.notify()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+        else:
+            self.release_all()
+
+
+class ControllerEngine:
+    """
+    Runs the racing controller as a pipeline of threads:
+
+        camera reader -> tracking (interpreter) -> output (keys or gamepad)
+
+    The interpreter is any callable taking a BGR frame and returning Controls; the
+    output is a KeyInjector or a gamepad_output.GamepadOutput (anything with
+    start/apply/stop/latency_stats).
+    Tracking always works on the newest camera frame, and the result is kept
+    for a preview drawn at its own pace on the caller's thread.
+    """
+
+    def __init__(self, capture, interpreter, output):
+        self.capture = capture
+        self.interpreter = interpreter
+        self.output = output
+        self.latest = None           # (frame, Controls) of the last tracked frame
+        self.frames_tracked = 0
+        self.tracking_fps = 0.0
+        self._lock = threading.Lock()
+        self._running = False
+        self._thread = None
+
+    def start(self):
+        self.capture.start()
+        self.output.start()
+        self._running = True
+        self._thread = threading.Thread(target=self._track_loop, daemon=True)
+        self._thread.start()
+        return self
+
+    def _track_loop(self):
+        sequence = 0
+        fps_start, fps_frames = time.time(), 0
+        while self._running and self.capture.running:
+            frame, timestamp, new_sequence = self.capture.latest(after_sequence=sequence)
+            if frame is None or new_sequence == sequence:
+                continue
+            sequence = new_sequence
+            # Video files stamp frames with their stream position; latency needs wall clock
+            frame_time = time.time() if self.capture.is_file else timestamp
+
+            controls = self.interpreter(frame)
+            self.output.apply(controls, frame_time)
+
+            with self._lock:
+                self.latest = (frame, controls)
+            self.frames_tracked += 1
+            fps_frames += 1
+            if time.time() - fps_start >= 1.0:
+                self.tracking_fps = fps_frames / (time.time() - fps_start)
+                fps_start, fps_frames = time.time(), 0
+        self._running = False
+
+    def snapshot(self):
+        """Returns a copy of the last tracked frame and its Controls, or (None, None)."""
+        with self._lock:
+            if self.latest is None:
+                return None, None
+            frame, controls = self.latest
+            return frame.copy(), controls
+
+    @property
+    def running(self):
+        return self._running
+
+    def stop(self):
+        self._running = False
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+        self.output.stop()
+        self.capture.release()
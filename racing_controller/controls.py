@@ -0,0 +1,149 @@
+# controls.py
+import math
+
+import cv2
+import mediapipe as mp
+
+from controller_engine import Controls
+from hand_tracker import AxisFilter, HandTracker, RemoteHandTracker, analog_controls
+
+mp_holistic = mp.solutions.holistic
+mp_hands = mp.solutions.hands
+
+
+class ZoneControls:
+    """
+    Right-hand zones (first controller of car_racing.ipynb): the index fingertip above
+    Y_ACCEL accelerates, the thumb tip below Y_BRAKE brakes, and the index fingertip's
+    third of the frame steers.
+    """
+
+    def __init__(self, y_accel=150, y_brake=300):
+        self.y_accel = y_accel
+        self.y_brake = y_brake
+        self.holistic = mp_holistic.Holistic(min_detection_confidence=0.5, min_tracking_confidence=0.5)
+
+    def __call__(self, frame):
+        height, width, _ = frame.shape
+        results = self.holistic.process(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+        if not results.right_hand_landmarks:
+            return Controls(None, None, "No hand detected", [])
+
+        landmarks = results.right_hand_landmarks.landmark
+        index_tip = landmarks[mp_holistic.HandLandmark.INDEX_FINGER_TIP]
+        thumb_tip = landmarks[mp_holistic.HandLandmark.THUMB_TIP]
+        x_index, y_index = int(index_tip.x * width), int(index_tip.y * height)
+        x_thumb, y_thumb = int(thumb_tip.x * width), int(thumb_tip.y * height)
+
+        if y_index < self.y_accel:
+            action = "accelerate"
+        elif y_thumb > self.y_brake:
+            action = "brake"
+        else:
+            action = None
+
+        third = width // 3
+        if x_index < third:
+            turn = "left"
+        elif x_index > 2 * third:
+            turn = "right"
+        else:
+            turn = None
+
+        debug = f"Index: ({x_index}, {y_index}) | Thumb: ({x_thumb}, {y_thumb})"
+        return Controls(action, turn, debug, [((x_index, y_index), (0, 255, 0)), ((x_thumb, y_thumb), (0, 0, 255))])
+
+    def draw_guides(self, frame):
+        height, width, _ = frame.shape
+        third = width // 3
+        cv2.line(frame, (third, 0), (third, height), (0, 255, 255), 2)
+        cv2.line(frame, (2 * third, 0), (2 * third, height), (0, 255, 255), 2)
+        cv2.line(frame, (0, self.y_accel), (width, self.y_accel), (255, 0, 0), 2)
+        cv2.line(frame, (0, self.y_brake), (width, self.y_brake), (0, 0, 255), 2)
+
+
+class TiltControls:
+    """
+    Open/closed hand and hand tilt (second controller of car_racing.ipynb): thumb and
+    index apart accelerates, pinched brakes, and the wrist -> middle knuckle angle steers.
+    """
+
+    def __init__(self, pinch_threshold=0.1, hands=None):
+        self.pinch_threshold = pinch_threshold
+        # hands: anything with MediaPipe's process(), e.g. an inference_server ServerCapture
+        self.hands = hands or mp_hands.Hands(min_detection_confidence=0.7, min_tracking_confidence=0.7)
+
+    def __call__(self, frame):
+        height, width, _ = frame.shape
+        results = self.hands.process(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+        if not results.multi_hand_landmarks:
+            return Controls(None, None, "No hand detected", [])
+
+        landmarks = results.multi_hand_landmarks[0].landmark
+        thumb_tip = landmarks[mp_hands.HandLandmark.THUMB_TIP]
+        index_tip = landmarks[mp_hands.HandLandmark.INDEX_FINGER_TIP]
+        distance = math.hypot(thumb_tip.x - index_tip.x, thumb_tip.y - index_tip.y)
+        action = "accelerate" if distance > self.pinch_threshold else "brake"
+
+        wrist = landmarks[mp_hands.HandLandmark.WRIST]
+        middle_mcp = landmarks[mp_hands.HandLandmark.MIDDLE_FINGER_MCP]
+        angle = math.degrees(math.atan2(middle_mcp.y - wrist.y, middle_mcp.x - wrist.x))
+        if angle < 0:
+            angle += 180
+
+        if 45 <= angle < 80:
+            turn = "left"
+        elif 100 <= angle < 135:
+            turn = "right"
+        else:
+            turn = None
+
+        points = [((int(lm.x * width), int(lm.y * height)), (0, 255, 0)) for lm in (wrist, middle_mcp, index_tip)]
+        points.append(((int(thumb_tip.x * width), int(thumb_tip.y * height)), (0, 0, 255)))
+        return Controls(action, turn, f"Dist: {distance:.2f} | Angle: {angle:.2f}", points)
+
+    def draw_guides(self, frame):
+        pass
+
+
+class AnalogControls:
+    """
+    Lightweight hand-only controller: HandTracker (steering region + ROI tracking)
+    feeding continuous steer/throttle axes. Keyboard output still needs discrete
+    keys, so the axes are also thresholded into action/turn.
+    """
+
+    def __init__(self, region=(0.4, 0.0, 1.0, 1.0), smoothing=0.6, key_threshold=0.3, hands=None):
+        # With hands (an inference_server ServerCapture) the server's landmarks replace the ROI tracker's model
+        self.tracker = RemoteHandTracker(hands, region=region) if hands else HandTracker(region=region)
+        self.steer = AxisFilter(smoothing)
+        self.throttle = AxisFilter(smoothing)
+        self.key_threshold = key_threshold
+
+    def __call__(self, frame):
+        points = self.tracker.process(frame)
+        if points is None:
+            # Let go of everything rather than keep steering blind
+            self.steer.reset()
+            self.throttle.reset()
+            return Controls(None, None, "No hand detected", [])
+
+        raw_steer, raw_throttle = analog_controls(points)
+        steer, throttle = self.steer.update(raw_steer), self.throttle.update(raw_throttle)
+
+        action = "accelerate" if throttle > self.key_threshold else "brake" if throttle < -self.key_threshold else None
+        turn = "right" if steer > self.key_threshold else "left" if steer < -self.key_threshold else None
+        points_px = [((int(x), int(y)), (0, 255, 0)) for x, y in points[[0, 9, 8]]]
+        points_px.append(((int(points[4][0]), int(points[4][1])), (0, 0, 255)))
+        return Controls(action, turn, f"Steer: {steer:+.2f} | Throttle: {throttle:+.2f}", points_px,
+                        steer, throttle)
+
+    def draw_guides(self, frame):
+        height, width = frame.shape[:2]
+        x0, y0, x1, y1 = self.tracker.region_box(width, height)
+        cv2.rectangle(frame, (x0, y0), (x1 - 1, y1 - 1), (0, 255, 255), 2)
+        roi = self.tracker.roi
+        if roi is not None:
+            cx, cy, side = roi
+            cv2.rectangle(frame, (int(cx - side / 2), int(cy - side / 2)), (int(cx + side / 2), int(cy + side / 2)),
+                          (255, 0, 255), 1)
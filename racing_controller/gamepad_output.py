@@ -0,0 +1,213 @@
+# gamepad_output.py
+import argparse
+import csv
+import math
+import threading
+import time
+from collections import deque
+
+# Axis ranges of an Xbox 360 pad, which games and SDL map without configuration
+STEER_RANGE = (-32768, 32767)
+TRIGGER_RANGE = (0, 255)
+AXES = ("steer", "throttle", "brake")
+
+
+def controls_to_axes(controls):
+    """
+    Returns (steer, throttle, brake): steer in [-1, 1], the pedals in [0, 1].
+    Interpreters without analog output (zones/tilt) are mapped to full deflection.
+    """
+    steer, throttle = controls.steer, controls.throttle
+    if steer == 0.0 and throttle == 0.0:
+        steer = {"left": -1.0, "right": 1.0}.get(controls.turn, 0.0)
+        throttle = {"accelerate": 1.0, "brake": -1.0}.get(controls.action, 0.0)
+    return steer, max(0.0, throttle), max(0.0, -throttle)
+
+
+def _scale(value, low, high, signed):
+    if signed:
+        return int(round(low + (value + 1) / 2 * (high - low)))
+    return int(round(low + value * (high - low)))
+
+
+def axes_to_raw(steer, throttle, brake):
+    """Converts normalized axes to raw device values."""
+    return (_scale(steer, *STEER_RANGE, signed=True), _scale(throttle, *TRIGGER_RANGE, signed=False),
+            _scale(brake, *TRIGGER_RANGE, signed=False))
+
+
+class UinputGamepad:
+    """Virtual Xbox 360-style pad through Linux uinput (needs python-evdev and write access to /dev/uinput)."""
+
+    def __init__(self, name="Gesture Racing Pad"):
+        from evdev import AbsInfo, UInput, ecodes
+
+        self.ecodes = ecodes
+        self.codes = {"steer": ecodes.ABS_X, "throttle": ecodes.ABS_RZ, "brake": ecodes.ABS_Z}
+        capabilities = {
+            # Games only treat the device as a pad if it has the usual buttons
+            ecodes.EV_KEY: [ecodes.BTN_A, ecodes.BTN_B, ecodes.BTN_X, ecodes.BTN_Y, ecodes.BTN_TL, ecodes.BTN_TR,
+                            ecodes.BTN_SELECT, ecodes.BTN_START, ecodes.BTN_MODE],
+            ecodes.EV_ABS: [
+                (ecodes.ABS_X, AbsInfo(0, STEER_RANGE[0], STEER_RANGE[1], 16, 128, 0)),
+                (ecodes.ABS_Y, AbsInfo(0, STEER_RANGE[0], STEER_RANGE[1], 16, 128, 0)),
+                (ecodes.ABS_Z, AbsInfo(0, TRIGGER_RANGE[0], TRIGGER_RANGE[1], 0, 0, 0)),
+                (ecodes.ABS_RZ, AbsInfo(0, TRIGGER_RANGE[0], TRIGGER_RANGE[1], 0, 0, 0)),
+            ],
+        }
+        self.device = UInput(capabilities, name=name, vendor=0x045E, product=0x028E, version=0x110)
+
+    def write_axes(self, changes):
+        """changes maps axis name -> raw value; all are sent as one report."""
+        for axis, value in changes.items():
+            self.device.write(self.ecodes.EV_ABS, self.codes[axis], value)
+        self.device.syn()
+
+    def close(self):
+        self.device.close()
+
+
+class RecordingGamepad:
+    """Headless stand-in for UinputGamepad: records every emitted axis event."""
+
+    def __init__(self):
+        self.events = []   # (time, axis, raw value)
+        self.reports = 0
+
+    def write_axes(self, changes):
+        now = time.time()
+        for axis, value in changes.items():
+            self.events.append((now, axis, value))
+        self.reports += 1
+
+    def save_csv(self, path):
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["time", "axis", "value"])
+            writer.writerows(self.events)
+
+    def close(self):
+        pass
+
+
+class GamepadOutput:
+    """
+    Drives a virtual gamepad from the tracker at a fixed update rate.
+
+    The tracking thread only stores its newest axes (apply); a separate thread
+    writes them to the device every 1/update_rate seconds, and only the axes whose
+    raw value changed. The device therefore sees steady, evenly spaced updates no
+    matter how fast or irregular tracking is.
+    """
+
+    def __init__(self, device=None, update_rate=125.0, history=300):
+        self.device = device if device is not None else UinputGamepad()
+        self.update_rate = update_rate
+        self.latencies = deque(maxlen=history)   # frame capture -> axis event, seconds
+        self.events_sent = 0
+        self.current = dict.fromkeys(AXES, None)  # raw values last written
+
+        self._lock = threading.Lock()
+        self._axes = (0.0, 0.0, 0.0)
+        self._frame_time = None
+        self._running = False
+        self._thread = None
+
+    def apply(self, controls, frame_time):
+        """Output interface used by ControllerEngine."""
+        self.set_axes(*controls_to_axes(controls), frame_time=frame_time)
+
+    def set_axes(self, steer, throttle, brake, frame_time=None):
+        with self._lock:
+            self._axes = (steer, throttle, brake)
+            self._frame_time = frame_time
+
+    def start(self):
+        if self._thread is None:
+            self._running = True
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+        return self
+
+    def _run(self):
+        period = 1.0 / self.update_rate
+        next_tick = time.perf_counter()
+        while self._running:
+            with self._lock:
+                axes, frame_time = self._axes, self._frame_time
+                self._frame_time = None
+            self.write(axes, frame_time)
+
+            # Absolute deadlines, so the rate does not drift with the time spent writing
+            next_tick += period
+            delay = next_tick - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                next_tick = time.perf_counter()
+
+        self.write((0.0, 0.0, 0.0), None)
+
+    def write(self, axes, frame_time=None):
+        """Sends the axes whose raw value changed. Returns the number of axis events."""
+        changes = {axis: raw for axis, raw in zip(AXES, axes_to_raw(*axes)) if self.current[axis] != raw}
+        if not changes:
+            return 0
+        self.device.write_axes(changes)
+        self.current.update(changes)
+        self.events_sent += len(changes)
+        if frame_time is not None:
+            self.latencies.append(time.time() - frame_time)
+        return len(changes)
+
+    def latency_stats(self):
+        """Returns (median, 95th percentile, max) input latency in seconds, or None before any event."""
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return (ordered[len(ordered) // 2], ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))],
+                ordered[-1])
+
+    def stop(self):
+        self._running = False
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+        self.device.close()
+
+
+def self_test(duration=2.0, tracking_fps=30.0, update_rate=125.0):
+    """
+    Feeds a synthetic steering sweep at tracking_fps into a GamepadOutput backed by
+    RecordingGamepad and checks what reached the 'device'.
+    """
+    device = RecordingGamepad()
+    output = GamepadOutput(device, update_rate=update_rate).start()
+    start = time.time()
+    while time.time() - start < duration:
+        t = time.time() - start
+        pedal = math.sin(2 * math.pi * t / duration)
+        output.set_axes(math.sin(2 * math.pi * t), max(0.0, pedal), max(0.0, -pedal), frame_time=time.time())
+        time.sleep(1.0 / tracking_fps)
+    output.stop()
+
+    steer = [value for _, axis, value in device.events if axis == "steer"]
+    print(f"[TEST] {device.reports} reports ({device.reports / duration:.0f}/s at {update_rate:.0f} Hz target), "
+          f"{len(device.events)} axis events")
+    print(f"[TEST] steer range {min(steer)}..{max(steer)}, final values {output.current}")
+    assert min(steer) <= STEER_RANGE[0] + 2000 and max(steer) >= STEER_RANGE[1] - 2000, "steer sweep incomplete"
+    assert output.current == {"steer": 0, "throttle": 0, "brake": 0}, "axes not centered on stop"
+    assert device.reports <= duration * update_rate + 1, "update rate exceeded"
+    return device
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check the gamepad output without a game")
+    parser.add_argument("--duration", type=float, default=2.0)
+    parser.add_argument("--update-rate", type=float, default=125.0)
+    parser.add_argument("--csv", help="save the recorded axis events here")
+    args = parser.parse_args()
+    recorded = self_test(args.duration, update_rate=args.update_rate)
+    if args.csv:
+        recorded.save_csv(args.csv)
+    print("[TEST] OK")
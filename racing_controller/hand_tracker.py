@@ -0,0 +1,163 @@
+# hand_tracker.py
+import math
+
+import cv2
+import mediapipe as mp
+import numpy as np
+
+WRIST, THUMB_TIP, INDEX_TIP, MIDDLE_MCP = 0, 4, 8, 9
+
+
+class HandTracker:
+    """
+    Hand-only tracker tuned for the steering hand.
+
+    Instead of running Holistic (face, pose and both hands) on the full frame:
+    - only mediapipe Hands runs, with the light model and a single hand;
+    - while no hand is known, only the steering region of the frame is searched;
+    - once a hand is found, only a square ROI around it is processed, and that ROI
+      follows the hand with some hysteresis so the model's own frame-to-frame
+      tracking keeps working;
+    - the ROI is warped into one fixed-size preallocated buffer, so the model always
+      sees the same input size and colour conversion touches only that buffer.
+
+    process() returns the 21 landmarks as a (21, 2) array of frame pixel coordinates,
+    or None when no hand is visible.
+    """
+
+    def __init__(self, region=(0.4, 0.0, 1.0, 1.0), input_size=256, margin=0.5, recenter=0.2,
+                 model_complexity=0, min_detection_confidence=0.6, min_tracking_confidence=0.5):
+        self.region = region              # normalized (x0, y0, x1, y1) searched when the hand is lost
+        self.input_size = input_size      # side of the square image given to the model
+        self.margin = margin              # ROI padding around the hand, in hand-box sizes
+        self.recenter = recenter          # ROI moves once the hand drifts this share of its side
+        self.hands = mp.solutions.hands.Hands(max_num_hands=1, model_complexity=model_complexity,
+                                              min_detection_confidence=min_detection_confidence,
+                                              min_tracking_confidence=min_tracking_confidence)
+        self.roi = None                   # (center_x, center_y, side) in frame pixels
+        self._bgr = np.empty((input_size, input_size, 3), np.uint8)
+        self._rgb = np.empty((input_size, input_size, 3), np.uint8)
+
+    def region_box(self, width, height):
+        x0, y0, x1, y1 = self.region
+        return int(x0 * width), int(y0 * height), int(x1 * width), int(y1 * height)
+
+    def _search_roi(self, width, height):
+        x0, y0, x1, y1 = self.region_box(width, height)
+        return (x0 + x1) / 2, (y0 + y1) / 2, max(x1 - x0, y1 - y0)
+
+    def process(self, frame):
+        height, width = frame.shape[:2]
+        cx, cy, side = self.roi or self._search_roi(width, height)
+
+        # Crop and scale the square ROI into the model buffer (borders outside the frame are black)
+        scale = self.input_size / side
+        x0, y0 = cx - side / 2, cy - side / 2
+        warp = np.float32([[scale, 0, -x0 * scale], [0, scale, -y0 * scale]])
+        cv2.warpAffine(frame, warp, (self.input_size, self.input_size), dst=self._bgr,
+                       flags=cv2.INTER_LINEAR, borderMode=cv2.BORDER_CONSTANT)
+        cv2.cvtColor(self._bgr, cv2.COLOR_BGR2RGB, dst=self._rgb)
+        results = self.hands.process(self._rgb)
+
+        if not results.multi_hand_landmarks:
+            self.roi = None
+            return None
+
+        landmarks = results.multi_hand_landmarks[0].landmark
+        points = np.array([(lm.x, lm.y) for lm in landmarks], np.float32) * side + (x0, y0)
+        self._follow(points, width, height)
+        return points
+
+    def _follow(self, points, width, height):
+        (min_x, min_y), (max_x, max_y) = points.min(axis=0), points.max(axis=0)
+        hand_cx, hand_cy = (min_x + max_x) / 2, (min_y + max_y) / 2
+        hand_side = max(max_x - min_x, max_y - min_y, 1.0)
+        target_side = min(hand_side * (1 + 2 * self.margin), max(width, height))
+
+        if self.roi is not None:
+            cx, cy, side = self.roi
+            drift = max(abs(hand_cx - cx), abs(hand_cy - cy)) / side
+            resize = abs(target_side - side) / side
+            if drift < self.recenter and resize < self.recenter:
+                return  # keep the crop still: the model tracks best on a steady image
+        self.roi = (hand_cx, hand_cy, target_side)
+
+    def close(self):
+        self.hands.close()
+
+
+class RemoteHandTracker(HandTracker):
+    """
+    HandTracker over landmarks computed elsewhere: source is an inference_server
+    ServerCapture, whose full-frame results are already shared with other apps.
+    The first hand with its wrist in the steering region is used, and the ROI is
+    only kept for the preview.
+    """
+
+    def __init__(self, source, region=(0.4, 0.0, 1.0, 1.0), margin=0.5, recenter=0.2):
+        # No model of its own, so HandTracker.__init__ is not called
+        self.source = source
+        self.region = region
+        self.margin = margin
+        self.recenter = recenter
+        self.roi = None
+
+    def process(self, frame):
+        height, width = frame.shape[:2]
+        x0, y0, x1, y1 = self.region_box(width, height)
+        for hand in self.source.process(frame).multi_hand_landmarks or []:
+            points = np.array([(lm.x, lm.y) for lm in hand.landmark], np.float32) * (width, height)
+            if x0 <= points[WRIST][0] < x1 and y0 <= points[WRIST][1] < y1:
+                self._follow(points, width, height)
+                return points
+        self.roi = None
+        return None
+
+    def close(self):
+        pass
+
+
+class AxisFilter:
+    """Exponential smoothing for one analog axis (alpha=1 disables it)."""
+
+    def __init__(self, alpha=0.5):
+        self.alpha = alpha
+        self.value = 0.0
+
+    def update(self, value):
+        self.value += self.alpha * (value - self.value)
+        return self.value
+
+    def reset(self):
+        self.value = 0.0
+
+
+def _clamp(value, low=-1.0, high=1.0):
+    return max(low, min(high, value))
+
+
+def _apply_dead_zone(value, dead_zone):
+    if abs(value) <= dead_zone:
+        return 0.0
+    return math.copysign((abs(value) - dead_zone) / (1 - dead_zone), value)
+
+
+def analog_controls(points, max_tilt=40.0, open_ratio=0.75, pinch_ratio=0.15, dead_zone=0.08):
+    """
+    Maps hand landmarks to continuous (steer, throttle) in [-1, 1].
+
+    steer: tilt of the wrist -> middle knuckle line away from vertical, full lock at
+    max_tilt degrees (positive = right, on a mirrored frame).
+    throttle: thumb-index gap relative to hand size, +1 fully open (accelerate)
+    down to -1 pinched (brake), so the same gesture works at any distance from the camera.
+    """
+    wrist, middle_mcp = points[WRIST], points[MIDDLE_MCP]
+    dx, dy = middle_mcp[0] - wrist[0], middle_mcp[1] - wrist[1]
+    tilt = math.degrees(math.atan2(dx, -dy))
+    steer = _apply_dead_zone(_clamp(tilt / max_tilt), dead_zone)
+
+    hand_size = math.hypot(dx, dy) or 1.0
+    gap = math.hypot(*(points[THUMB_TIP] - points[INDEX_TIP])) / hand_size
+    throttle = _clamp(2 * (gap - pinch_ratio) / (open_ratio - pinch_ratio) - 1)
+    throttle = _apply_dead_zone(throttle, dead_zone)
+    return steer, throttle
@@ -0,0 +1,103 @@
+# main.py
+import argparse
+import os
+import sys
+import time
+
+import cv2
+
+from controller_engine import ControllerEngine, KeyInjector
+from controls import AnalogControls, TiltControls, ZoneControls
+from gamepad_output import GamepadOutput, RecordingGamepad, UinputGamepad
+
+# The shared capture module lives in the repository root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from camera_capture import CameraCapture
+
+
+def draw_preview(frame, controls, guides, engine):
+    guides(frame)
+    for point, color in controls.points:
+        cv2.circle(frame, point, 10, color, -1)
+    cv2.putText(frame, controls.debug, (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (200, 255, 200), 2)
+    cv2.putText(frame, f"Action: {controls.action}", (10, 60), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 200, 0), 2)
+    cv2.putText(frame, f"Turn: {controls.turn}", (10, 90), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (200, 200, 255), 2)
+    stats = engine.output.latency_stats()
+    latency = f"{stats[0] * 1000:.0f}/{stats[1] * 1000:.0f} ms" if stats else "-"
+    cv2.putText(frame, f"Tracking: {engine.tracking_fps:.0f} FPS | input lag p50/p95: {latency}", (10, 120),
+                cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Drive a racing game with hand gestures")
+    parser.add_argument("--mode", choices=["analog", "tilt", "zones"], default="analog",
+                        help="analog: ROI-tracked hand with continuous axes; tilt: open/pinch + hand angle "
+                             "(Hands); zones: fingertip zones (Holistic)")
+    parser.add_argument("--output", choices=["keys", "gamepad", "record"], default="keys",
+                        help="keys: arrow keys (pydirectinput); gamepad: virtual analog pad (uinput, Linux); "
+                             "record: log the gamepad axes without a device")
+    parser.add_argument("--update-rate", type=float, default=125.0, help="gamepad reports per second")
+    parser.add_argument("--record-csv", default="gamepad_events.csv", help="where --output record saves events")
+    parser.add_argument("--source", default="0", help="camera index or video file")
+    parser.add_argument("--server", metavar="CAMERA", default=None,
+                        help="use frames and hand landmarks of this inference_server camera instead of "
+                             "opening the camera and running the model here (analog and tilt modes)")
+    parser.add_argument("--headless", action="store_true", help="no preview window (stop with Ctrl+C)")
+    parser.add_argument("--preview-fps", type=float, default=15.0)
+    args = parser.parse_args()
+
+    # A deeper ring keeps the previewed frame intact while tracking moves on
+    if args.server:
+        if args.mode == "zones":
+            parser.error("--server serves Hands landmarks; zones mode needs Holistic")
+        sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                     "inference_server"))
+        from client import ServerCapture
+        capture = ServerCapture(args.server, mirror=True, ring_size=8)
+        interpreter = AnalogControls(hands=capture) if args.mode == "analog" else TiltControls(hands=capture)
+    else:
+        source = int(args.source) if args.source.isdigit() else args.source
+        capture = CameraCapture(source, width=640, height=480, mirror=True, ring_size=8)
+        interpreters = {"analog": AnalogControls, "tilt": TiltControls, "zones": ZoneControls}
+        interpreter = interpreters[args.mode]()
+    print(f"[INFO] {capture.describe()}")
+    if args.output == "keys":
+        output = KeyInjector()
+    else:
+        device = UinputGamepad() if args.output == "gamepad" else RecordingGamepad()
+        output = GamepadOutput(device, update_rate=args.update_rate)
+    engine = ControllerEngine(capture, interpreter, output).start()
+
+    last_report = time.time()
+    try:
+        while engine.running:
+            if args.headless:
+                time.sleep(1.0)
+            else:
+                frame, controls = engine.snapshot()
+                if frame is not None:
+                    draw_preview(frame, controls, interpreter.draw_guides, engine)
+                    cv2.imshow("Hand Control for Racing Game", frame)
+                if cv2.waitKey(max(1, int(1000 / args.preview_fps))) & 0xFF == ord('q'):
+                    break
+
+            if time.time() - last_report >= 5.0:
+                stats = engine.output.latency_stats()
+                if stats:
+                    print(f"[INFO] tracking {engine.tracking_fps:.1f} FPS | events {engine.output.events_sent} "
+                          f"| capture->output p50 {stats[0] * 1000:.1f} ms, p95 {stats[1] * 1000:.1f} ms, "
+                          f"max {stats[2] * 1000:.1f} ms")
+                last_report = time.time()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        # Stopping the output releases every key still held / centers the pad
+        engine.stop()
+        if args.output == "record":
+            output.device.save_csv(args.record_csv)
+            print(f"[INFO] Saved {len(output.device.events)} axis events to {args.record_csv}")
+        cv2.destroyAllWindows()
+
+
+if __name__ == "__main__":
+    main()
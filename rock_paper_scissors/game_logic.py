@@ -0,0 +1,60 @@
+# game_logic.py
+import os
+import random
+
+# Rock, Paper, Scissors labels
+rps_gestures = {
+    "rock": [0, 0, 0, 0, 0],
+    "paper": [1, 1, 1, 1, 1],
+    "scissors": [0, 1, 1, 0, 0]
+}
+
+# Simple finger state detector
+def get_finger_states(landmarks):
+    finger_states = []
+    finger_states.append(int(landmarks[4].x > landmarks[3].x))
+
+    tips = [8, 12, 16, 20]
+    pip_joints = [6, 10, 14, 18]
+
+    for tip, pip in zip(tips, pip_joints):
+        finger_states.append(int(landmarks[tip].y < landmarks[pip].y))
+
+    return finger_states
+
+# Compare gesture to known ones
+def classify_gesture(states):
+    for gesture, pattern in rps_gestures.items():
+        if states == pattern:
+            return gesture
+    return "unknown"
+
+# Learned classifier (train with record_landmarks.py + train_gesture_model.py).
+# Falls back to the finger-state rules when no model file is present.
+MODEL_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "gesture_model.npz")
+CONFIDENCE_THRESHOLD = 0.7
+gesture_model = None
+if os.path.isfile(MODEL_PATH):
+    from gesture_model import GestureClassifier
+    gesture_model = GestureClassifier.load(MODEL_PATH)
+
+def detect_move(landmarks):
+    if gesture_model is None:
+        return classify_gesture(get_finger_states(landmarks))
+    label, _ = gesture_model.classify(landmarks, CONFIDENCE_THRESHOLD)
+    return label if label in rps_gestures else "unknown"
+
+# Get computer move
+def get_computer_move():
+    return random.choice(["rock", "paper", "scissors"])
+
+# Decide winner
+def get_winner(player, computer):
+    if player == computer:
+        return "Draw"
+    elif (player == "rock" and computer == "scissors") or \
+         (player == "scissors" and computer == "paper") or \
+         (player == "paper" and computer == "rock"):
+        return "You Win!"
+    else:
+        return "Computer Wins!"
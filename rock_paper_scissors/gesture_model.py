@@ -0,0 +1,117 @@
+# gesture_model.py
+import numpy as np
+
+# Landmark indices (MediaPipe hand model)
+WRIST = 0
+INDEX_MCP = 5
+MIDDLE_MCP = 9
+PINKY_MCP = 17
+NUM_LANDMARKS = 21
+
+GESTURES = ["rock", "paper", "scissors"]
+
+
+def landmarks_to_array(landmarks):
+    """Converts MediaPipe landmarks (objects with .x/.y/.z) or a 21x3 sequence to a float array."""
+    if hasattr(landmarks[0], "x"):
+        return np.array([[lm.x, lm.y, lm.z] for lm in landmarks], dtype=np.float32)
+    return np.asarray(landmarks, dtype=np.float32).reshape(NUM_LANDMARKS, 3)
+
+
+def normalize_landmarks(points):
+    """
+    Makes a hand pose independent of where it is in the frame, how big it is and
+    which hand is used: moves the wrist to the origin, divides by the wrist to
+    middle-finger MCP distance and mirrors left hands onto right hands.
+    Works on a single hand (21, 3) or a batch (N, 21, 3). Returns flat feature vectors.
+    """
+    pts = np.asarray(points, dtype=np.float32)
+    single = pts.ndim == 2
+    if single:
+        pts = pts[None]
+
+    pts = pts - pts[:, WRIST:WRIST + 1]
+    scale = np.linalg.norm(pts[:, MIDDLE_MCP, :2], axis=1)
+    pts = pts / np.maximum(scale, 1e-6)[:, None, None]
+
+    # Mirror so the index MCP is always on the same side of the pinky MCP
+    mirrored = pts[:, INDEX_MCP, 0] < pts[:, PINKY_MCP, 0]
+    pts[mirrored, :, 0] *= -1
+
+    features = pts.reshape(len(pts), -1)
+    return features[0] if single else features
+
+
+class GestureClassifier:
+    """
+    Multinomial logistic regression on normalized landmark vectors.
+    Inference is a single matrix product in NumPy, so it adds no measurable cost per frame.
+    """
+
+    def __init__(self, labels=None, weights=None, bias=None, mean=None, std=None):
+        self.labels = list(labels) if labels is not None else []
+        self.weights = weights
+        self.bias = bias
+        self.mean = mean
+        self.std = std
+
+    def fit(self, features, targets, epochs=500, learning_rate=0.5, l2=1e-3):
+        """
+        Trains on feature vectors (N, D) and string targets (N,) with full-batch gradient descent.
+        Returns the list of training losses, one per epoch.
+        """
+        features = np.asarray(features, dtype=np.float32)
+        self.labels = sorted(set(targets))
+        index = {label: i for i, label in enumerate(self.labels)}
+        y = np.array([index[t] for t in targets])
+        one_hot = np.eye(len(self.labels), dtype=np.float32)[y]
+
+        self.mean = features.mean(axis=0)
+        self.std = features.std(axis=0) + 1e-6
+        x = (features - self.mean) / self.std
+
+        n, d = x.shape
+        self.weights = np.zeros((d, len(self.labels)), dtype=np.float32)
+        self.bias = np.zeros(len(self.labels), dtype=np.float32)
+
+        losses = []
+        for _ in range(epochs):
+            probs = self._softmax(x @ self.weights + self.bias)
+            losses.append(float(-np.log(probs[np.arange(n), y] + 1e-9).mean()))
+            grad = (probs - one_hot) / n
+            self.weights -= learning_rate * (x.T @ grad + l2 * self.weights)
+            self.bias -= learning_rate * grad.sum(axis=0)
+        return losses
+
+    @staticmethod
+    def _softmax(logits):
+        logits = logits - logits.max(axis=-1, keepdims=True)
+        exp = np.exp(logits)
+        return exp / exp.sum(axis=-1, keepdims=True)
+
+    def predict_proba(self, features):
+        """Class probabilities for one feature vector (D,) or a batch (N, D)."""
+        x = (np.asarray(features, dtype=np.float32) - self.mean) / self.std
+        return self._softmax(x @ self.weights + self.bias)
+
+    def classify(self, landmarks, threshold=0.7):
+        """
+        Classifies one hand. Returns (label, confidence); the label is "unknown"
+        when the most likely class is below the confidence threshold.
+        """
+        probs = self.predict_proba(normalize_landmarks(landmarks_to_array(landmarks)))
+        best = int(np.argmax(probs))
+        confidence = float(probs[best])
+        if confidence < threshold:
+            return "unknown", confidence
+        return self.labels[best], confidence
+
+    def save(self, path):
+        np.savez(path, labels=np.array(self.labels), weights=self.weights, bias=self.bias,
+                 mean=self.mean, std=self.std)
+
+    @classmethod
+    def load(cls, path):
+        data = np.load(path)
+        return cls(labels=[str(label) for label in data["labels"]], weights=data["weights"],
+                   bias=data["bias"], mean=data["mean"], std=data["std"])
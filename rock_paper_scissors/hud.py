@@ -0,0 +1,178 @@
+# hud.py
+import os
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+
+# Candidate fonts, first existing one wins (Windows, Linux, macOS)
+TEXT_FONTS = [
+    "C:/Windows/Fonts/segoeui.ttf",
+    "C:/Windows/Fonts/arial.ttf",
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+    "/usr/share/fonts/TTF/DejaVuSans.ttf",
+    "/System/Library/Fonts/Helvetica.ttc",
+]
+EMOJI_FONTS = [
+    "C:/Windows/Fonts/seguiemj.ttf",
+    "/usr/share/fonts/truetype/noto/NotoColorEmoji.ttf",
+    "/usr/share/fonts/noto/NotoColorEmoji.ttf",
+    "/System/Library/Fonts/Apple Color Emoji.ttc",
+]
+# Bitmap colour-emoji fonts (Noto) only exist at this size; glyphs are scaled afterwards
+BITMAP_EMOJI_SIZE = 109
+
+
+def _first_existing(paths):
+    for path in paths:
+        if os.path.isfile(path):
+            return path
+    return None
+
+
+def _is_emoji(char):
+    code = ord(char)
+    return code >= 0x1F000 or 0x2300 <= code <= 0x27BF or code in (0xFE0F, 0x200D)
+
+
+def _split_runs(text):
+    """Splits text into (is_emoji, run) pieces so each run can use the right font."""
+    runs = []
+    for char in text:
+        emoji = _is_emoji(char)
+        if runs and runs[-1][0] == emoji:
+            runs[-1][1] += char
+        else:
+            runs.append([emoji, char])
+    return runs
+
+
+class HudRenderer:
+    """
+    Draws HUD text (including emoji, which cv2.putText cannot render) on video frames.
+
+    Text is rasterized once with a real font rasterizer (FreeType via Pillow) and kept
+    as premultiplied sprites keyed by content, size and colour. Whole HUD layouts are
+    cached too, so while the score and result stay the same each frame costs only
+    one alpha blend of a ready-made layer.
+    """
+
+    def __init__(self, text_font=None, emoji_font=None, max_sprites=256):
+        self.text_font_path = text_font or _first_existing(TEXT_FONTS)
+        self.emoji_font_path = emoji_font or _first_existing(EMOJI_FONTS)
+        self.max_sprites = max_sprites
+        self._fonts = {}
+        self._sprites = {}
+        self._layouts = {}
+
+    # --- Rasterization ---
+    def _font(self, emoji, size):
+        key = (emoji, size)
+        if key not in self._fonts:
+            path = self.emoji_font_path if emoji else self.text_font_path
+            font = None
+            if path:
+                try:
+                    font = ImageFont.truetype(path, size)
+                except OSError:
+                    if emoji:
+                        # Bitmap emoji fonts refuse any other size
+                        font = ImageFont.truetype(path, BITMAP_EMOJI_SIZE)
+            self._fonts[key] = font or ImageFont.load_default()
+        return self._fonts[key]
+
+    def _render_run(self, text, emoji, size, color):
+        """Rasterizes one run of text to an RGBA image."""
+        font = self._font(emoji, size)
+        left, top, right, bottom = font.getbbox(text)
+        if emoji:
+            # Tight box around the glyphs, scaled to the requested size
+            image = Image.new("RGBA", (max(1, right - left), max(1, bottom - top)), (0, 0, 0, 0))
+            ImageDraw.Draw(image).text((-left, -top), text, font=font, embedded_color=True)
+            if image.height != size:
+                width = max(1, round(image.width * size / image.height))
+                image = image.resize((width, size), Image.LANCZOS)
+            return image
+
+        # Full line height so runs of different letters share a baseline
+        ascent, descent = font.getmetrics()
+        image = Image.new("RGBA", (max(1, right - left), ascent + descent), (0, 0, 0, 0))
+        ImageDraw.Draw(image).text((-left, 0), text, font=font, fill=color + (255,))
+        return image
+
+    def sprite(self, text, size, color):
+        """
+        Returns the cached (premultiplied BGR uint16, inverse alpha uint16) sprite for a
+        line of text. color is BGR, like the rest of OpenCV.
+        """
+        key = (text, size, color)
+        cached = self._sprites.get(key)
+        if cached is not None:
+            return cached
+
+        rgb = (color[2], color[1], color[0])
+        runs = [self._render_run(run, emoji, size, rgb) for emoji, run in _split_runs(text)]
+        height = max(run.height for run in runs)
+        spacing = max(1, size // 4)
+        line = Image.new("RGBA", (sum(run.width for run in runs) + spacing * (len(runs) - 1), height),
+                         (0, 0, 0, 0))
+        x = 0
+        for run in runs:
+            line.alpha_composite(run, (x, height - run.height))
+            x += run.width + spacing
+
+        rgba = np.asarray(line, dtype=np.uint16)
+        alpha = rgba[:, :, 3:4]
+        premultiplied = rgba[:, :, 2::-1] * alpha  # RGB -> BGR, times alpha
+        cached = (premultiplied, 255 - alpha)
+
+        if len(self._sprites) >= self.max_sprites:
+            self._sprites.pop(next(iter(self._sprites)))
+        self._sprites[key] = cached
+        return cached
+
+    def layout(self, lines):
+        """
+        Composes several lines into one cached layer.
+        lines is a sequence of (text, size, bgr_color, (x, y)) with (x, y) the top-left corner.
+        Returns (origin, premultiplied, inverse_alpha) covering the bounding box of all lines.
+        """
+        key = tuple(lines)
+        cached = self._layouts.get(key)
+        if cached is not None:
+            return cached
+
+        sprites = [(self.sprite(text, size, color), pos) for text, size, color, pos in lines]
+        x0 = min(pos[0] for _, pos in sprites)
+        y0 = min(pos[1] for _, pos in sprites)
+        x1 = max(pos[0] + s[0].shape[1] for s, pos in sprites)
+        y1 = max(pos[1] + s[0].shape[0] for s, pos in sprites)
+
+        premultiplied = np.zeros((y1 - y0, x1 - x0, 3), np.uint16)
+        inverse_alpha = np.full((y1 - y0, x1 - x0, 1), 255, np.uint16)
+        for (sprite_color, sprite_inverse), (x, y) in sprites:
+            h, w = sprite_color.shape[:2]
+            region = (slice(y - y0, y - y0 + h), slice(x - x0, x - x0 + w))
+            # "Over" compositing of premultiplied sprites; the product needs more than 16 bits
+            premultiplied[region] = sprite_color + premultiplied[region].astype(np.uint32) * sprite_inverse // 255
+            inverse_alpha[region] = inverse_alpha[region] * sprite_inverse // 255
+
+        if len(self._layouts) >= self.max_sprites:
+            self._layouts.pop(next(iter(self._layouts)))
+        cached = ((x0, y0), premultiplied, inverse_alpha)
+        self._layouts[key] = cached
+        return cached
+
+    # --- Blitting ---
+    def draw(self, frame, lines):
+        """Alpha-blends the (cached) layout for lines onto a BGR frame in place."""
+        if not lines:
+            return frame
+        (x, y), premultiplied, inverse_alpha = self.layout(lines)
+        fh, fw = frame.shape[:2]
+        h = min(premultiplied.shape[0], fh - y)
+        w = min(premultiplied.shape[1], fw - x)
+        if h <= 0 or w <= 0:
+            return frame
+        roi = frame[y:y + h, x:x + w]
+        roi[:] = (premultiplied[:h, :w] + roi * inverse_alpha[:h, :w]) // 255
+        return frame
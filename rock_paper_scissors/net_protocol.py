@@ -0,0 +1,58 @@
+# net_protocol.py
+import asyncio
+import json
+import time
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+
+async def send_message(writer, message):
+    """Sends one message as a line of JSON."""
+    writer.write((json.dumps(message) + "\n").encode("utf-8"))
+    await writer.drain()
+
+
+async def read_message(reader):
+    """Reads one JSON line. Returns None when the connection is closed."""
+    line = await reader.readline()
+    if not line:
+        return None
+    return json.loads(line)
+
+
+class ClockSync:
+    """
+    Estimates the offset between this machine's clock and the server's from
+    ping/pong round trips (NTP-style: the sample with the smallest round-trip
+    time is the most trustworthy).
+    """
+
+    def __init__(self):
+        self.offset = 0.0       # server_time - local_time
+        self.rtt = float("inf")
+
+    def add_sample(self, sent, server_time, received):
+        rtt = received - sent
+        if rtt < self.rtt:
+            self.rtt = rtt
+            self.offset = server_time - (sent + received) / 2
+
+    def to_server(self, local_time):
+        return local_time + self.offset
+
+    def to_local(self, server_time):
+        return server_time - self.offset
+
+
+async def sync_clock(reader, writer, clock, samples=5, interval=0.05):
+    """Runs a few ping/pong exchanges on a fresh connection to fill clock."""
+    for _ in range(samples):
+        sent = time.time()
+        await send_message(writer, {"type": "ping", "client_time": sent})
+        reply = await read_message(reader)
+        if reply is None or reply.get("type") != "pong":
+            raise ConnectionError("Server did not answer the clock sync")
+        clock.add_sample(reply["client_time"], reply["server_time"], time.time())
+        await asyncio.sleep(interval)
+    return clock
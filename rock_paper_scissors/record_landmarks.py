@@ -0,0 +1,66 @@
+# record_landmarks.py
+import argparse
+import csv
+import os
+import sys
+
+import cv2
+import mediapipe as mp
+
+# The shared capture module lives in the repository root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from camera_capture import CameraCapture
+
+# Keys to hold while showing a gesture; "none" collects hands that are not a valid move
+LABEL_KEYS = {ord('r'): "rock", ord('p'): "paper", ord('s'): "scissors", ord('n'): "none"}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record labelled hand landmarks for the RPS gesture model")
+    parser.add_argument("--output", default="gesture_samples.csv", help="CSV file to append samples to")
+    args = parser.parse_args()
+
+    hands = mp.solutions.hands.Hands(max_num_hands=1)
+    mp_drawing = mp.solutions.drawing_utils
+    cap = CameraCapture(0, mirror=True)
+
+    new_file = not os.path.isfile(args.output)
+    counts = {}
+    with open(args.output, "a", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        if new_file:
+            writer.writerow(["label"] + [f"{axis}{i}" for i in range(21) for axis in "xyz"])
+
+        print("[INFO] Hold R / P / S (or N for 'none') while showing a gesture. Press Q to quit.")
+        key = -1
+        while True:
+            ok, frame, _ = cap.read()
+            if not ok:
+                break
+
+            results = hands.process(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+            label = LABEL_KEYS.get(key)
+            if results.multi_hand_landmarks:
+                hand_landmarks = results.multi_hand_landmarks[0]
+                mp_drawing.draw_landmarks(frame, hand_landmarks, mp.solutions.hands.HAND_CONNECTIONS)
+                if label:
+                    writer.writerow([label] + [round(v, 5) for lm in hand_landmarks.landmark
+                                               for v in (lm.x, lm.y, lm.z)])
+                    counts[label] = counts.get(label, 0) + 1
+
+            summary = "  ".join(f"{name}: {n}" for name, n in sorted(counts.items())) or "no samples yet"
+            cv2.putText(frame, f"Recording: {label or '-'}", (10, 40), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 255), 2)
+            cv2.putText(frame, summary, (10, 80), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
+            cv2.imshow("Record Gestures", frame)
+
+            key = cv2.waitKey(1) & 0xFF
+            if key == ord('q'):
+                break
+
+    print(f"[INFO] Samples written to {args.output}: {counts}")
+    cap.release()
+    cv2.destroyAllWindows()
+
+
+if __name__ == "__main__":
+    main()
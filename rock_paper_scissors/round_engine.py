@@ -0,0 +1,123 @@
+# round_engine.py
+import math
+from collections import Counter, deque
+
+VALID_MOVES = ("rock", "paper", "scissors")
+
+
+class RoundDecision:
+    """The outcome of the voting for one round."""
+
+    def __init__(self, move, votes, total_votes, shoot_time, throw_time, decision_time):
+        self.move = move
+        self.votes = votes                  # frames that voted for the winning move
+        self.total_votes = total_votes      # valid votes in the window when the decision was made
+        self.shoot_time = shoot_time        # when the countdown said "Shoot!"
+        self.throw_time = throw_time        # first frame showing a valid move after the shoot
+        self.decision_time = decision_time
+
+    @property
+    def latency(self):
+        """Seconds from the throw being visible to the decision."""
+        return self.decision_time - self.throw_time
+
+    @property
+    def reaction_time(self):
+        """Seconds from the shoot signal to the player's throw."""
+        return self.throw_time - self.shoot_time
+
+
+class RoundEngine:
+    """
+    Drives a round: countdown -> throw -> result.
+
+    Once the countdown ends, every classified frame is a vote. The round is decided
+    as soon as one move holds a clear majority of the votes inside a short sliding
+    window, so a single misclassified frame cannot decide a round, and a clean
+    throw resolves within a few frames instead of after a fixed delay.
+
+    At a low frame rate the window cannot hold min_votes frames (3 frames never fit
+    in 0.3 s at 6 FPS), so the requirement is capped at the number of frames the
+    window holds at the measured frame rate.
+    """
+
+    def __init__(self, countdown=3.0, vote_window=0.3, min_votes=3, majority=0.6,
+                 throw_timeout=2.0, result_duration=2.0):
+        self.countdown = countdown              # seconds of "Rock.. Paper.. Scissors.."
+        self.vote_window = vote_window          # seconds of frames considered in a vote
+        self.min_votes = min_votes              # frames the winning move needs inside the window
+        self.majority = majority                # share of the window the winning move needs
+        self.throw_timeout = throw_timeout      # give up on a round with no clear throw after this
+        self.result_duration = result_duration  # seconds the result stays on screen
+        self.state = "idle"
+        self.votes = deque()
+        self.intervals = deque(maxlen=15)       # recent seconds between frames, for the frame rate
+        self.last_frame_time = None
+        self.last_decision = None
+        self.state_start = 0.0
+        self.shoot_time = None
+        self.throw_time = None
+
+    def start_round(self, now):
+        self.state = "countdown"
+        self.state_start = now
+        self.votes.clear()
+        self.shoot_time = None
+        self.throw_time = None
+
+    def required_votes(self):
+        """min_votes, or fewer when the measured frame rate leaves fewer frames in the window."""
+        if not self.intervals:
+            return self.min_votes
+        interval = sorted(self.intervals)[len(self.intervals) // 2]
+        in_window = math.floor(self.vote_window / max(interval, 1e-6) + 1e-6) + 1
+        return max(1, min(self.min_votes, in_window))
+
+    def countdown_remaining(self, now):
+        return max(0.0, self.countdown - (now - self.state_start)) if self.state == "countdown" else 0.0
+
+    def update(self, move, now):
+        """
+        Feeds the classification of one frame ("rock", "paper", "scissors", "unknown",
+        or None when no hand is visible) with its capture timestamp.
+        Returns a RoundDecision on the frame the round is decided, otherwise None.
+        """
+        if self.last_frame_time is not None and now > self.last_frame_time:
+            self.intervals.append(now - self.last_frame_time)
+        self.last_frame_time = now
+        if self.state == "idle":
+            self.start_round(now)
+
+        if self.state == "countdown":
+            if now - self.state_start < self.countdown:
+                return None
+            self.state = "throw"
+            self.state_start = self.shoot_time = now
+
+        if self.state == "result":
+            if now - self.state_start >= self.result_duration:
+                self.start_round(now)
+            return None
+
+        # --- Throw: sliding-window majority vote ---
+        if move in VALID_MOVES and self.throw_time is None:
+            self.throw_time = now
+        self.votes.append((now, move))
+        while self.votes and now - self.votes[0][0] > self.vote_window:
+            self.votes.popleft()
+
+        counts = Counter(m for _, m in self.votes if m in VALID_MOVES)
+        if counts:
+            winner, count = counts.most_common(1)[0]
+            # Frames without a hand or with an unsure classification abstain
+            if count >= self.required_votes() and count / sum(counts.values()) >= self.majority:
+                self.last_decision = RoundDecision(winner, count, sum(counts.values()), self.shoot_time,
+                                                   self.throw_time, now)
+                self.state = "result"
+                self.state_start = now
+                return self.last_decision
+
+        if now - self.shoot_time > self.throw_timeout:
+            # Nobody threw a clear move: start over
+            self.start_round(now)
+        return None
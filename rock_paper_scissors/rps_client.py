@@ -0,0 +1,224 @@
+# rps_client.py
+import argparse
+import asyncio
+import os
+import random
+import sys
+import threading
+import time
+
+from net_protocol import DEFAULT_HOST, DEFAULT_PORT, ClockSync, read_message, send_message, sync_clock
+
+
+class RpsClient:
+    """
+    Connection to rps_server.py: clock sync, matchmaking and throws.
+    Round state is kept behind a lock so a camera loop on another thread can read it.
+    """
+
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT, name="player"):
+        self.host = host
+        self.port = port
+        self.name = name
+        self.clock = ClockSync()
+        self.reader = None
+        self.writer = None
+
+        self.lock = threading.Lock()
+        self.opponent = None
+        self.round = None          # (round number, shoot time in local clock, throw window)
+        self.last_result = None
+        self.match_over = None
+        self.score = [0, 0]
+
+    async def connect(self):
+        self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        await send_message(self.writer, {"type": "hello", "name": self.name})
+        await sync_clock(self.reader, self.writer, self.clock)
+        await self.ready()
+
+    async def ready(self):
+        """Joins the matchmaking queue."""
+        await send_message(self.writer, {"type": "ready", "rtt": self.clock.rtt})
+
+    async def throw(self, round_number, move, local_time):
+        """Sends a move stamped with the (server clock) time it was seen on camera."""
+        await send_message(self.writer, {"type": "throw", "round": round_number, "move": move,
+                                         "throw_time": self.clock.to_server(local_time)})
+
+    async def next_message(self):
+        """Reads one server message and updates the shared round state."""
+        message = await read_message(self.reader)
+        if message is None:
+            return None
+        kind = message.get("type")
+        with self.lock:
+            if kind == "matched":
+                self.opponent = message["opponent"]
+                self.match_over = None
+                self.last_result = None
+                self.score = [0, 0]
+            elif kind == "round":
+                self.round = (message["round"], self.clock.to_local(message["shoot_at"]), message["window"])
+            elif kind == "result":
+                self.last_result = message
+                self.score = message["score"]
+            elif kind == "match_over":
+                self.match_over = message
+                self.round = None
+        return message
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except ConnectionError:
+                pass
+
+
+# --- Simulated Player (used by rps_loadtest.py) ---
+async def simulated_player(host, port, name, matches=1, stats=None, reaction=(0.15, 0.4), rng=None):
+    """
+    Plays `matches` matches with random moves and human-like reaction times.
+    If stats is a dict, appends result latencies (seconds from sending this player's
+    throw to receiving the round result) to stats["latencies"].
+    """
+    rng = rng or random.Random()
+    client = RpsClient(host, port, name)
+    await client.connect()
+    played = 0
+    sent_at = None
+    try:
+        while played < matches:
+            message = await client.next_message()
+            if message is None:
+                break
+            kind = message["type"]
+            if kind == "round":
+                _, local_shoot, _ = client.round
+                throw_time = local_shoot + rng.uniform(*reaction)
+                await asyncio.sleep(max(0.0, throw_time - time.time()))
+                await client.throw(message["round"], rng.choice(["rock", "paper", "scissors"]), throw_time)
+                sent_at = time.time()
+            elif kind == "result" and stats is not None and sent_at is not None:
+                stats.setdefault("latencies", []).append(time.time() - sent_at)
+                stats["rounds"] = stats.get("rounds", 0) + 1
+            elif kind == "match_over":
+                played += 1
+                if stats is not None:
+                    stats["matches"] = stats.get("matches", 0) + 1
+                if played < matches:
+                    await client.ready()
+    finally:
+        await client.close()
+    return played
+
+
+# --- Camera Player ---
+def run_camera(host, port, name):
+    import cv2
+    import mediapipe as mp
+
+    # The shared capture module lives in the repository root
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    from camera_capture import CameraCapture
+    from game_logic import detect_move
+    from hud import HudRenderer
+    from round_engine import RoundEngine
+
+    client = RpsClient(host, port, name)
+    loop = asyncio.new_event_loop()
+
+    async def network():
+        await client.connect()
+        while True:
+            message = await client.next_message()
+            if message is None:
+                break
+            if message["type"] == "match_over":
+                await asyncio.sleep(3)
+                await client.ready()
+
+    network_thread = threading.Thread(target=loop.run_until_complete, args=(network(),), daemon=True)
+    network_thread.start()
+
+    hands = mp.solutions.hands.Hands(max_num_hands=1)
+    mp_drawing = mp.solutions.drawing_utils
+    cap = CameraCapture(0, mirror=True)
+    hud = HudRenderer()
+    # The server owns the round timing: the engine only votes, and waits for the next round after deciding
+    engine = RoundEngine(vote_window=0.3, min_votes=3, throw_timeout=float("inf"), result_duration=float("inf"))
+    engine_round = None
+
+    while True:
+        ok, frame, frame_time = cap.read()
+        if not ok:
+            break
+
+        results = hands.process(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+        current_move = None
+        if results.multi_hand_landmarks:
+            hand_landmarks = results.multi_hand_landmarks[0]
+            mp_drawing.draw_landmarks(frame, hand_landmarks, mp.solutions.hands.HAND_CONNECTIONS)
+            current_move = detect_move(hand_landmarks.landmark)
+
+        with client.lock:
+            round_info = client.round
+            opponent, score = client.opponent, list(client.score)
+            last_result, match_over = client.last_result, client.match_over
+
+        if round_info and round_info[0] != engine_round:
+            engine_round, local_shoot, _ = round_info
+            engine.countdown = max(0.0, local_shoot - frame_time)
+            engine.start_round(frame_time)
+
+        if engine_round is not None:
+            decision = engine.update(current_move, frame_time)
+            if decision:
+                asyncio.run_coroutine_threadsafe(
+                    client.throw(engine_round, decision.move, decision.throw_time), loop)
+
+        lines = [(f"vs {opponent or 'waiting for opponent...'}   {score[0]} : {score[1]}", 30,
+                  (0, 255, 255), (10, 10))]
+        if match_over:
+            verdict = "You won the match!" if match_over["winner"] == name else \
+                "Match drawn" if match_over["winner"] is None else "You lost the match"
+            lines.append((verdict, 42, (255, 255, 255), (10, 60)))
+        elif last_result and last_result["round"] == engine_round:
+            lines.append((f"{last_result['you']} vs {last_result['opponent']}: {last_result['outcome']}", 36,
+                          (255, 255, 255), (10, 60)))
+        elif engine.state == "countdown":
+            lines.append((f"Get Ready: {int(engine.countdown_remaining(frame_time)) + 1}", 42,
+                          (0, 255, 255), (10, 60)))
+        elif engine.state in ("throw", "result"):
+            lines.append(("Shoot!", 42, (0, 255, 255), (10, 60)))
+        hud.draw(frame, lines)
+
+        cv2.imshow("Rock Paper Scissors Online", frame)
+        if cv2.waitKey(1) & 0xFF == ord('q'):
+            break
+
+    loop.call_soon_threadsafe(loop.stop)
+    cap.release()
+    cv2.destroyAllWindows()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play networked rock-paper-scissors against another player")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--name", default="player")
+    parser.add_argument("--simulate", action="store_true", help="play random moves without a camera")
+    parser.add_argument("--matches", type=int, default=1, help="matches to play in --simulate mode")
+    args = parser.parse_args()
+
+    if args.simulate:
+        played = asyncio.run(simulated_player(args.host, args.port, args.name, args.matches))
+        print(f"[CLIENT] Played {played} match(es)")
+    else:
+        run_camera(args.host, args.port, args.name)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,35 @@
+import argparse
 import cv2
 import mediapipe as mp
-import random
+import os
+import sys
+import math
 import time
 
-# Initialize MediaPipe
+# The shared capture module lives in the repository root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from camera_capture import CameraCapture
+from game_logic import detect_move, get_computer_move, get_winner
+from round_engine import RoundEngine
+from hud import HudRenderer
+
+parser = argparse.ArgumentParser(description="Rock-paper-scissors against the computer")
+parser.add_argument("--server", metavar="CAMERA", default=None,
+                    help="use frames and hand landmarks of this inference_server camera instead of "
+                         "opening the webcam and running the model here")
+args = parser.parse_args()
+
+# Initialize MediaPipe (or the shared inference server, which replaces both the camera and the model)
 mp_hands = mp.solutions.hands
-hands = mp_hands.Hands(max_num_hands=1)
-mp_drawing = mp.solutions.drawing_utils
-
-# Rock, Paper, Scissors labels
-rps_gestures = {
-    "rock": [0, 0, 0, 0, 0],
-    "paper": [1, 1, 1, 1, 1],
-    "scissors": [0, 1, 1, 0, 0]
-}
+if args.server:
+    sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "inference_server"))
+    from client import ServerCapture, draw_landmarks
+    cap = ServerCapture(args.server, mirror=True)
+    hands = cap
+else:
+    cap = CameraCapture(0, mirror=True)
+    hands = mp_hands.Hands(max_num_hands=1)
+    draw_landmarks = mp.solutions.drawing_utils.draw_landmarks
 
 # Emoji mapping
 emoji_map = {
@@ -28,112 +44,77 @@ result_emoji = {
     "Draw": "🤝"
 }
 
-# Simple finger state detector
-def get_finger_states(landmarks):
-    finger_states = []
-    finger_states.append(int(landmarks[4].x > landmarks[3].x))
-
-    tips = [8, 12, 16, 20]
-    pip_joints = [6, 10, 14, 18]
-
-    for tip, pip in zip(tips, pip_joints):
-        finger_states.append(int(landmarks[tip].y < landmarks[pip].y))
-
-    return finger_states
-
-# Compare gesture to known ones
-def classify_gesture(states):
-    for gesture, pattern in rps_gestures.items():
-        if states == pattern:
-            return gesture
-    return "unknown"
-
-# Get computer move
-def get_computer_move():
-    return random.choice(["rock", "paper", "scissors"])
-
-# Decide winner
-def get_winner(player, computer):
-    if player == computer:
-        return "Draw"
-    elif (player == "rock" and computer == "scissors") or \
-         (player == "scissors" and computer == "paper") or \
-         (player == "paper" and computer == "rock"):
-        return "You Win!"
-    else:
-        return "Computer Wins!"
-
-cap = cv2.VideoCapture(0)
-
-last_move_time = time.time()
-delay = 3
-countdown_duration = 3
+# Rounds are decided by a majority vote over a short window of frames after "Shoot!"
+engine = RoundEngine(countdown=3, vote_window=0.3, min_votes=3)
 result = ""
 computer_move = ""
 user_move = ""
-game_ready = False
+decision = None
+
+# Text and emoji are rasterized once per distinct content and cached
+hud = HudRenderer()
 
 player_score = 0
 computer_score = 0
 
-display_countdown = True
-start_count_time = time.time()
-
 while True:
-    ret, frame = cap.read()
-    frame = cv2.flip(frame, 1)
+    ret, frame, frame_time = cap.read()
+    if not ret:
+        break
 
     image_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
     result_hand = hands.process(image_rgb)
 
+    # Classify this frame (None when no hand is visible)
+    current_move = None
+    if result_hand.multi_hand_landmarks:
+        hand_landmarks = result_hand.multi_hand_landmarks[0]
+        draw_landmarks(frame, hand_landmarks, mp_hands.HAND_CONNECTIONS)
+        current_move = detect_move(hand_landmarks.landmark)
+
+    new_decision = engine.update(current_move, frame_time)
+    if new_decision:
+        decision = new_decision
+        user_move = decision.move
+        computer_move = get_computer_move()
+        result = get_winner(user_move, computer_move)
+
+        if result == "You Win!":
+            player_score += 1
+        elif result == "Computer Wins!":
+            computer_score += 1
+
+        print(f"[ROUND] {user_move} vs {computer_move}: {result} | "
+              f"reaction {decision.reaction_time * 1000:.0f} ms, "
+              f"decision latency {decision.latency * 1000:.0f} ms "
+              f"({decision.votes}/{decision.total_votes} votes)")
+
     # Countdown
-    if display_countdown:
-        remaining = countdown_duration - int(time.time() - start_count_time)
-        if remaining > 0:
-            cv2.putText(frame, f"Get Ready: {remaining}", (200, 50), cv2.FONT_HERSHEY_SIMPLEX, 1.5, (0, 255, 255), 4)
-        else:
-            display_countdown = False
-            last_move_time = time.time()
-
-    elif result_hand.multi_hand_landmarks:
-        for hand_landmarks in result_hand.multi_hand_landmarks:
-            mp_drawing.draw_landmarks(frame, hand_landmarks, mp_hands.HAND_CONNECTIONS)
-
-            finger_states = get_finger_states(hand_landmarks.landmark)
-            user_move = classify_gesture(finger_states)
-
-            current_time = time.time()
-            if current_time - last_move_time > delay and user_move != "unknown":
-                computer_move = get_computer_move()
-                result = get_winner(user_move, computer_move)
-                game_ready = True
-                last_move_time = current_time
-                start_count_time = current_time
-                display_countdown = True
-
-                if result == "You Win!":
-                    player_score += 1
-                elif result == "Computer Wins!":
-                    computer_score += 1
-
-            if game_ready:
-                color = (255, 255, 255)
-                if result == "You Win!":
-                    color = (0, 255, 0)
-                elif result == "Computer Wins!":
-                    color = (0, 0, 255)
-                elif result == "Draw":
-                    color = (255, 0, 0)
-
-                cv2.putText(frame, f"You: {emoji_map[user_move]} ({user_move})", (10, 40), cv2.FONT_HERSHEY_SIMPLEX, 1.2, (255, 255, 255), 2)
-                cv2.putText(frame, f"Computer: {emoji_map[computer_move]} ({computer_move})", (10, 90), cv2.FONT_HERSHEY_SIMPLEX, 1.2, (255, 255, 255), 2)
-                cv2.putText(frame, f"Result: {result} {result_emoji[result]}", (10, 140), cv2.FONT_HERSHEY_SIMPLEX, 1.4, color, 3)
-                cv2.putText(frame, f"Score - You: {player_score}  Computer: {computer_score}", (10, 190), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 255), 2)
-
-    else:
-        game_ready = False
-        result = ""
-        computer_move = ""
+    if engine.state == "countdown":
+        remaining = math.ceil(engine.countdown_remaining(frame_time))
+        hud.draw(frame, [(f"Get Ready: {remaining}", 48, (0, 255, 255), (200, 15))])
+
+    elif engine.state == "throw":
+        hud.draw(frame, [("Shoot! " + emoji_map["rock"] + emoji_map["paper"] + emoji_map["scissors"],
+                          48, (0, 255, 255), (200, 15))])
+
+    elif engine.state == "result":
+        color = (255, 255, 255)
+        if result == "You Win!":
+            color = (0, 255, 0)
+        elif result == "Computer Wins!":
+            color = (0, 0, 255)
+        elif result == "Draw":
+            color = (255, 0, 0)
+
+        # The layout only changes when a round is decided, so it is composed once per round
+        hud.draw(frame, [
+            (f"You: {emoji_map[user_move]} ({user_move})", 36, (255, 255, 255), (10, 10)),
+            (f"Computer: {emoji_map[computer_move]} ({computer_move})", 36, (255, 255, 255), (10, 60)),
+            (f"Result: {result} {result_emoji[result]}", 42, color, (10, 110)),
+            (f"Score - You: {player_score}  Computer: {computer_score}", 30, (0, 255, 255), (10, 165)),
+            (f"Decided in {decision.latency * 1000:.0f} ms", 24, (200, 200, 200), (10, 210)),
+        ])
 
     cv2.imshow("Rock Paper Scissors", frame)
 
@@ -0,0 +1,66 @@
+# rps_loadtest.py
+import argparse
+import asyncio
+import random
+import time
+
+from net_protocol import DEFAULT_HOST
+from rps_client import simulated_player
+from rps_server import GameServer, build_parser
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))] if ordered else float("nan")
+
+
+async def run(args):
+    server_task = None
+    if args.spawn_server:
+        # Run the server in this process with short rounds so the test measures the server, not the countdown
+        config = build_parser().parse_args(["--port", str(args.port), "--countdown", str(args.countdown),
+                                            "--report-interval", "0"])
+        server_task = asyncio.ensure_future(GameServer(config).serve(DEFAULT_HOST, args.port, 0))
+        await asyncio.sleep(0.2)
+
+    stats = {}
+    rng = random.Random(args.seed)
+    start = time.time()
+    players = []
+    for i in range(args.clients):
+        players.append(simulated_player(args.host, args.port, f"sim{i}", args.matches, stats,
+                                        rng=random.Random(rng.random())))
+        if args.ramp:
+            await asyncio.sleep(args.ramp)
+    results = await asyncio.gather(*players, return_exceptions=True)
+    elapsed = time.time() - start
+
+    errors = [r for r in results if isinstance(r, Exception)]
+    latencies = stats.get("latencies", [])
+    matches = stats.get("matches", 0) // 2  # both players report every match
+    print(f"[LOADTEST] {args.clients} clients, {matches} matches, {stats.get('rounds', 0) // 2} rounds "
+          f"in {elapsed:.1f}s ({matches / elapsed:.1f} matches/s)")
+    print(f"[LOADTEST] result latency p50 {percentile(latencies, 0.5) * 1000:.1f} ms, "
+          f"p95 {percentile(latencies, 0.95) * 1000:.1f} ms, max {max(latencies, default=0) * 1000:.1f} ms")
+    if errors:
+        print(f"[LOADTEST] {len(errors)} client(s) failed, first error: {errors[0]!r}")
+
+    if server_task is not None:
+        server_task.cancel()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test rps_server.py with simulated players")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--clients", type=int, default=200, help="number of simulated players (pairs into matches)")
+    parser.add_argument("--matches", type=int, default=3, help="matches each player plays")
+    parser.add_argument("--ramp", type=float, default=0.0, help="seconds between client connections")
+    parser.add_argument("--spawn-server", action="store_true", help="run the server inside this process")
+    parser.add_argument("--countdown", type=float, default=0.5, help="round countdown for --spawn-server")
+    parser.add_argument("--seed", type=int, default=0)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+# rps_server.py
+import argparse
+import asyncio
+import itertools
+import time
+
+from game_logic import get_winner
+from net_protocol import DEFAULT_HOST, DEFAULT_PORT, read_message, send_message
+
+VALID_MOVES = ("rock", "paper", "scissors")
+
+
+class Player:
+    def __init__(self, name, reader, writer):
+        self.name = name
+        self.reader = reader
+        self.writer = writer
+        self.rtt = 0.0           # round-trip time reported by the client after its clock sync
+        self.throws = {}         # round number -> (move, throw time in server clock, arrival time)
+        self.throw_arrived = asyncio.Event()
+        self.match = None
+        self.connected = True
+
+    async def send(self, message):
+        if self.connected:
+            try:
+                await send_message(self.writer, message)
+            except (ConnectionError, RuntimeError):
+                self.connected = False
+
+
+class Match:
+    """
+    One best-of match between two players.
+
+    Each round the server announces a shoot time in its own clock. Clients convert
+    it to their clock, decide their move locally and send it back stamped with the
+    server-clock time of the frame where the throw became visible. A throw is judged
+    by that capture time, not by when it arrived, so a slower network link does not
+    count against a player; the server only waits for in-flight packets up to a
+    capped allowance of the player's measured latency.
+    """
+
+    def __init__(self, server, match_id, player_a, player_b):
+        self.server = server
+        self.match_id = match_id
+        self.players = [player_a, player_b]
+        self.scores = [0, 0]
+
+    async def run(self):
+        config = self.server.config
+        a, b = self.players
+        await a.send({"type": "matched", "match": self.match_id, "opponent": b.name})
+        await b.send({"type": "matched", "match": self.match_id, "opponent": a.name})
+
+        for round_number in itertools.count(1):
+            if max(self.scores) >= config.wins or round_number > config.max_rounds:
+                break
+            if not (a.connected and b.connected):
+                break
+            await self.play_round(round_number)
+
+        winner = None
+        if self.scores[0] != self.scores[1]:
+            winner = self.players[0 if self.scores[0] > self.scores[1] else 1].name
+        # Free both players before telling them, so an immediate 'ready' is not ignored
+        for player in self.players:
+            player.match = None
+        for i, player in enumerate(self.players):
+            await player.send({"type": "match_over", "match": self.match_id, "winner": winner,
+                               "score": [self.scores[i], self.scores[1 - i]]})
+        self.server.matches_finished += 1
+
+    async def play_round(self, round_number):
+        config = self.server.config
+        shoot_at = time.time() + config.countdown
+        for player in self.players:
+            player.throw_arrived.clear()
+            await player.send({"type": "round", "round": round_number, "shoot_at": shoot_at,
+                               "window": config.throw_window})
+
+        # Wait for both throws, or until the window plus the latency allowance has passed
+        allowance = max(min(p.rtt / 2, config.max_compensation) for p in self.players)
+        deadline = shoot_at + config.throw_window + allowance
+        while not all(round_number in p.throws for p in self.players):
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                break
+            waiters = [asyncio.ensure_future(p.throw_arrived.wait()) for p in self.players]
+            await asyncio.wait(waiters, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+            for waiter in waiters:
+                waiter.cancel()
+            for player in self.players:
+                player.throw_arrived.clear()
+
+        moves = []
+        for player in self.players:
+            throw = player.throws.pop(round_number, None)
+            # Throws that arrive after their round was resolved are dropped here
+            player.throws = {r: t for r, t in player.throws.items() if r > round_number}
+            valid = (throw is not None and throw[0] in VALID_MOVES and
+                     shoot_at - config.early_tolerance <= throw[1] <= shoot_at + config.throw_window)
+            moves.append(throw[0] if valid else None)
+
+        if moves[0] and moves[1]:
+            outcome = get_winner(moves[0], moves[1])
+            outcomes = {"You Win!": ("win", "lose"), "Computer Wins!": ("lose", "win"),
+                        "Draw": ("draw", "draw")}[outcome]
+        elif moves[0] or moves[1]:
+            outcomes = ("win", "lose") if moves[0] else ("lose", "win")  # the other player missed the window
+        else:
+            outcomes = ("draw", "draw")
+
+        for i, result in enumerate(outcomes):
+            if result == "win":
+                self.scores[i] += 1
+        self.server.rounds_resolved += 1
+
+        for i, player in enumerate(self.players):
+            await player.send({"type": "result", "round": round_number, "you": moves[i],
+                               "opponent": moves[1 - i], "outcome": outcomes[i],
+                               "score": [self.scores[i], self.scores[1 - i]]})
+
+
+class GameServer:
+    """Accepts players, pairs them in arrival order and runs every match as its own task."""
+
+    def __init__(self, config):
+        self.config = config
+        self.waiting = asyncio.Queue()
+        self.match_ids = itertools.count(1)
+        self.matches = set()
+        self.matches_started = 0
+        self.matches_finished = 0
+        self.rounds_resolved = 0
+
+    async def handle_client(self, reader, writer):
+        player = None
+        try:
+            while True:
+                message = await read_message(reader)
+                if message is None:
+                    break
+                kind = message.get("type")
+                if kind == "ping":
+                    await send_message(writer, {"type": "pong", "client_time": message["client_time"],
+                                                "server_time": time.time()})
+                elif kind == "hello":
+                    player = Player(message.get("name", "player"), reader, writer)
+                elif kind == "ready" and player is not None and player.match is None:
+                    player.rtt = float(message.get("rtt", 0.0))
+                    await self.waiting.put(player)
+                elif kind == "throw" and player is not None:
+                    player.throws[message["round"]] = (message.get("move"), float(message["throw_time"]),
+                                                       time.time())
+                    player.throw_arrived.set()
+        except (ConnectionError, ValueError, KeyError):
+            pass
+        finally:
+            if player is not None:
+                player.connected = False
+                player.throw_arrived.set()
+            writer.close()
+
+    async def matchmaker(self):
+        while True:
+            first = await self.waiting.get()
+            if not first.connected:
+                continue
+            second = await self.waiting.get()
+            while not second.connected:
+                second = await self.waiting.get()
+            if not first.connected:
+                # The first player left while waiting: the second one waits for the next opponent
+                await self.waiting.put(second)
+                continue
+
+            match = Match(self, next(self.match_ids), first, second)
+            first.match = second.match = match
+            self.matches_started += 1
+            task = asyncio.ensure_future(match.run())
+            self.matches.add(task)
+            task.add_done_callback(self.matches.discard)
+
+    async def report(self, interval):
+        last_rounds, last_time = 0, time.time()
+        while True:
+            await asyncio.sleep(interval)
+            now = time.time()
+            rate = (self.rounds_resolved - last_rounds) / (now - last_time)
+            last_rounds, last_time = self.rounds_resolved, now
+            print(f"[SERVER] active matches: {len(self.matches)} | finished: {self.matches_finished} | "
+                  f"waiting: {self.waiting.qsize()} | rounds/s: {rate:.1f}")
+
+    async def serve(self, host, port, report_interval=5.0):
+        server = await asyncio.start_server(self.handle_client, host, port)
+        print(f"[SERVER] Listening on {host}:{port}")
+        background = [asyncio.ensure_future(self.matchmaker())]
+        if report_interval:
+            background.append(asyncio.ensure_future(self.report(report_interval)))
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            for task in background:
+                task.cancel()
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Local matchmaking server for networked rock-paper-scissors")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--countdown", type=float, default=3.0, help="seconds from round start to 'Shoot!'")
+    parser.add_argument("--throw-window", type=float, default=1.0, help="seconds after 'Shoot!' a throw counts")
+    parser.add_argument("--early-tolerance", type=float, default=0.1,
+                        help="seconds before 'Shoot!' a throw is still accepted")
+    parser.add_argument("--max-compensation", type=float, default=0.25,
+                        help="cap on the extra wait for a laggy player's throw to arrive")
+    parser.add_argument("--wins", type=int, default=3, help="round wins needed to take the match")
+    parser.add_argument("--max-rounds", type=int, default=9)
+    parser.add_argument("--report-interval", type=float, default=5.0)
+    return parser
+
+
+def main():
+    config = build_parser().parse_args()
+    try:
+        asyncio.run(GameServer(config).serve(config.host, config.port, config.report_interval))
+    except KeyboardInterrupt:
+        print("\n[SERVER] Stopped")
+
+
+if __name__ == "__main__":
+    main()
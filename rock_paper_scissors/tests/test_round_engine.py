@@ -0,0 +1,37 @@
+# test_round_engine.py
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from round_engine import RoundEngine
+
+
+def play(engine, fps, moves, start=0.0):
+    """Feeds one move per frame at fps; returns (decision, frames fed) at the first decision."""
+    for i, move in enumerate(moves):
+        decision = engine.update(move, start + i / fps)
+        if decision is not None:
+            return decision, i + 1
+    return None, len(moves)
+
+
+def test_decides_at_normal_frame_rate():
+    engine = RoundEngine(countdown=1.0, vote_window=0.3, min_votes=3)
+    decision, frames = play(engine, 30, [None] * 30 + ["rock"] * 30)
+    assert decision.move == "rock"
+    assert decision.votes == 3
+    assert frames == 33
+
+
+def test_decides_at_low_frame_rate():
+    for fps in (6, 5, 2):
+        engine = RoundEngine(countdown=1.0, vote_window=0.3, min_votes=3)
+        decision, _ = play(engine, fps, [None] * fps + ["paper"] * fps)
+        assert decision is not None and decision.move == "paper", fps
+        assert decision.latency <= 0.5
+
+
+def test_single_misclassified_frame_does_not_decide():
+    engine = RoundEngine(countdown=1.0, vote_window=0.3, min_votes=3)
+    decision, _ = play(engine, 30, [None] * 30 + ["scissors"] + [None] * 10 + ["rock"] * 5)
+    assert decision.move == "rock"
@@ -0,0 +1,64 @@
+# train_gesture_model.py
+import argparse
+import csv
+
+import numpy as np
+
+from gesture_model import GestureClassifier, normalize_landmarks
+
+
+def load_samples(path):
+    """Reads the CSV written by record_landmarks.py. Returns (landmarks (N, 21, 3), labels)."""
+    labels, rows = [], []
+    with open(path, newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        next(reader)  # header
+        for row in reader:
+            labels.append(row[0])
+            rows.append([float(v) for v in row[1:]])
+    return np.array(rows, dtype=np.float32).reshape(-1, 21, 3), np.array(labels)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train the RPS gesture classifier from recorded landmarks")
+    parser.add_argument("--data", default="gesture_samples.csv", help="CSV written by record_landmarks.py")
+    parser.add_argument("--output", default="gesture_model.npz", help="where to save the trained model")
+    parser.add_argument("--epochs", type=int, default=500)
+    parser.add_argument("--val-split", type=float, default=0.2)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    points, labels = load_samples(args.data)
+    features = normalize_landmarks(points)
+    print(f"[INFO] Loaded {len(labels)} samples: "
+          + ", ".join(f"{name}={n}" for name, n in zip(*np.unique(labels, return_counts=True))))
+
+    # Hold out a random validation split
+    order = np.random.default_rng(args.seed).permutation(len(labels))
+    n_val = int(len(labels) * args.val_split)
+    val_idx, train_idx = order[:n_val], order[n_val:]
+
+    model = GestureClassifier()
+    losses = model.fit(features[train_idx], labels[train_idx], epochs=args.epochs)
+    print(f"[INFO] Training loss: {losses[0]:.3f} -> {losses[-1]:.3f}")
+
+    if n_val:
+        probs = model.predict_proba(features[val_idx])
+        predicted = np.array(model.labels)[probs.argmax(axis=1)]
+        confidence = probs.max(axis=1)
+        print(f"[INFO] Validation accuracy: {(predicted == labels[val_idx]).mean():.2%}")
+        for label in model.labels:
+            mask = labels[val_idx] == label
+            if mask.any():
+                print(f"    {label:>9}: {(predicted[mask] == label).mean():.2%} ({mask.sum()} samples)")
+        for threshold in (0.5, 0.7, 0.9):
+            kept = confidence >= threshold
+            accuracy = (predicted[kept] == labels[val_idx][kept]).mean() if kept.any() else 0.0
+            print(f"    threshold {threshold:.1f}: {kept.mean():.2%} of frames decided, {accuracy:.2%} correct")
+
+    model.save(args.output)
+    print(f"[INFO] Model saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,265 @@
+# swipe_typing.py
+import math
+import os
+from collections import Counter, defaultdict
+
+import numpy as np
+
+# --- Configuration Parameters ---
+SAMPLE_POINTS = 32      # Points every swipe path and key-path template is resampled to
+SHAPE_WEIGHT = 4.0      # How strongly the path shape counts against the language model
+BACKOFF_ALPHA = 0.4     # "Stupid backoff" discount when falling back to a shorter context
+
+# A small built-in lexicon ordered by frequency, used when no word list file is available.
+DEFAULT_LEXICON = """
+the be to of and a in that have i it for not on with he as you do at this but his by from
+they we say her she or an will my one all would there their what so up out if about who get
+which go me when make can like time no just him know take people into year your good some
+could them see other than then now look only come its over think also back after use two how
+our work first well way even new want because any these give day most us is are was were
+has had did said yes hello please thanks thank help where why here name number home
+call open close type word text send mail email phone room door floor water food coffee
+stop start next left right down more less okay ok fine great sorry need find show read write
+place today tomorrow morning night house friend family love life world hand keep let put
+ask tell feel try leave mean seem turn move live believe hold bring happen must before
+""".split()
+
+
+# --- Keyboard Geometry ---
+def build_key_centers(button_list):
+    """
+    Maps every single-letter button to the pixel centre of its key.
+    Returns a dictionary {letter: (cx, cy)} using lower-case letters.
+    """
+    centers = {}
+    for button in button_list:
+        if len(button.text) != 1:
+            continue
+        x, y = button.pos
+        w, h = button.size
+        centers[button.text.lower()] = (x + w / 2, y + h / 2)
+    return centers
+
+
+def resample_path(points, n=SAMPLE_POINTS):
+    """Resamples a polyline to n points spaced evenly along its length."""
+    pts = np.asarray(points, dtype=np.float32).reshape(-1, 2)
+    if len(pts) > 1:
+        # Drop repeated points so the cumulative length is strictly increasing
+        step = np.linalg.norm(np.diff(pts, axis=0), axis=1)
+        pts = pts[np.concatenate(([True], step > 0))]
+    if len(pts) == 1:
+        return np.repeat(pts, n, axis=0)
+
+    cumulative = np.concatenate(([0.0], np.cumsum(np.linalg.norm(np.diff(pts, axis=0), axis=1))))
+    targets = np.linspace(0.0, cumulative[-1], n)
+    x = np.interp(targets, cumulative, pts[:, 0])
+    y = np.interp(targets, cumulative, pts[:, 1])
+    return np.stack([x, y], axis=1).astype(np.float32)
+
+
+def collapse_repeats(letters):
+    """Removes consecutive duplicates ('hello' -> 'helo'), matching how a swipe looks."""
+    collapsed = []
+    for letter in letters:
+        if not collapsed or collapsed[-1] != letter:
+            collapsed.append(letter)
+    return "".join(collapsed)
+
+
+# --- Lexicon Trie ---
+class TrieNode:
+    __slots__ = ("children", "word")
+
+    def __init__(self):
+        self.children = {}
+        self.word = None
+
+
+class LexiconTrie:
+    """
+    Prefix trie over the collapsed spelling of every lexicon word.
+    Words sharing a collapsed spelling ('to', 'too') share a node.
+    """
+
+    def __init__(self, words=()):
+        self.root = TrieNode()
+        for word in words:
+            self.insert(word)
+
+    def insert(self, word):
+        node = self.root
+        for letter in collapse_repeats(word):
+            node = node.children.setdefault(letter, TrieNode())
+        if node.word is None:
+            node.word = []
+        node.word.append(word)
+
+    def subsequence_matches(self, key_sequence):
+        """
+        Returns every word whose collapsed spelling starts on the first key, ends on the
+        last key and is a subsequence of the keys the finger passed over.
+        The trie lets whole branches be pruned as soon as a letter was never visited.
+        """
+        if not key_sequence:
+            return []
+        first, last = key_sequence[0], key_sequence[-1]
+        start = self.root.children.get(first)
+        if start is None:
+            return []
+
+        matches = []
+        stack = [(start, 0, first)]
+        while stack:
+            node, pos, letter = stack.pop()
+            if node.word is not None and letter == last:
+                matches.extend(node.word)
+            for child_letter, child in node.children.items():
+                next_pos = key_sequence.find(child_letter, pos + 1)
+                if next_pos != -1:
+                    stack.append((child, next_pos, child_letter))
+        return matches
+
+
+# --- Next-Word Prediction ---
+class NgramPredictor:
+    """
+    Word n-gram table with stupid-backoff scoring.
+    Seeded with lexicon frequencies and updated online with every committed word.
+    """
+
+    def __init__(self, order=3):
+        self.order = order
+        self.counts = defaultdict(Counter)  # context tuple -> Counter of following words
+        self.context_totals = Counter()
+
+    def learn(self, words, weight=1):
+        """Adds every n-gram (up to self.order) of a word sequence to the table."""
+        words = [w.lower() for w in words]
+        for i, word in enumerate(words):
+            for n in range(self.order):
+                if i - n < 0:
+                    break
+                context = tuple(words[i - n:i])
+                self.counts[context][word] += weight
+                self.context_totals[context] += weight
+
+    def observe(self, history, weight=1):
+        """Adds only the n-grams ending at the last word of history (for online updates)."""
+        words = [w.lower() for w in history]
+        if not words:
+            return
+        word = words[-1]
+        for n in range(min(self.order, len(words))):
+            context = tuple(words[len(words) - 1 - n:-1])
+            self.counts[context][word] += weight
+            self.context_totals[context] += weight
+
+    def seed_unigrams(self, ranked_words):
+        """Gives lexicon words a Zipf-like unigram count based on their rank."""
+        for rank, word in enumerate(ranked_words):
+            count = max(1, int(1000 / (rank + 1)))
+            self.counts[()][word] += count
+            self.context_totals[()] += count
+
+    def score(self, history, word):
+        """Stupid-backoff score of word following history (higher is more likely)."""
+        history = [w.lower() for w in history]
+        discount = 1.0
+        for n in range(min(self.order - 1, len(history)), -1, -1):
+            context = tuple(history[len(history) - n:]) if n else ()
+            # .get, not [], so looking up an unseen context does not add it to the model
+            count = self.counts.get(context, {}).get(word, 0)
+            if count:
+                return discount * count / self.context_totals[context]
+            discount *= BACKOFF_ALPHA
+        # Unseen word: small floor so the shape score can still pick it
+        return discount / (self.context_totals[()] + len(self.counts.get((), ())) + 1)
+
+    def predict(self, history, k=3, prefix=""):
+        """Returns up to k likely next words, backing off to shorter contexts to fill the list."""
+        history = [w.lower() for w in history]
+        suggestions = []
+        for n in range(min(self.order - 1, len(history)), -1, -1):
+            context = tuple(history[len(history) - n:]) if n else ()
+            for word, _ in self.counts.get(context, Counter()).most_common():
+                if word.startswith(prefix) and word not in suggestions:
+                    suggestions.append(word)
+                    if len(suggestions) == k:
+                        return suggestions
+        return suggestions
+
+
+# --- Swipe Decoder ---
+class SwipeDecoder:
+    """
+    Decodes a fingertip trajectory over the on-screen keyboard into words.
+    Key-path templates for the whole lexicon are precomputed once so decoding a
+    swipe is a trie walk plus one vectorized distance computation.
+    """
+
+    def __init__(self, button_list, lexicon=None, predictor=None):
+        self.key_centers = build_key_centers(button_list)
+        self.key_size = float(np.mean([b.size[0] for b in button_list if len(b.text) == 1]))
+
+        lexicon = lexicon if lexicon is not None else DEFAULT_LEXICON
+        self.words = [w for w in dict.fromkeys(w.lower() for w in lexicon)
+                      if w and all(c in self.key_centers for c in w)]
+        self.word_index = {w: i for i, w in enumerate(self.words)}
+        self.trie = LexiconTrie(self.words)
+        self.templates = np.stack([self._template(w) for w in self.words]) if self.words \
+            else np.zeros((0, SAMPLE_POINTS, 2), np.float32)
+
+        self.predictor = predictor if predictor is not None else NgramPredictor()
+        if predictor is None:
+            self.predictor.seed_unigrams(self.words)
+
+    def _template(self, word):
+        return resample_path([self.key_centers[c] for c in collapse_repeats(word)])
+
+    def key_at(self, point):
+        """Returns the letter of the key under a point, or None."""
+        px, py = point
+        half = self.key_size / 2
+        for letter, (cx, cy) in self.key_centers.items():
+            if abs(px - cx) < half and abs(py - cy) < half:
+                return letter
+        return None
+
+    def key_sequence(self, path):
+        """Collapsed sequence of keys a trajectory passed over."""
+        return collapse_repeats(k for k in (self.key_at(p) for p in path) if k)
+
+    def decode(self, path, history=(), k=3):
+        """
+        Returns up to k (word, score) candidates for a swipe path, best first.
+        The score combines shape distance to the word's key-path template
+        (in key widths) with the n-gram probability given the typed history.
+        """
+        keys = self.key_sequence(path)
+        candidates = self.trie.subsequence_matches(keys)
+        if not candidates:
+            return []
+
+        user_path = resample_path(path)
+        rows = np.fromiter((self.word_index[w] for w in candidates), dtype=np.int64)
+        distances = np.linalg.norm(self.templates[rows] - user_path[None], axis=2).mean(axis=1)
+        distances /= self.key_size
+
+        scored = []
+        for word, distance in zip(candidates, distances):
+            lm = math.log(self.predictor.score(history, word))
+            scored.append((word, lm - SHAPE_WEIGHT * float(distance)))
+        scored.sort(key=lambda item: item[1], reverse=True)
+        return scored[:k]
+
+
+def load_lexicon(path):
+    """
+    Loads a word list with one word per line, most frequent first.
+    Falls back to the built-in lexicon if the file does not exist.
+    """
+    if not os.path.exists(path):
+        return list(DEFAULT_LEXICON)
+    with open(path, encoding="utf-8") as f:
+        return [line.split()[0].lower() for line in f if line.strip()]
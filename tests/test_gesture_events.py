@@ -0,0 +1,57 @@
+# test_gesture_events.py
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from gesture_events import PinchEventEngine
+
+FPS = 30
+
+
+def hand(pinched, x=0.0):
+    """21 landmarks of a 100 px hand; the index/middle tips are 10 px (pinched) or 60 px apart."""
+    points = [[100, 200] for _ in range(21)]
+    points[9] = [100, 100]
+    points[8] = [100 + x, 50]
+    points[12] = [100 + x + (10 if pinched else 60), 50]
+    return points
+
+
+def run(frames, engine=None):
+    """frames: (pinched, x) per frame at FPS. Returns the event types in order."""
+    engine = engine or PinchEventEngine()
+    return [event.type for i, (pinched, x) in enumerate(frames)
+            for event in engine.update(hand(pinched, x), i / FPS)]
+
+
+def tap(frames_closed=3, x=0.0):
+    return [(True, x)] * frames_closed + [(False, x)] * 2
+
+
+def test_quick_pinch_clicks():
+    assert run(tap()) == ["press", "release", "click"]
+
+
+def test_still_pinch_holds_and_never_drags():
+    events = run([(True, 0)] * 30 + [(True, 50)] * 5 + [(False, 50)])
+    assert events == ["press", "hold", "release"]
+
+
+def test_moving_pinch_drags_and_never_holds():
+    events = run([(True, 0)] * 3 + [(True, 50)] * 30 + [(False, 50)])
+    assert events[:2] == ["press", "drag_start"]
+    assert "hold" not in events and "click" not in events
+    assert events[-1] == "release"
+
+
+def test_two_quick_taps_double_click():
+    assert run(tap() + tap()) == ["press", "release", "click", "press", "release", "click", "double_click"]
+    # A third tap starts a new pair instead of a second double click
+    assert run(tap() + tap() + tap()).count("double_click") == 1
+
+
+def test_slow_or_distant_taps_do_not_double_click():
+    assert "double_click" not in run(tap() + [(False, 0)] * 15 + tap())
+    assert "double_click" not in run(tap() + tap(x=50))
+    # A hold in between is not a click
+    assert "double_click" not in run(tap() + [(True, 0)] * 20 + [(False, 0)])
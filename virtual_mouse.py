@@ -5,14 +5,38 @@ import time
 import pyautogui
 import pyttsx3
 import threading
+import argparse
+import os
+import sys
+from gesture_events import PinchEventEngine
+from camera_capture import CameraCapture
+
+# --- COMMAND LINE OPTIONS ---
+parser = argparse.ArgumentParser(description="Virtual mouse and keyboard controlled by hand gestures")
+parser.add_argument("--headless", action="store_true",
+                    help="run tracking and input injection without a preview window (stop with Ctrl+C)")
+parser.add_argument("--preview-fps", type=float, default=15,
+                    help="maximum preview refresh rate; tracking runs at full camera rate")
+parser.add_argument("--server", metavar="CAMERA", default=None,
+                    help="use frames and hand landmarks of this inference_server camera instead of "
+                         "opening the webcam and running the model here")
+args = parser.parse_args()
 
 # --- INITIALIZATION ---
-cap = cv2.VideoCapture(0)
-cap.set(3, 1280)
-cap.set(4, 720)
-
-# Hand Detector
-detector = HandDetector(detectionCon=0.8, maxHands=1)
+if args.server:
+    # The shared inference server owns the camera and runs the hand model once for every app
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "inference_server"))
+    from client import ServerCapture
+    cap = ServerCapture(args.server, mirror=False)
+    detector = None
+else:
+    cap = CameraCapture(0, width=1280, height=720)
+    # Hand Detector
+    detector = HandDetector(detectionCon=0.8, maxHands=1)
+print(f"--- Capture: {cap.describe()} ---")
+
+# Pinch (index + middle finger) events with hysteresis instead of a fixed action delay
+pinch = PinchEventEngine()
 
 # Screen and Frame size for mapping
 screen_width, screen_height = pyautogui.size()
@@ -26,15 +50,19 @@ keys = [
 ]
 
 # --- VARIABLES ---
-# Timers for preventing rapid/multiple actions
-last_action_time = 0
-action_delay = 0.5  # 500ms delay between any click or key press
+mouse_down = False  # True while a pinch-drag is holding the left button
 
 # Mouse movement smoothing
 smoothening = 7 # Value between 5-7 as requested
 prev_x, prev_y = 0, 0
 curr_x, curr_y = 0, 0
 
+# Preview state: the keyboard is rasterized once, feedback is kept until the next preview frame
+keyboard_layer, keyboard_mask = None, None
+last_preview_time = 0
+feedback_button = None  # key typed since the last preview frame
+feedback_click = False  # mouse click since the last preview frame
+
 
 # --- FUNCTIONS ---
 # Speak letter using pyttsx3 in a separate thread
@@ -74,79 +102,110 @@ def draw_keyboard(img, buttonList):
     return img
 
 
+# Preview rendering: a lower-rate consumer of the tracking results
+def draw_preview(img, index_tip, hovered_button):
+    global keyboard_layer, keyboard_mask
+    if keyboard_layer is None or keyboard_layer.shape != img.shape:
+        keyboard_layer = draw_keyboard(np.zeros_like(img), buttonList)
+        keyboard_mask = keyboard_layer.any(axis=2, keepdims=True)
+    np.copyto(img, keyboard_layer, where=keyboard_mask)
+
+    if hovered_button:
+        # Highlight the key being hovered over (red if it was just typed)
+        x, y = hovered_button.pos
+        w, h = hovered_button.size
+        color = (0, 0, 255) if hovered_button is feedback_button else (0, 255, 0)
+        cv2.rectangle(img, (x, y), (x + w, y + h), color, cv2.FILLED)
+        cv2.putText(img, hovered_button.text, (x + 20, y + 65),
+                    cv2.FONT_HERSHEY_PLAIN, 4, (0, 0, 0), 4)
+    elif index_tip is not None:
+        # Indicate mouse mode with a circle on the index finger (red on click)
+        color = (0, 0, 255) if feedback_click else (0, 255, 0)
+        cv2.circle(img, (index_tip[0], index_tip[1]), 15, color, cv2.FILLED)
+    return img
+
+
 # --- MAIN LOOP ---
+if args.headless:
+    print("[INFO] Running headless. Press Ctrl+C to stop.")
+
 while True:
-    success, img = cap.read()
-    img = cv2.flip(img, 1)
-    hands, img = detector.findHands(img, flipType=False)
-
-    img = draw_keyboard(img, buttonList)
-
-    if hands:
-        lmList = hands[0]['lmList']
-        if lmList:
-            # Get finger tip coordinates
-            index_tip = lmList[8]
-            middle_tip = lmList[12]
-
-            # --- UNIFIED CONTROL LOGIC ---
-
-            # 1. HOVERING AND MOUSE MOVEMENT
-            is_on_key = False
-            hovered_button = None
-
-            for button in buttonList:
-                x, y = button.pos
-                w, h = button.size
-                if x < index_tip[0] < x + w and y < index_tip[1] < y + h:
-                    is_on_key = True
-                    hovered_button = button
-                    # Highlight the key being hovered over
-                    cv2.rectangle(img, (x, y), (x + w, y + h), (0, 255, 0), cv2.FILLED)
-                    cv2.putText(img, button.text, (x + 20, y + 65),
-                                cv2.FONT_HERSHEY_PLAIN, 4, (0, 0, 0), 4)
-
-            # If not on a key, treat as mouse movement
-            if not is_on_key:
-                # Indicate mouse mode with a circle on the index finger
-                cv2.circle(img, (index_tip[0], index_tip[1]), 15, (0, 255, 0), cv2.FILLED)
-
-                # Map coordinates and smoothen movement
-                x_mapped = np.interp(index_tip[0], (frame_reduction, 1280 - frame_reduction), (0, screen_width))
-                y_mapped = np.interp(index_tip[1], (frame_reduction, 720 - frame_reduction), (0, screen_height))
-                curr_x = prev_x + (x_mapped - prev_x) / smoothening
-                curr_y = prev_y + (y_mapped - prev_y) / smoothening
-                pyautogui.moveTo(curr_x, curr_y)
-                prev_x, prev_y = curr_x, curr_y
-
-
-            # 2. CLICKING / TYPING ACTION
-            # Action is triggered by index and middle finger coming together
-            action_dist, _, _ = detector.findDistance(index_tip[0:2], middle_tip[0:2], img)
-
-            if action_dist < 40 and time.time() - last_action_time > action_delay:
-                # If on a key, type the key
-                if is_on_key and hovered_button:
-                    pyautogui.press(hovered_button.text.lower())
-                    threading.Thread(target=speak_letter, args=(hovered_button.text,), daemon=True).start()
-                    # Visual feedback for typing
-                    cv2.rectangle(img, hovered_button.pos,
-                                  (hovered_button.pos[0] + hovered_button.size[0], hovered_button.pos[1] + hovered_button.size[1]),
-                                  (0, 0, 255), cv2.FILLED)
-                    cv2.putText(img, hovered_button.text, (hovered_button.pos[0] + 20, hovered_button.pos[1] + 65),
-                                cv2.FONT_HERSHEY_PLAIN, 4, (0, 0, 0), 4)
-
-                # If not on a key, perform a mouse click
-                else:
+    success, img, _ = cap.read()
+    if not success:
+        break
+    frame_width = img.shape[1]
+
+    # Track on the raw frame without drawing; mirror the landmarks instead of the image
+    if detector is None:
+        hands = cap.find_hands()
+    else:
+        hands, _ = detector.findHands(img, draw=False, flipType=False)  # cvzone returns (hands, img)
+
+    lmList = [[frame_width - 1 - lm[0], lm[1], lm[2]] for lm in hands[0]['lmList']] if hands else []
+    events = pinch.update(lmList)
+
+    # A hand that disappears mid-drag must not leave the mouse button down
+    if mouse_down and any(e.type == "release" for e in events):
+        pyautogui.mouseUp()
+        mouse_down = False
+
+    index_tip = None
+    hovered_button = None
+    if lmList:
+        # Get finger tip coordinates
+        index_tip = lmList[8]
+
+        # --- UNIFIED CONTROL LOGIC ---
+
+        # 1. HOVERING AND MOUSE MOVEMENT
+        for button in buttonList:
+            x, y = button.pos
+            w, h = button.size
+            if x < index_tip[0] < x + w and y < index_tip[1] < y + h:
+                hovered_button = button
+
+        # If not on a key, treat as mouse movement
+        if not hovered_button:
+            # Map coordinates and smoothen movement
+            x_mapped = np.interp(index_tip[0], (frame_reduction, 1280 - frame_reduction), (0, screen_width))
+            y_mapped = np.interp(index_tip[1], (frame_reduction, 720 - frame_reduction), (0, screen_height))
+            curr_x = prev_x + (x_mapped - prev_x) / smoothening
+            curr_y = prev_y + (y_mapped - prev_y) / smoothening
+            pyautogui.moveTo(curr_x, curr_y)
+            prev_x, prev_y = curr_x, curr_y
+
+        # 2. CLICKING / TYPING ACTION
+        # Actions are driven by pinch events (index and middle finger coming together)
+        for event in events:
+            # If on a key, type the key as soon as the pinch closes
+            if event.type == "press" and hovered_button:
+                pyautogui.press(hovered_button.text.lower())
+                threading.Thread(target=speak_letter, args=(hovered_button.text,), daemon=True).start()
+                feedback_button = hovered_button
+
+            # If not on a key, a quick pinch clicks, a long still pinch right-clicks
+            # and moving while pinched drags with the left button held (a pinch
+            # that has right-clicked never starts a drag)
+            elif not hovered_button:
+                if event.type == "click":
                     pyautogui.click()
-                    # Visual feedback for clicking
-                    cv2.circle(img, (index_tip[0], index_tip[1]), 15, (0, 0, 255), cv2.FILLED)
-
-                last_action_time = time.time() # Reset the timer after any action
-
+                    feedback_click = True
+                elif event.type == "hold":
+                    pyautogui.rightClick()
+                elif event.type == "drag_start":
+                    pyautogui.mouseDown()
+                    mouse_down = True
 
     # --- DISPLAY ---
-    cv2.imshow("Virtual Mouse", img)
+    if args.headless:
+        continue
+    now = time.time()
+    if now - last_preview_time >= 1 / args.preview_fps:
+        last_preview_time = now
+        img = cv2.flip(img, 1)
+        img = draw_preview(img, index_tip, hovered_button)
+        feedback_button, feedback_click = None, False
+        cv2.imshow("Virtual Mouse", img)
     if cv2.waitKey(1) == ord('q'):
         break
 
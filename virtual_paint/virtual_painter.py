@@ -1,8 +1,14 @@
+import argparse
 import cv2
 import numpy as np
 import os
+import sys
 import mediapipe as mp
 
+# The shared capture module lives in the repository root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from camera_capture import CameraCapture
+
 # --- Configuration Parameters ---
 BRUSH_THICKNESS = 15
 ERASER_THICKNESS = 100
@@ -12,18 +18,29 @@ WINDOW_NAME = "AI Virtual Painter"
 ICON_WIDTH, ICON_HEIGHT = 70, 70
 ICON_SIZE = (ICON_WIDTH, ICON_HEIGHT)
 
-# --- Webcam and Hand Tracking Setup ---
-cap = cv2.VideoCapture(0)
-if not cap.isOpened():
-    raise IOError("Cannot open webcam")
+# --- Command Line Options ---
+parser = argparse.ArgumentParser(description="Draw in the air with your index finger")
+parser.add_argument("--server", metavar="CAMERA", default=None,
+                    help="use frames and hand landmarks of this inference_server camera instead of "
+                         "opening the webcam and running the model here")
+args = parser.parse_args()
 
-# --- ROBUSTNESS FIX: Ensure the correct MediaPipe class name is used ---
+# --- Webcam and Hand Tracking Setup ---
 mp_hands = mp.solutions.hands
-hands = mp_hands.Hands(max_num_hands=1, min_detection_confidence=0.7, min_tracking_confidence=0.5)
-mp_draw = mp.solutions.drawing_utils
+if args.server:
+    sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "inference_server"))
+    from client import ServerCapture, draw_landmarks
+    # One object stands in for the webcam and the model: the server runs Hands once for every app
+    cap = ServerCapture(args.server, mirror=True)
+    hands = cap
+else:
+    # Frames arrive already mirrored, in reused buffers
+    cap = CameraCapture(0, mirror=True)
+    hands = mp_hands.Hands(max_num_hands=1, min_detection_confidence=0.7, min_tracking_confidence=0.5)
+    draw_landmarks = mp.solutions.drawing_utils.draw_landmarks
 
 # --- Dynamic Initialization Based on Actual Frame Size ---
-success, temp_frame = cap.read()
+success, temp_frame, _ = cap.read()
 if not success:
     raise IOError("Could not read a frame from the webcam.")
 SCREEN_HEIGHT, SCREEN_WIDTH, _ = temp_frame.shape
@@ -85,7 +102,7 @@ def find_hand_landmarks(img, draw=True):
             cx, cy = int(lm.x * w), int(lm.y * h)
             landmark_list.append([id, cx, cy])
         if draw:
-            mp_draw.draw_landmarks(img, my_hand, mp_hands.HAND_CONNECTIONS)
+            draw_landmarks(img, my_hand, mp_hands.HAND_CONNECTIONS)
     return landmark_list
 
 
@@ -106,9 +123,8 @@ def fingers_up(landmark_list):
 
 # --- Main Application Loop ---
 while True:
-    success, img = cap.read()
+    success, img, _ = cap.read()
     if not success: break
-    img = cv2.flip(img, 1)
 
     lm_list = find_hand_landmarks(img, draw=False)
 
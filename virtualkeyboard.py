@@ -5,12 +5,36 @@ import time
 import pyautogui
 import pyttsx3
 import threading
+import argparse
+import os
+import sys
+from swipe_typing import SwipeDecoder, load_lexicon
+from gesture_events import PinchEventEngine
+from camera_capture import CameraCapture
+
+# Command line options
+parser = argparse.ArgumentParser(description="Virtual keyboard controlled by hand gestures")
+parser.add_argument("--headless", action="store_true",
+                    help="run tracking and typing without a preview window (stop with Ctrl+C)")
+parser.add_argument("--preview-fps", type=float, default=15,
+                    help="maximum preview refresh rate; tracking runs at full camera rate")
+parser.add_argument("--server", metavar="CAMERA", default=None,
+                    help="use frames and hand landmarks of this inference_server camera instead of "
+                         "opening the webcam and running the model here")
+args = parser.parse_args()
 
 # Initialize
-cap = cv2.VideoCapture(0)
-cap.set(3, 1280)
-cap.set(4, 720)
-detector = HandDetector(detectionCon=0.8, maxHands=1)
+if args.server:
+    # The shared inference server owns the camera and runs the hand model once for every app
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "inference_server"))
+    from client import ServerCapture
+    cap = ServerCapture(args.server, mirror=False)
+    detector = None
+else:
+    cap = CameraCapture(0, width=1280, height=720)
+    detector = HandDetector(detectionCon=0.8, maxHands=1)
+print(f"--- Capture: {cap.describe()} ---")
+pinch = PinchEventEngine()  # index/middle finger pinch with hysteresis, no fixed key delay
 
 # Keyboard layout
 keys = [
@@ -20,9 +44,14 @@ keys = [
 ]
 
 finalText = ""
-delayCounter = 0
-lastKeyPressTime = 0
-delayBetweenKeys = 1  # in seconds
+lexiconPath = "words.txt"  # optional word list, one word per line, most frequent first
+
+# Swipe typing state
+swipePath = []
+typedWords = []   # committed words, used as n-gram context
+currentWord = ""  # letters tapped since the last committed word
+suggestions = []
+suggestionsFor = None  # (typed word count, current word) the suggestions were computed for
 
 # Speak letter using pyttsx3 in a thread
 def speak_letter(letter):
@@ -42,6 +71,16 @@ def drawAll(img, buttonList):
                     cv2.FONT_HERSHEY_PLAIN, 4, (255, 255, 255), 4)
     return img
 
+# Draw next-word suggestions
+def drawSuggestions(img, suggestionButtons, suggestions):
+    for button, word in zip(suggestionButtons, suggestions):
+        x, y = button.pos
+        w, h = button.size
+        cv2.rectangle(img, (x, y), (x + w, y + h), (60, 60, 60), cv2.FILLED)
+        cv2.putText(img, word, (x + 20, y + 55),
+                    cv2.FONT_HERSHEY_PLAIN, 3, (255, 255, 255), 3)
+    return img
+
 # Button class
 class Button():
     def __init__(self, pos, text, size=[85, 85]):
@@ -49,6 +88,11 @@ class Button():
         self.size = size
         self.text = text
 
+    def contains(self, point):
+        x, y = self.pos
+        w, h = self.size
+        return x < point[0] < x + w and y < point[1] < y + h
+
 # Create buttons
 buttonList = []
 for i in range(len(keys)):
@@ -57,39 +101,117 @@ for i in range(len(keys)):
         posY = i * 100 + 50
         buttonList.append(Button([posX, posY], key))
 
-while True:
-    success, img = cap.read()
-    img = cv2.flip(img, 1)
-    hands, img = detector.findHands(img)
-
-    img = drawAll(img, buttonList)
-
-    if hands:
-        lmList = hands[0]['lmList']
-        if lmList:
-            index_tip = lmList[8]
-            middle_tip = lmList[12]
-
-            for button in buttonList:
-                x, y = button.pos
-                w, h = button.size
-
-                # Check if finger is on the button
-                if x < index_tip[0] < x + w and y < index_tip[1] < y + h:
-                    cv2.rectangle(img, (x, y), (x + w, y + h), (0, 255, 0), cv2.FILLED)
-                    cv2.putText(img, button.text, (x + 20, y + 65),
-                                cv2.FONT_HERSHEY_PLAIN, 4, (255, 255, 255), 4)
-
-                    # Measure distance between index and middle finger
-                    length, _, _ = detector.findDistance((index_tip[0], index_tip[1]), (middle_tip[0], middle_tip[1]), img)
+# Suggestion bar below the letters
+suggestionButtons = [Button([50 + k * 320, 350], "", size=[300, 85]) for k in range(3)]
+
+decoder = SwipeDecoder(buttonList, load_lexicon(lexiconPath))
+
+# The keys never change, so they are rasterized once and copied into each preview frame
+keyboardLayer = None
+keyboardMask = None
+lastPreviewTime = 0
+
+# Preview rendering: a lower-rate consumer of the tracking results
+def drawPreview(img, index_tip, hoveredButton, swipePath, suggestions):
+    global keyboardLayer, keyboardMask
+    if keyboardLayer is None or keyboardLayer.shape != img.shape:
+        keyboardLayer = drawAll(np.zeros_like(img), buttonList)
+        keyboardMask = keyboardLayer.any(axis=2, keepdims=True)
+    np.copyto(img, keyboardLayer, where=keyboardMask)
+    img = drawSuggestions(img, suggestionButtons, suggestions)
+    if hoveredButton:
+        x, y = hoveredButton.pos
+        w, h = hoveredButton.size
+        cv2.rectangle(img, (x, y), (x + w, y + h), (0, 255, 0), cv2.FILLED)
+        cv2.putText(img, hoveredButton.text, (x + 20, y + 65),
+                    cv2.FONT_HERSHEY_PLAIN, 4, (255, 255, 255), 4)
+    if index_tip is not None:
+        cv2.circle(img, (index_tip[0], index_tip[1]), 10, (255, 0, 255), cv2.FILLED)
+    if len(swipePath) > 1:
+        cv2.polylines(img, [np.array(swipePath, np.int32)], False, (0, 0, 255), 4)
+    return img
 
+def commitWord(word):
+    global currentWord
+    typedWords.append(word)
+    decoder.predictor.observe(typedWords)
+    currentWord = ""
 
-                    if length < 40 and time.time() - lastKeyPressTime > delayBetweenKeys:
-                        pyautogui.press(button.text.lower())
-                        threading.Thread(target=speak_letter, args=(button.text,), daemon=True).start()
-                        lastKeyPressTime = time.time()
+if args.headless:
+    print("[INFO] Running headless. Press Ctrl+C to stop.")
 
-    cv2.imshow("Virtual Keyboard", img)
+while True:
+    success, img, _ = cap.read()
+    if not success:
+        break
+    frameWidth = img.shape[1]
+
+    # Track on the raw frame without drawing; mirror the landmarks instead of the image
+    if detector is None:
+        hands = cap.find_hands()
+    else:
+        hands, _ = detector.findHands(img, draw=False, flipType=False)  # cvzone returns (hands, img)
+
+    if suggestionsFor != (len(typedWords), currentWord):
+        suggestions = decoder.predictor.predict(typedWords, k=len(suggestionButtons), prefix=currentWord)
+        suggestionsFor = (len(typedWords), currentWord)
+
+    lmList = [[frameWidth - 1 - lm[0], lm[1], lm[2]] for lm in hands[0]['lmList']] if hands else []
+    events = pinch.update(lmList)
+    if not lmList:
+        swipePath = []  # hand left the frame: drop the unfinished swipe
+
+    index_tip = None
+    hoveredButton = None
+    if lmList:
+        index_tip = lmList[8]
+
+        # Check if finger is on a button
+        for button in buttonList:
+            if button.contains(index_tip):
+                hoveredButton = button
+
+        if pinch.is_pressed:
+            # Pinch held: record the trajectory for swipe decoding
+            if any(e.type == "press" for e in events):
+                swipePath = []
+            swipePath.append((index_tip[0], index_tip[1]))
+
+        elif swipePath and any(e.type == "release" for e in events):
+            # Pinch released: a tap types one letter or picks a suggestion, a swipe types a word
+            keySequence = decoder.key_sequence(swipePath)
+            picked = [word for button, word in zip(suggestionButtons, suggestions)
+                      if button.contains(swipePath[0])]
+
+            if picked:
+                pyautogui.write(picked[0][len(currentWord):] + " ")
+                threading.Thread(target=speak_letter, args=(picked[0],), daemon=True).start()
+                commitWord(picked[0])
+            elif len(keySequence) == 1:
+                pyautogui.press(keySequence)
+                currentWord += keySequence
+                threading.Thread(target=speak_letter, args=(keySequence.upper(),), daemon=True).start()
+            elif len(keySequence) > 1:
+                candidates = decoder.decode(swipePath, history=typedWords)
+                if candidates:
+                    word = candidates[0][0]
+                    if currentWord:
+                        commitWord(currentWord)
+                        pyautogui.press("space")
+                    pyautogui.write(word + " ")
+                    threading.Thread(target=speak_letter, args=(word,), daemon=True).start()
+                    commitWord(word)
+            swipePath = []
+
+    # --- PREVIEW ---
+    if args.headless:
+        continue
+    now = time.time()
+    if now - lastPreviewTime >= 1 / args.preview_fps:
+        lastPreviewTime = now
+        img = cv2.flip(img, 1)
+        img = drawPreview(img, index_tip, hoveredButton, swipePath, suggestions)
+        cv2.imshow("Virtual Keyboard", img)
     if cv2.waitKey(1) == ord('q'):
         break
 